@@ -0,0 +1,277 @@
+import random
+import time
+from array import array
+from collections import deque
+
+CHOICES = ["Rock", "Paper", "Scissors"]
+
+COUNTERS = {
+    "Rock": "Paper",
+    "Paper": "Scissors",
+    "Scissors": "Rock"
+}
+
+
+class RollingMoveModel:
+    """Move frequencies and transitions over the last ``window`` player moves.
+
+    Every update and query touches a fixed number of counters, so the cost
+    per move stays flat however large the window is.
+    """
+
+    def __init__(self, window=10):
+        self.window = window
+        self.moves = deque()
+        self.counts = dict.fromkeys(CHOICES, 0)
+        self.transitions = {move: dict.fromkeys(CHOICES, 0) for move in CHOICES}
+
+    def __len__(self):
+        return len(self.moves)
+
+    def record(self, move, computer_move=None):
+        """Add the player's latest move, evicting the oldest one past the window"""
+        moves = self.moves
+        if moves:
+            self.transitions[moves[-1]][move] += 1
+        moves.append(move)
+        self.counts[move] += 1
+
+        if len(moves) > self.window:
+            oldest = moves.popleft()
+            self.counts[oldest] -= 1
+            self.transitions[oldest][moves[0]] -= 1
+
+    def extend(self, moves):
+        """Record several moves, oldest first"""
+        for move in moves:
+            self.record(move)
+
+    def clear(self):
+        """Forget every recorded move"""
+        self.moves.clear()
+        for move in CHOICES:
+            self.counts[move] = 0
+            for following in CHOICES:
+                self.transitions[move][following] = 0
+
+    def most_common(self):
+        """Most frequent move in the window"""
+        counts = self.counts
+        return max(CHOICES, key=counts.__getitem__)
+
+    def predict_next(self):
+        """Most likely next move given the last one, falling back to the most common move"""
+        if not self.moves:
+            return None
+        following = self.transitions[self.moves[-1]]
+        best = max(CHOICES, key=following.__getitem__)
+        if following[best] == 0:
+            return self.most_common()
+        return best
+
+
+MOVE_INDEX = {move: index for index, move in enumerate(CHOICES)}
+
+BEATEN_BY = {counter: move for move, counter in COUNTERS.items()}
+
+
+class MarkovModel:
+    """Variable-order Markov predictor over the move sequence.
+
+    Contexts of order 1..``max_order`` are hashed into a fixed table of
+    ``table_size`` slots with three counters each, so memory stays bounded
+    however long the session runs. With ``joint=True`` the context is built
+    from (player, computer) pairs instead of player moves alone. Prediction
+    backs off from the longest context that has seen at least ``min_count``
+    continuations; counters are halved once a slot passes ``decay_at`` so the
+    model keeps adapting.
+    """
+
+    def __init__(self, max_order=4, table_size=1 << 14, joint=False, min_count=2, decay_at=255):
+        self.max_order = max_order
+        self.mask = table_size - 1
+        if table_size & self.mask:
+            raise ValueError("table_size must be a power of two")
+        self.joint = joint
+        self.min_count = min_count
+        self.decay_at = decay_at
+        self.table = array("H", bytes(2 * 3 * table_size))
+        self.history = deque(maxlen=max_order)
+        self._slots = []
+
+    def __len__(self):
+        return len(self.history)
+
+    def _context_slots(self):
+        """Table offsets for the current contexts, shortest order first"""
+        slots = []
+        base = 9 if self.joint else 3
+        context = 0
+        mask = self.mask
+        for order, symbol in enumerate(self.history, 1):
+            context = context * base + symbol
+            slots.append((((context + 1) * 0x9E3779B1 + order * 0x85EBCA77) >> 7 & mask) * 3)
+        return slots
+
+    def record(self, player_move, computer_move=None):
+        """Count the player's move under the current contexts, then advance them"""
+        move = MOVE_INDEX[player_move]
+        table = self.table
+        for slot in self._slots:
+            table[slot + move] += 1
+            if table[slot + move] > self.decay_at:
+                table[slot] >>= 1
+                table[slot + 1] >>= 1
+                table[slot + 2] >>= 1
+
+        if self.joint:
+            move = move * 3 + MOVE_INDEX[computer_move]
+        self.history.appendleft(move)
+        self._slots = self._context_slots()
+
+    def clear(self):
+        """Forget the learned table and the current context"""
+        self.table = array("H", bytes(len(self.table) * 2))
+        self.history.clear()
+        self._slots = []
+
+    def predict_next(self):
+        """Most likely next player move from the longest confident context, or None"""
+        table = self.table
+        for slot in reversed(self._slots):
+            rock, paper, scissors = table[slot], table[slot + 1], table[slot + 2]
+            if rock + paper + scissors >= self.min_count:
+                if rock >= paper and rock >= scissors:
+                    return "Rock"
+                return "Paper" if paper >= scissors else "Scissors"
+        return None
+
+
+class EnsemblePredictor:
+    """Iocaine-style meta-strategy over several incremental predictors.
+
+    Each predictor guesses the player's next move. For every guess the
+    ensemble considers three second-guessing levels - beat the guess, beat
+    the move that beats it, and so on round the cycle - and keeps a decaying
+    score of how each (predictor, level) pair would have fared. The move
+    comes from the best-scoring pair.
+
+    Predictors are asked in order of their current best score and the loop
+    stops once ``budget`` seconds have passed, so a decision is always ready
+    in time; predictors that were skipped simply are not scored that round.
+    Every model behind the predictors is updated in ``record`` in constant
+    (or O(order)) time.
+    """
+
+    def __init__(self, budget=0.002, decay=0.95, clock=time.perf_counter, rng=random):
+        self.budget = budget
+        self.rng = rng
+        self.decay = decay
+        self.clock = clock
+
+        self.short = RollingMoveModel(10)
+        self.long = RollingMoveModel(100)
+        self.markov = MarkovModel()
+        self.markov_joint = MarkovModel(joint=True)
+        self.last_computer = None
+
+        self.predictors = [
+            ("repeat", self._predict_repeat),
+            ("mirror", self._predict_mirror),
+            ("frequency", self.long.most_common),
+            ("transition", self.long.predict_next),
+            ("markov", self.markov.predict_next),
+            ("markov_joint", self.markov_joint.predict_next),
+            ("hard", self._predict_hard),
+            ("expert", self._predict_expert),
+        ]
+        self.scores = [[0.0, 0.0, 0.0] for _ in self.predictors]
+        self._pending = []
+        self.skipped = 0
+
+    def _predict_repeat(self):
+        return self.short.moves[-1] if self.short.moves else None
+
+    def _predict_mirror(self):
+        return self.last_computer
+
+    def _predict_hard(self):
+        """The move the Hard heuristic expects, from the last 5 player moves"""
+        recent = self.short.moves
+        if len(recent) < 3:
+            return None
+        if recent[-1] == "Rock" and recent[-2] == "Scissors" and recent[-3] == "Paper":
+            return BEATEN_BY["Paper"]
+        window = list(recent)[-5:]
+        return max(CHOICES, key=window.count)
+
+    def _predict_expert(self):
+        """The move the Expert heuristic expects, from the last 10 player moves"""
+        recent = self.short.moves
+        if len(recent) < 2:
+            return None
+        if len(recent) >= 3 and recent[-1] != recent[-2] and recent[-2] != recent[-3]:
+            for move in CHOICES:
+                if move != recent[-1] and move != recent[-2]:
+                    return move
+        return self.short.most_common()
+
+    def choose(self):
+        """Pick the computer's move within the time budget"""
+        clock = self.clock
+        deadline = clock() + self.budget
+        scores = self.scores
+        order = sorted(range(len(self.predictors)), key=lambda i: max(scores[i]), reverse=True)
+
+        pending = []
+        best_move = None
+        best_score = 0.0
+        for asked, index in enumerate(order):
+            if clock() > deadline:
+                self.skipped += len(order) - asked
+                break
+            prediction = self.predictors[index][1]()
+            if prediction is None:
+                continue
+
+            candidates = (COUNTERS[prediction], BEATEN_BY[prediction], prediction)
+            pending.append((index, candidates))
+            for level, move in enumerate(candidates):
+                if best_move is None or scores[index][level] > best_score:
+                    best_move = move
+                    best_score = scores[index][level]
+
+        self._pending = pending
+        if best_move is None or best_score <= 0:
+            return self.rng.choice(CHOICES)
+        return best_move
+
+    def record(self, player_move, computer_move):
+        """Score the pending candidates against the player's move and update every model"""
+        decay = self.decay
+        for index, candidates in self._pending:
+            row = self.scores[index]
+            for level, move in enumerate(candidates):
+                if COUNTERS[player_move] == move:
+                    row[level] = row[level] * decay + 1
+                elif COUNTERS[move] == player_move:
+                    row[level] = row[level] * decay - 1
+                else:
+                    row[level] = row[level] * decay
+        self._pending = []
+
+        self.short.record(player_move)
+        self.long.record(player_move)
+        self.markov.record(player_move)
+        self.markov_joint.record(player_move, computer_move)
+        self.last_computer = computer_move
+
+    def clear(self):
+        """Forget all learned state"""
+        self.short.clear()
+        self.long.clear()
+        self.markov.clear()
+        self.markov_joint.clear()
+        self.last_computer = None
+        self.scores = [[0.0, 0.0, 0.0] for _ in self.predictors]
+        self._pending = []
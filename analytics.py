@@ -0,0 +1,175 @@
+import time
+from collections import Counter, deque
+
+from ai import CHOICES, MOVE_INDEX
+from history import WINNER_INDEX
+from lifetime import NUMPY_MIN_ROUNDS, UNKNOWN_DIFFICULTY, DifficultyTable, load_numpy
+
+WIN, LOSS, DRAW = WINNER_INDEX["Player"], WINNER_INDEX["Computer"], WINNER_INDEX["Draw"]
+
+# Time zone offsets are whole quarter hours, so every round in one
+# 15-minute slot of epoch time falls in the same local hour.
+QUARTER = 900
+
+
+def win_rate(counts):
+    """Player win percentage from ``[wins, losses, draws]``"""
+    total = sum(counts)
+    return round(counts[WIN] / total * 100, 1) if total else 0
+
+
+class RoundAnalytics:
+    """Grouped and rolling aggregates over every round, kept up to date one round at a time.
+
+    Each group is a ``[wins, losses, draws]`` counter - overall, per
+    difficulty, per local hour of day and per player move - so ``add`` is a
+    handful of increments and memory does not grow with the history. Win
+    streaks follow the game's rules (draws do not break them) and finished
+    ones are counted by length; the rolling win rate covers the last
+    ``window`` rounds.
+
+    ``from_lifetime`` builds the same aggregates from a ``LifetimeHistory`` in
+    one pass over its columns, ``chunk`` rounds at a time (vectorized with
+    NumPy when it is installed).
+    """
+
+    def __init__(self, window=100):
+        self.window = window
+        self.totals = [0, 0, 0]
+        # Codes for by_difficulty; from_lifetime takes over the history's own table
+        self.difficulties = DifficultyTable()
+        self.by_difficulty = [[0, 0, 0] for _ in range(UNKNOWN_DIFFICULTY + 1)]
+        self.by_hour = [[0, 0, 0] for _ in range(24)]
+        self.by_move = [[0, 0, 0] for _ in CHOICES]
+        self.streaks = Counter()
+        self.current_streak = 0
+        self.recent = deque(maxlen=window)
+        self.recent_counts = [0, 0, 0]
+        self._hours = {}
+
+    def __len__(self):
+        return sum(self.totals)
+
+    def _hour(self, quarter):
+        hour = self._hours.get(quarter)
+        if hour is None:
+            hour = self._hours[quarter] = time.localtime(quarter * QUARTER).tm_hour
+        return hour
+
+    def add(self, player, computer, winner, difficulty, epoch):
+        """Count one round"""
+        self._add_codes(MOVE_INDEX[player], WINNER_INDEX[winner], self.difficulties.code(difficulty), int(epoch))
+
+    def extend(self, rounds):
+        """Count ``(player, computer, winner, difficulty, epoch)`` tuples"""
+        for round_ in rounds:
+            self.add(*round_)
+        return self
+
+    def _add_codes(self, player, winner, difficulty, epoch):
+        self.totals[winner] += 1
+        self.by_difficulty[difficulty][winner] += 1
+        self.by_hour[self._hour(epoch // QUARTER)][winner] += 1
+        self.by_move[player][winner] += 1
+
+        if winner == WIN:
+            self.current_streak += 1
+        elif winner == LOSS:
+            if self.current_streak:
+                self.streaks[self.current_streak] += 1
+            self.current_streak = 0
+
+        if len(self.recent) == self.window:
+            self.recent_counts[self.recent[0]] -= 1
+        self.recent.append(winner)
+        self.recent_counts[winner] += 1
+
+    @classmethod
+    def from_lifetime(cls, lifetime, window=100, chunk=1 << 20, stop=None):
+        """Aggregates over a ``LifetimeHistory`` (its first ``stop`` rounds), read ``chunk`` rounds at a time"""
+        analytics = cls(window)
+        columns = [column[:stop] for column in lifetime.columns("player", "winner", "difficulty", "epoch")]
+        # Copied after the columns, so it names every code in them
+        analytics.difficulties = DifficultyTable(lifetime.difficulties.names)
+        length = len(columns[0])
+        np = load_numpy() if length >= NUMPY_MIN_ROUNDS else None
+        for start in range(0, length, chunk):
+            parts = [column[start:start + chunk] for column in columns]
+            if np is not None:
+                analytics._add_chunk(*(np.frombuffer(part, dtype=part.format) for part in parts))
+            else:
+                for player, winner, difficulty, epoch in zip(*parts):
+                    analytics._add_codes(player, winner, difficulty, epoch)
+        return analytics
+
+    @classmethod
+    def from_store(cls, store, window=100, stop=None):
+        """Aggregates over every round a stats store keeps (its lifetime history, or its own rounds), or its first ``stop``"""
+        if store.lifetime is not None:
+            return cls.from_lifetime(store.lifetime, window, stop=stop)
+        if hasattr(store, "rounds"):
+            return cls(window).extend(store.rounds(stop))
+        return cls(window)
+
+    def _add_chunk(self, players, winners, difficulties, epochs):
+        """Vectorized ``_add_codes`` over NumPy columns"""
+        np = load_numpy()
+        players, winners, difficulties = (a.astype(np.intp) for a in (players, winners, difficulties))
+
+        def add_counts(rows, keys, groups):
+            counts = np.bincount(keys * 3 + winners, minlength=groups * 3).reshape(groups, 3)
+            for row, added in zip(rows, counts.tolist()):
+                for winner, count in enumerate(added):
+                    row[winner] += count
+
+        add_counts([self.totals], np.zeros_like(winners), 1)
+        add_counts(self.by_difficulty, difficulties, UNKNOWN_DIFFICULTY + 1)
+        add_counts(self.by_move, players, len(CHOICES))
+        quarters, inverse = np.unique(epochs // QUARTER, return_inverse=True)
+        hours = np.array([self._hour(int(q)) for q in quarters], dtype=np.intp)
+        add_counts(self.by_hour, hours[inverse.reshape(-1)], 24)
+
+        # A finished streak is the number of wins between consecutive losses
+        wins = np.cumsum(winners == WIN)
+        losses = np.flatnonzero(winners == LOSS)
+        if len(losses):
+            at_loss = wins[losses]
+            lengths = np.diff(at_loss, prepend=0)
+            lengths[0] += self.current_streak
+            for length, count in enumerate(np.bincount(lengths).tolist()):
+                if length and count:
+                    self.streaks[length] += count
+            self.current_streak = int(wins[-1] - at_loss[-1])
+        elif len(wins):
+            self.current_streak += int(wins[-1])
+
+        for winner in winners[-self.window:].tolist():
+            if len(self.recent) == self.window:
+                self.recent_counts[self.recent[0]] -= 1
+            self.recent.append(winner)
+            self.recent_counts[winner] += 1
+
+    def win_rate(self):
+        """Win percentage over every round"""
+        return win_rate(self.totals)
+
+    def rolling_win_rate(self):
+        """Win percentage over the last ``window`` rounds"""
+        return win_rate(self.recent_counts)
+
+    def win_rate_by_difficulty(self):
+        """``{difficulty: win %}`` for difficulties that have been played"""
+        return {self.difficulties.name(code) or "Unknown": win_rate(counts)
+                for code, counts in enumerate(self.by_difficulty) if any(counts)}
+
+    def win_rate_by_hour(self):
+        """``{hour: win %}`` for local hours of day that have been played"""
+        return {hour: win_rate(counts) for hour, counts in enumerate(self.by_hour) if any(counts)}
+
+    def win_rate_by_move(self):
+        """``{move: win %}`` by the move the player threw"""
+        return {move: win_rate(counts) for move, counts in zip(CHOICES, self.by_move) if any(counts)}
+
+    def streak_distribution(self):
+        """``{length: count}`` of finished win streaks, shortest first"""
+        return dict(sorted(self.streaks.items()))
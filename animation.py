@@ -0,0 +1,103 @@
+import time
+
+
+class Animator:
+    """One frame clock driving every widget animation.
+
+    An animation is a track on one ``(widget, option)`` pair. Starting a
+    track for a pair that is already animating replaces it, so rapid play
+    never leaves two countdowns or flashes fighting over a label. While any
+    track is live a single ``after`` callback ticks at most ``max_fps``
+    times a second - and only as often as some track's value next changes.
+    Each tick works out every track's current value and applies all
+    changes for a widget in one ``config`` call, skipping values that are
+    already showing. With nothing to animate no callback is scheduled.
+
+    ``scheduler`` is anything with Tk's ``after``/``after_cancel``
+    (usually the root window); ``clock`` returns seconds.
+    """
+
+    def __init__(self, scheduler, max_fps=30, clock=time.monotonic):
+        self.scheduler = scheduler
+        self.frame_ms = max(1, round(1000 / max_fps))
+        self.clock = clock
+        self.tracks = {}
+        self.shown = {}
+        self.after_id = None
+        self.ticks = 0
+
+    def track(self, widget, option, value_at, on_done=None):
+        """Animate ``widget[option]`` with ``value_at(elapsed_ms) -> (value, ms until it changes)``.
+
+        The wait is None once the track has finished, and 0 for a value
+        that changes every frame (a tween).
+        """
+        self.tracks[(widget, option)] = (self.clock(), value_at, on_done)
+        self.shown.pop((widget, option), None)
+        # Tracks started together (by one move) share the next frame
+        self._stop()
+        self.after_id = self.scheduler.after(0, self._tick)
+
+    def sequence(self, widget, option, values, interval_ms, final=None, on_done=None):
+        """Show ``values`` one after another, ``interval_ms`` apart, then ``final`` (if given)"""
+        values = list(values)
+        end = len(values) * interval_ms
+
+        def value_at(elapsed):
+            if elapsed >= end:
+                return final, None
+            index = int(elapsed // interval_ms)
+            return values[index], (index + 1) * interval_ms - elapsed
+
+        self.track(widget, option, value_at, on_done)
+
+    def cancel(self, widget, option=None):
+        """Stop a widget's animations (one option, or all of them) where they are"""
+        for key in [key for key in self.tracks if key[0] is widget and option in (None, key[1])]:
+            del self.tracks[key]
+            self.shown.pop(key, None)
+        if not self.tracks:
+            self._stop()
+
+    def cancel_all(self):
+        """Stop every animation"""
+        self.tracks.clear()
+        self.shown.clear()
+        self._stop()
+
+    def _stop(self):
+        if self.after_id is not None:
+            self.scheduler.after_cancel(self.after_id)
+            self.after_id = None
+
+    def _tick(self):
+        """Apply this frame's values, then schedule the next frame if anything is still running"""
+        self.after_id = None
+        self.ticks += 1
+        now = self.clock()
+        updates = {}
+        finished = []
+        wait = None
+        for key, (start, value_at, on_done) in list(self.tracks.items()):
+            value, next_change = value_at((now - start) * 1000)
+            if value is not None and self.shown.get(key) != value:
+                self.shown[key] = value
+                updates.setdefault(key[0], {})[key[1]] = value
+            if next_change is None:
+                finished.append((key, on_done))
+            elif wait is None or next_change < wait:
+                wait = next_change
+
+        for key, _ in finished:
+            del self.tracks[key]
+            self.shown.pop(key, None)
+        for widget, options in updates.items():
+            widget.config(**options)
+        for _, on_done in finished:
+            if on_done is not None:
+                on_done()
+
+        # on_done may have started a track, and with it the next frame
+        if self.tracks and self.after_id is None:
+            delay = self.frame_ms if wait is None else max(self.frame_ms, int(wait + 0.999))
+            self.after_id = self.scheduler.after(delay, self._tick)
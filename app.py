@@ -1,114 +1,133 @@
+import time
+# --profile-startup times imports from here
+STARTED = time.perf_counter()
+
 import tkinter as tk
-from tkinter import ttk, messagebox, font
-import random
-from datetime import datetime, timedelta
-import json
+from tkinter import ttk, messagebox
+from datetime import datetime
 import os
-import urllib.request
-import tempfile
-
-class Challenge:
-    def __init__(self, challenge_id, name, description, target, reward_points, challenge_type, difficulty="Normal"):
-        self.id = challenge_id
-        self.name = name
-        self.description = description
-        self.target = target
-        self.reward_points = reward_points
-        self.type = challenge_type
-        self.difficulty = difficulty
-        self.progress = 0
-        self.completed = False
-        self.date_assigned = datetime.now().strftime("%Y-%m-%d")
-
-    def update_progress(self, value):
-        """Update challenge progress"""
-        if not self.completed:
-            self.progress = min(self.progress + value, self.target)
-            if self.progress >= self.target:
-                self.completed = True
-                return True
-        return False
-
-    def get_progress_percentage(self):
-        """Get progress as percentage"""
-        return int((self.progress / self.target) * 100) if self.target > 0 else 0
-
-    def to_dict(self):
-        """Convert challenge to dictionary for saving"""
-        return {
-            'id': self.id,
-            'name': self.name,
-            'description': self.description,
-            'target': self.target,
-            'reward_points': self.reward_points,
-            'type': self.type,
-            'difficulty': self.difficulty,
-            'progress': self.progress,
-            'completed': self.completed,
-            'date_assigned': self.date_assigned
-        }
-
-    @staticmethod
-    def from_dict(data):
-        """Create challenge from dictionary"""
-        challenge = Challenge(
-            data['id'],
-            data['name'],
-            data['description'],
-            data['target'],
-            data['reward_points'],
-            data['type'],
-            data.get('difficulty', 'Normal')
-        )
-        challenge.progress = data.get('progress', 0)
-        challenge.completed = data.get('completed', False)
-        challenge.date_assigned = data.get('date_assigned', datetime.now().strftime("%Y-%m-%d"))
-        return challenge
+import math
+import random
+import sys
+import threading
+
+from analytics import RoundAnalytics
+from animation import Animator
+from challenges import generate_daily_challenges
+from chess_clock import ChessClock, format_clock
+from engine import GameEngine
+from input_queue import MoveQueue
+from storage import BackgroundWriter, open_stats_store
+from startup import PhaseTimer
+from strategies import strategy_names
+from tracing import Tracer
+
+# "json" (rps_stats.json + journal + rps_history/) or "sqlite" (rps_stats.db)
+STATS_BACKEND = os.environ.get("RPS_STATS_BACKEND", "json")
+# What happens to moves pressed while a round is playing: "drop", "coalesce" or "queue"
+INPUT_POLICY = os.environ.get("RPS_INPUT_POLICY", "coalesce")
+# Record per-round latency spans from startup (F9 toggles them at runtime)
+TRACE = os.environ.get("RPS_TRACE") == "1"
+# Log main-loop stalls longer than this many ms, with a stack sample (0 turns the watchdog off)
+WATCHDOG_MS = int(os.environ.get("RPS_WATCHDOG_MS", "0"))
+# Seed for the session's AI and challenge draws (a random one if unset); set it to reproduce a session
+SEED = os.environ.get("RPS_SEED")
+# Record every session into this directory, for replay with recording.py (off if unset)
+RECORD_DIR = os.environ.get("RPS_RECORD")
 
 class RockPaperScissorsGame:
-    def __init__(self, root):
+    def __init__(self, root, startup=None):
         self.root = root
+        self.startup = startup if startup is not None else PhaseTimer()
         self.root.title("⚔ Rock Paper Scissors Game")
         self.root.geometry("1000x800")
         self.root.resizable(False, False)
         self.root.configure(bg="#0f0f23")
+        # Timers and animations are scheduled here: the root, or the lag monitor standing in for it
+        self.lag_monitor = None
+        if WATCHDOG_MS > 0:
+            # The watchdog, recorder and SQLite backend are off by default, so are imported only when enabled
+            from lag_monitor import LagMonitor
+            self.lag_monitor = LagMonitor(self.root, WATCHDOG_MS)
+        self.scheduler = self.lag_monitor if self.lag_monitor is not None else self.root
+
+        self.seed = int(SEED) if SEED else random.getrandbits(32)
+        self.engine = GameEngine(seed=self.seed)
+        self.store = open_stats_store(STATS_BACKEND)
+        self.tracer = Tracer(TRACE)
+        self.engine.tracer = self.tracer
+        self.round_trace = (0, 0)
+        self.trace_window = None
+        self.trace_refresh_id = None
 
-        self.player_score = 0
-        self.computer_score = 0
-        self.draws = 0
-        self.total_games = 0
-        self.game_history = []
-        self.max_history = 10
-        self.current_streak = 0
-        self.best_streak = 0
-
-        self.timer_running = False
-        self.player_time = 300
-        self.computer_time = 300
         self.timer_id = None
-        self.current_turn = None
         self.time_limit = 300
+        self.chess_clock = ChessClock(self.time_limit)
         self.game_over = False
 
-        self.choices = ["Rock", "Paper", "Scissors"]
         self.choice_symbols = {
             "Rock": "ROCK",
             "Paper": "PAPER",
             "Scissors": "SCISSORS"
         }
 
-        self.difficulty = "Normal"
-
-        self.challenges = []
-        self.total_challenge_points = 0
         self.challenge_window = None
+        self.challenge_cards = []
+        self.animator = Animator(self.scheduler)
+        self.moves = MoveQueue(INPUT_POLICY)
+        self.round_id = None
 
         self.custom_font = "Courier New"
 
         self.load_stats()
+        # The session proper starts from the seed, whatever loading drew
+        self.engine.rng.seed(self.seed)
+        self.recorder = self.open_recording() if RECORD_DIR else None
+        # Lifetime aggregates, built off the Tk thread over the rounds stored so far; rounds played
+        # meanwhile wait in the backlog
+        self.analytics = None
+        self.analytics_stop = len(self.history_rounds())
+        self.analytics_backlog = []
+        self.analytics_thread = None
+        self.built_analytics = None
+        self.writer = BackgroundWriter(self.store)
+        self.startup.mark("load stats")
 
         self.setup_ui()
         self.bind_keyboard_shortcuts()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.startup.mark("build UI")
+
+        # after_idle, then after: the first frame is drawn before the deferred work starts
+        self.root.after_idle(self.root.after, 0, self.finish_startup)
+        if self.lag_monitor is not None:
+            self.lag_monitor.start()
+
+    def finish_startup(self):
+        """Work the first frame does not need: the pass over the lifetime history, on a worker thread"""
+        self.startup.mark("first frame")
+        self.analytics_thread = threading.Thread(target=self.build_analytics, name="analytics", daemon=True)
+        self.analytics_thread.start()
+        self.scheduler.after(20, self.collect_analytics)
+
+    def build_analytics(self):
+        """Worker thread: aggregates over the rounds stored before this session started"""
+        try:
+            self.built_analytics = RoundAnalytics.from_store(self.store, stop=self.analytics_stop)
+        except Exception as e:
+            print(f"Error building analytics: {e}")
+            self.built_analytics = RoundAnalytics()
+
+    def collect_analytics(self):
+        """Take the worker's aggregates on the Tk thread once they are done, adding the backlog"""
+        if self.analytics_thread.is_alive():
+            self.scheduler.after(20, self.collect_analytics)
+            return
+        analytics = self.built_analytics
+        analytics.extend(self.analytics_backlog)
+        self.analytics_backlog = []
+        self.analytics = analytics
+        self.startup.mark("lifetime analytics")
 
     def bind_keyboard_shortcuts(self):
         """Bind keyboard shortcuts for quick play"""
@@ -119,6 +138,8 @@ class RockPaperScissorsGame:
         self.root.bind('s', lambda e: self.play("Scissors"))
         self.root.bind('S', lambda e: self.play("Scissors"))
         self.root.bind('<Escape>', lambda e: self.reset_game())
+        self.root.bind('<F9>', lambda e: self.toggle_tracing())
+        self.root.bind('<F10>', lambda e: self.show_trace_overlay())
 
     def setup_ui(self):
         self.colors = {
@@ -267,6 +288,21 @@ class RockPaperScissorsGame:
         time_limit_btn.pack(side=tk.LEFT, padx=6)
         self.time_limit_btn = time_limit_btn
 
+        self.time_control_btn = tk.Button(
+            timer_control,
+            text="⏱ +0",
+            font=(self.custom_font, 11, "bold"),
+            bg="#ffffff",
+            fg="#000000",
+            command=self.change_time_control,
+            width=10,
+            cursor="hand2",
+            relief=tk.FLAT,
+            bd=0,
+            activebackground="#e0e0e0"
+        )
+        self.time_control_btn.pack(side=tk.LEFT, padx=6)
+
         stats_container_outer = tk.Frame(self.root, bg=self.colors['bg_primary'])
         stats_container_outer.pack(pady=5, padx=40, fill=tk.X)
 
@@ -310,7 +346,7 @@ class RockPaperScissorsGame:
 
         self.streak_label = tk.Label(
             streak_card,
-            text=f"{self.current_streak}",
+            text=f"{self.engine.current_streak}",
             font=(self.custom_font, 16, "bold"),
             fg=self.colors['player_color'],
             bg=self.colors['bg_secondary']
@@ -330,7 +366,7 @@ class RockPaperScissorsGame:
 
         self.best_streak_label = tk.Label(
             best_streak_card,
-            text=f"{self.best_streak}",
+            text=f"{self.engine.best_streak}",
             font=(self.custom_font, 16, "bold"),
             fg=self.colors['draw_color'],
             bg=self.colors['bg_secondary']
@@ -529,7 +565,7 @@ class RockPaperScissorsGame:
 
         difficulty_btn = tk.Button(
             control_frame,
-            text=f"🎯 Difficulty: {self.difficulty}",
+            text=f"🎯 Difficulty: {self.engine.difficulty}",
             bg="#ffffff",
             fg="#000000",
             command=self.change_difficulty,
@@ -555,16 +591,14 @@ class RockPaperScissorsGame:
 
     def calculate_win_rate(self):
         """Calculate player's win rate"""
-        if self.total_games == 0:
-            return 0
-        return round((self.player_score / self.total_games) * 100, 1)
+        return self.engine.calculate_win_rate()
 
     def update_statistics(self):
         """Update statistics display"""
         win_rate = self.calculate_win_rate()
         self.win_rate_label.config(text=f"{win_rate}%")
-        self.streak_label.config(text=f"{self.current_streak}")
-        self.best_streak_label.config(text=f"{self.best_streak}")
+        self.streak_label.config(text=f"{self.engine.current_streak}")
+        self.best_streak_label.config(text=f"{self.engine.best_streak}")
 
     def toggle_timer(self):
         """Start or pause the chess-style timer"""
@@ -572,65 +606,75 @@ class RockPaperScissorsGame:
             messagebox.showinfo("Game Over", "Please reset the timer to start a new game!")
             return
 
-        if self.timer_running:
-            self.timer_running = False
-            if self.timer_id:
-                self.root.after_cancel(self.timer_id)
-                self.timer_id = None
+        if self.chess_clock.running:
+            self.chess_clock.pause()
+            if self.recorder is not None:
+                self.recorder.pause()
+            self.cancel_timer_refresh()
+            self.update_timer_display()
             self.start_pause_btn.config(text="▶ RESUME", bg=self.colors['draw_color'])
         else:
-            self.timer_running = True
-            if self.current_turn is None:
-                self.current_turn = 'player'
+            self.chess_clock.start('player')
+            if self.recorder is not None:
+                self.recorder.start()
             self.start_pause_btn.config(text="⏸ PAUSE", bg=self.colors['draw_color'])
             self.update_timer()
 
+    def cancel_timer_refresh(self):
+        """Cancel the pending timer display refresh"""
+        if self.timer_id:
+            self.scheduler.after_cancel(self.timer_id)
+            self.timer_id = None
+
     def update_timer(self):
-        """Update chess-style timer - decrements current player's time"""
-        if self.timer_running and not self.game_over:
-            if self.current_turn == 'player':
-                self.player_time -= 1
-                if self.player_time <= 0:
-                    self.player_time = 0
-                    self.game_over = True
-                    self.timer_running = False
-                    self.handle_timeout('player')
-                    return
-            elif self.current_turn == 'computer':
-                self.computer_time -= 1
-                if self.computer_time <= 0:
-                    self.computer_time = 0
-                    self.game_over = True
-                    self.timer_running = False
-                    self.handle_timeout('computer')
-                    return
+        """Refresh the timer and check for a flag fall.
+
+        Time is read from the monotonic clock, so a late callback only
+        delays the display; the next refresh is scheduled for when the
+        running side's display next changes.
+        """
+        self.timer_id = None
+        if not self.chess_clock.running or self.game_over:
+            return
 
+        flagged = self.chess_clock.flagged()
+        if flagged:
+            self.chess_clock.pause()
+            if self.recorder is not None:
+                self.recorder.timeout(flagged)
+            self.game_over = True
             self.update_timer_display()
-            self.timer_id = self.root.after(1000, self.update_timer)
+            self.handle_timeout(flagged)
+            return
+
+        self.update_timer_display()
+        delay = max(1, math.ceil(self.chess_clock.next_change() * 1000))
+        self.timer_id = self.scheduler.after(delay, self.update_timer)
 
     def update_timer_display(self):
         """Update timer labels"""
-        p_minutes = self.player_time // 60
-        p_seconds = self.player_time % 60
-        player_time_str = f"{p_minutes:02d}:{p_seconds:02d}"
-        self.player_timer_label.config(text=player_time_str)
-
-        c_minutes = self.computer_time // 60
-        c_seconds = self.computer_time % 60
-        computer_time_str = f"{c_minutes:02d}:{c_seconds:02d}"
-        self.computer_timer_label.config(text=computer_time_str)
-
-        if self.current_turn == 'player' and self.player_time <= 10:
-            color = "#ff0000" if self.player_time % 2 == 0 else "#3ae374"
+        player_time = self.chess_clock.remaining('player')
+        computer_time = self.chess_clock.remaining('computer')
+        self.player_timer_label.config(text=format_clock(player_time))
+        self.computer_timer_label.config(text=format_clock(computer_time))
+
+        turn = self.chess_clock.turn
+        if turn == 'player' and player_time <= 10:
+            color = "#ff0000" if int(player_time) % 2 == 0 else "#3ae374"
             self.player_timer_label.config(fg=color)
-        elif self.current_turn == 'computer' and self.computer_time <= 10:
-            color = "#ff0000" if self.computer_time % 2 == 0 else "white"
+        elif turn == 'computer' and computer_time <= 10:
+            color = "#ff0000" if int(computer_time) % 2 == 0 else "white"
             self.computer_timer_label.config(fg=color)
 
     def switch_turn(self):
         """Switch timer between player and computer"""
-        if self.timer_running:
-            self.current_turn = 'computer' if self.current_turn == 'player' else 'player'
+        if self.chess_clock.running:
+            self.chess_clock.switch()
+            if self.recorder is not None:
+                self.recorder.switch()
+            # The other side's display changes on its own schedule
+            self.cancel_timer_refresh()
+            self.update_timer()
 
     def handle_timeout(self, who_timed_out):
         """Handle when a player runs out of time"""
@@ -639,28 +683,25 @@ class RockPaperScissorsGame:
                 "Time's Up!",
                 "You ran out of time!\nComputer wins by timeout!"
             )
-            self.computer_score += 3
+            self.engine.computer_score += 3
         else:
             messagebox.showinfo(
                 "Time's Up!",
                 "Computer ran out of time!\nYou win by timeout!"
             )
-            self.player_score += 3
+            self.engine.player_score += 3
 
         self.update_score_display()
+        self.save_stats()
         self.start_pause_btn.config(text="▶ START GAME", bg=self.colors['player_color'])
 
     def reset_timer(self):
         """Reset chess timer to initial time"""
-        if self.timer_running:
-            self.timer_running = False
-            if self.timer_id:
-                self.root.after_cancel(self.timer_id)
-                self.timer_id = None
-
-        self.player_time = self.time_limit
-        self.computer_time = self.time_limit
-        self.current_turn = None
+        self.cancel_timer_refresh()
+        self.chess_clock.reset(self.time_limit)
+        if self.recorder is not None:
+            self.recorder.clock_reset(self.time_limit)
+            self.recorder.restart()
         self.game_over = False
 
         self.player_timer_label.config(fg=self.colors['bg_primary'])
@@ -680,172 +721,125 @@ class RockPaperScissorsGame:
         self.time_limit = time_options[next_index]
         self.time_limit_btn.config(text=time_labels[next_index])
 
-        if not self.timer_running:
-            self.player_time = self.time_limit
-            self.computer_time = self.time_limit
+        if not self.chess_clock.running:
+            self.chess_clock.reset(self.time_limit)
+            if self.recorder is not None:
+                self.recorder.clock_reset(self.time_limit)
             self.update_timer_display()
 
-    def get_computer_choice(self):
-        """Get computer choice based on difficulty with improved AI"""
-        if self.difficulty == "Easy":
-            if len(self.game_history) > 0:
-                last_player = self.game_history[-1]["player"]
-                if random.random() < 0.5:
-                    losing_to = {
-                        "Rock": "Scissors",
-                        "Paper": "Rock",
-                        "Scissors": "Paper"
-                    }
-                    return [k for k, v in losing_to.items() if v == last_player][0]
-            return random.choice(self.choices)
-
-        elif self.difficulty == "Hard":
-            if len(self.game_history) >= 3:
-                recent = [h["player"] for h in self.game_history[-5:]]
-
-                if len(recent) >= 3:
-                    if recent[-1] == "Rock" and recent[-2] == "Scissors" and recent[-3] == "Paper":
-                        return "Paper"
-
-                most_common = max(set(recent), key=recent.count)
-
-                if random.random() < 0.8:
-                    counters = {
-                        "Rock": "Paper",
-                        "Paper": "Scissors",
-                        "Scissors": "Rock"
-                    }
-                    return counters[most_common]
-            return random.choice(self.choices)
-
-        elif self.difficulty == "Expert":
-            if len(self.game_history) >= 2:
-                recent = [h["player"] for h in self.game_history[-10:]]
-
-                if len(recent) >= 3:
-                    if recent[-1] != recent[-2] and recent[-2] != recent[-3]:
-                        not_used = [c for c in self.choices if c not in [recent[-1], recent[-2]]]
-                        if not_used and random.random() < 0.9:
-                            counters = {
-                                "Rock": "Paper",
-                                "Paper": "Scissors",
-                                "Scissors": "Rock"
-                            }
-                            return counters[not_used[0]]
-
-                most_common = max(set(recent), key=recent.count)
-                counters = {
-                    "Rock": "Paper",
-                    "Paper": "Scissors",
-                    "Scissors": "Rock"
-                }
-                return counters[most_common]
-            return random.choice(self.choices)
-
-        else:
-            return random.choice(self.choices)
+    def change_time_control(self):
+        """Cycle the per-move bonus: none, Fischer increment or Bronstein delay"""
+        controls = [(0, 0), (2, 0), (5, 0), (0, 3), (0, 5)]
+        labels = ["⏱ +0", "⏱ +2s", "⏱ +5s", "⏱ D3s", "⏱ D5s"]
 
-    def determine_winner(self, player_choice, computer_choice):
-        """Determine the winner"""
-        if player_choice == computer_choice:
-            return "Draw"
+        current = (self.chess_clock.increment, self.chess_clock.delay)
+        current_index = controls.index(current) if current in controls else 0
+        next_index = (current_index + 1) % len(controls)
 
-        winning_combinations = {
-            "Rock": "Scissors",
-            "Paper": "Rock",
-            "Scissors": "Paper"
-        }
-
-        if winning_combinations[player_choice] == computer_choice:
-            return "Player"
-        else:
-            return "Computer"
+        self.chess_clock.increment, self.chess_clock.delay = controls[next_index]
+        if self.recorder is not None:
+            self.recorder.control(*controls[next_index])
+        self.time_control_btn.config(text=labels[next_index])
 
     def play(self, player_choice):
-        """Main game logic with enhanced feedback and timer integration"""
+        """Queue a move; rounds are played one at a time, in order"""
         if self.game_over:
             messagebox.showwarning("Game Over", "Timer has expired! Please reset to play again.")
             return
 
-        if not self.timer_running and self.current_turn is None:
+        start = self.tracer.now()
+        if self.recorder is not None:
+            self.recorder.press(player_choice)
+        self.moves.offer(player_choice)
+        self.start_next_round()
+        self.tracer.record("input", start)
+
+    def start_next_round(self):
+        """Start the next queued move's round unless one is already in flight"""
+        if self.game_over:
+            self.moves.clear()
+            return
+        player_choice = self.moves.take()
+        if player_choice is None:
+            return
+
+        pressed = self.tracer.now()
+        if pressed:
+            queued = int(self.moves.waits[-1] * 1e9)
+            self.tracer.add("queue", queued)
+            pressed -= queued
+
+        if not self.chess_clock.running and self.chess_clock.turn is None:
             self.toggle_timer()
 
-        if self.timer_running and self.current_turn == 'player':
+        if self.chess_clock.running and self.chess_clock.turn == 'player':
             self.switch_turn()
 
         self.result_label.config(text="🤔 Computer is thinking...", fg=self.colors['draw_color'])
-        self.root.update()
 
-        thinking_times = {
-            "Easy": 500,
-            "Normal": 800,
-            "Hard": 1200,
-            "Expert": 1500
-        }
-        think_time = thinking_times.get(self.difficulty, 800)
+        strategy = self.engine.strategy
+        think_time = strategy.think_ms if strategy is not None else 800
 
-        self.root.after(think_time, lambda: self.computer_responds(player_choice))
+        self.round_trace = (pressed, self.tracer.now())
+        self.round_id = self.scheduler.after(think_time, self.computer_responds, player_choice)
 
     def computer_responds(self, player_choice):
         """Computer makes its choice after thinking time"""
-        computer_choice = self.get_computer_choice()
+        pressed, scheduled = self.round_trace
+        self.tracer.record("think", scheduled)
+        start = self.tracer.now()
 
-        self.animate_choice_reveal(player_choice, computer_choice)
-
-        winner = self.determine_winner(player_choice, computer_choice)
+        result = self.engine.play_round(player_choice)
+        if self.recorder is not None:
+            self.recorder.round(player_choice, result["computer"])
+        render_start = self.tracer.now()
+        computer_choice = result["computer"]
+        winner = result["winner"]
 
-        self.total_games += 1
+        self.animate_choice_reveal(player_choice, computer_choice)
 
         if winner == "Player":
-            self.player_score += 1
-            self.current_streak += 1
-            if self.current_streak > self.best_streak:
-                self.best_streak = self.current_streak
             self.result_label.config(text="🎉 YOU WIN! 🎉", fg=self.colors['player_color'])
             self.animate_winner("player")
         elif winner == "Computer":
-            self.computer_score += 1
-            self.current_streak = 0
             self.result_label.config(text="💀 COMPUTER WINS! 💀", fg=self.colors['cpu_color'])
             self.animate_winner("computer")
         else:
-            self.draws += 1
             self.result_label.config(text="⚖️ IT'S A DRAW! ⚖️", fg=self.colors['draw_color'])
 
-        if self.timer_running:
-            self.switch_turn()
+        self.switch_turn()
 
-        self.update_challenges(player_choice, winner)
+        if result["completed_challenges"]:
+            self.show_challenge_completion(result["completed_challenges"])
+        self.refresh_challenges_display()
 
         self.update_score_display()
         self.update_statistics()
+        self.tracer.record("render", render_start)
 
-        self.game_history.append({
-            "player": player_choice,
-            "computer": computer_choice,
-            "winner": winner,
-            "timestamp": datetime.now().strftime("%H:%M:%S")
-        })
+        save_start = self.tracer.now()
+        self.record_round(result)
+        self.tracer.record("save", save_start)
 
-        if len(self.game_history) > self.max_history:
-            self.game_history.pop(0)
+        self.tracer.record("respond", start)
+        self.tracer.record("round", pressed)
+        if self.tracer.enabled:
+            # Runs after the redraws the widget changes above queued
+            self.root.after_idle(self.tracer.record, "paint", self.tracer.now())
 
-        self.save_stats()
+        self.round_id = None
+        self.moves.done()
+        if self.engine.strategy_errors:
+            self.root.after_idle(self.show_strategy_errors)
+        self.start_next_round()
 
     def animate_choice_reveal(self, player_choice, computer_choice):
-        """Animate the reveal of choices"""
+        """Animate the reveal of choices (replacing a countdown still running)"""
         countdown = ["3", "2", "1", "GO!"]
-
-        def show_countdown(index=0):
-            if index < len(countdown):
-                self.player_choice_label.config(text=countdown[index])
-                self.computer_choice_label.config(text=countdown[index])
-                self.root.after(300, show_countdown, index + 1)
-            else:
-                self.player_choice_label.config(text=self.choice_symbols[player_choice])
-                self.computer_choice_label.config(text=self.choice_symbols[computer_choice])
-
-        show_countdown()
+        self.animator.sequence(self.player_choice_label, "text", countdown, 300,
+                               final=self.choice_symbols[player_choice])
+        self.animator.sequence(self.computer_choice_label, "text", countdown, 300,
+                               final=self.choice_symbols[computer_choice])
 
     def animate_winner(self, winner):
         """Enhanced animation for winner"""
@@ -860,30 +854,21 @@ class RockPaperScissorsGame:
                      self.colors['cpu_color'], '#ff6b7a',
                      self.colors['cpu_color'], self.colors['bg_secondary']]
 
-        def animate(index=0):
-            if index < len(colors):
-                label.config(bg=colors[index])
-                self.root.after(150, animate, index + 1)
-            else:
-                label.config(bg=self.colors['bg_secondary'])
-
-        animate()
+        self.animator.sequence(label, "bg", colors, 150, final=self.colors['bg_secondary'])
 
     def update_score_display(self):
         """Update score labels"""
-        self.player_score_label.config(text=str(self.player_score))
-        self.computer_score_label.config(text=str(self.computer_score))
-        self.draw_label.config(text=str(self.draws))
+        self.player_score_label.config(text=str(self.engine.player_score))
+        self.computer_score_label.config(text=str(self.engine.computer_score))
+        self.draw_label.config(text=str(self.engine.draws))
 
     def reset_game(self):
         """Reset the game"""
-        if self.total_games == 0 or messagebox.askyesno("Reset Game", "Are you sure you want to reset all statistics?"):
-            self.player_score = 0
-            self.computer_score = 0
-            self.draws = 0
-            self.total_games = 0
-            self.game_history = []
-            self.current_streak = 0
+        if self.engine.total_games == 0 or messagebox.askyesno("Reset Game", "Are you sure you want to reset all statistics?"):
+            self.engine.reset()
+            if self.recorder is not None:
+                self.recorder.reset()
+            self.cancel_rounds()
 
             self.update_score_display()
             self.update_statistics()
@@ -893,62 +878,182 @@ class RockPaperScissorsGame:
 
             self.save_stats()
 
+    def cancel_rounds(self):
+        """Drop queued moves, the round in flight and its animations"""
+        if self.round_id is not None:
+            self.scheduler.after_cancel(self.round_id)
+            self.round_id = None
+        self.moves.clear()
+        self.animator.cancel(self.player_choice_label)
+        self.animator.cancel(self.computer_choice_label)
+
+    def history_rounds(self):
+        """Every stored round, indexable: the lifetime history, or the SQLite rounds table"""
+        if self.store.lifetime is not None:
+            return self.store.lifetime
+        return self.store.round_table
+
     def show_history(self):
-        """Show enhanced game history"""
-        if not self.game_history:
+        """Show every game played, newest first, rendering only the visible rows"""
+        rounds = self.history_rounds()
+        if len(rounds) == 0:
             messagebox.showinfo("Game History", "No games played yet!")
             return
 
         history_window = tk.Toplevel(self.root)
         history_window.title("📊 Game History")
-        history_window.geometry("600x450")
+        history_window.geometry("760x620")
         history_window.configure(bg=self.colors['bg_primary'])
 
         tk.Label(
             history_window,
-            text="📊 GAME HISTORY - Last 10 Games",
+            text="📊 GAME HISTORY",
             font=(self.custom_font, 18, "bold"),
             bg=self.colors['bg_primary'],
             fg=self.colors['accent_secondary']
         ).pack(pady=15)
 
-        container = tk.Frame(history_window, bg=self.colors['bg_primary'])
-        container.pack(padx=20, pady=10, fill=tk.BOTH, expand=True)
+        self.create_lifetime_summary(history_window)
 
-        canvas = tk.Canvas(container, bg=self.colors['bg_card'])
-        scrollbar = ttk.Scrollbar(container, orient="vertical", command=canvas.yview)
-        scrollable_frame = tk.Frame(canvas, bg=self.colors['bg_card'])
+        filter_frame = tk.Frame(history_window, bg=self.colors['bg_primary'])
+        filter_frame.pack(padx=20, pady=(10, 0), fill=tk.X)
 
-        scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
+        result_filter = tk.StringVar(value="All")
+        difficulty_filter = tk.StringVar(value="All")
+        for text, variable, values in (("Result:", result_filter, ["All", "Player", "Computer", "Draw"]),
+                                       ("Difficulty:", difficulty_filter, ["All"] + strategy_names())):
+            tk.Label(filter_frame, text=text, font=(self.custom_font, 10, "bold"),
+                     bg=self.colors['bg_primary'], fg=self.colors['text_primary']).pack(side=tk.LEFT, padx=(0, 5))
+            combo = ttk.Combobox(filter_frame, textvariable=variable, values=values, state="readonly", width=12)
+            combo.pack(side=tk.LEFT, padx=(0, 15))
+            combo.bind("<<ComboboxSelected>>", lambda e: apply_filter())
 
-        canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
+        count_label = tk.Label(filter_frame, font=(self.custom_font, 10),
+                               bg=self.colors['bg_primary'], fg=self.colors['text_secondary'])
+        count_label.pack(side=tk.RIGHT)
 
-        headers = ["⏰ Time", "👤 You", "🤖 Computer", "🏆 Result"]
+        container = tk.Frame(history_window, bg=self.colors['bg_card'])
+        container.pack(padx=20, pady=10, fill=tk.BOTH, expand=True)
+        table = tk.Frame(container, bg=self.colors['bg_card'])
+        table.pack(side="left", fill="both", expand=True)
+
+        headers = ["⏰ Time", "👤 You", "🤖 Computer", "🏆 Result", "🎯 Difficulty"]
         for i, header in enumerate(headers):
             tk.Label(
-                scrollable_frame,
+                table,
                 text=header,
                 font=(self.custom_font, 11, "bold"),
                 bg=self.colors['bg_secondary'],
                 fg=self.colors['accent_secondary'],
-                width=15
-            ).grid(row=0, column=i, padx=5, pady=8, sticky="ew")
-
-        for idx, game in enumerate(reversed(self.game_history)):
-            bg_color = self.colors['player_color'] if game["winner"] == "Player" else self.colors['cpu_color'] if game["winner"] == "Computer" else self.colors['draw_color']
-            row_bg = self.colors['bg_secondary'] if idx % 2 == 0 else self.colors['bg_card']
+                width=14
+            ).grid(row=0, column=i, padx=3, pady=8, sticky="ew")
+
+        # A fixed pool of row labels is re-bound to whichever rounds are in
+        # view, so opening and scrolling cost the same for any history size.
+        visible_rows = 15
+        row_labels = []
+        for row in range(visible_rows):
+            row_bg = self.colors['bg_secondary'] if row % 2 == 0 else self.colors['bg_card']
+            labels = [tk.Label(table, bg=row_bg, fg=self.colors['text_primary'], width=14, font=(self.custom_font, 9))
+                      for _ in headers]
+            for column, label in enumerate(labels):
+                label.grid(row=row + 1, column=column, padx=3, pady=2)
+            row_labels.append(labels)
+
+        winner_colors = {"Player": self.colors['player_color'], "Computer": self.colors['cpu_color'],
+                         "Draw": self.colors['draw_color']}
+        view = {"indexes": range(len(rounds)), "top": 0}
+
+        def render():
+            indexes, top = view["indexes"], view["top"]
+            total = len(indexes)
+            for row, labels in enumerate(row_labels):
+                position = top + row
+                if position >= total:
+                    row_bg = self.colors['bg_secondary'] if row % 2 == 0 else self.colors['bg_card']
+                    for label in labels:
+                        label.config(text="", bg=row_bg)
+                    continue
+                player, computer, winner, difficulty, epoch = rounds.round(int(indexes[total - 1 - position]))
+                labels[0].config(text=datetime.fromtimestamp(epoch).strftime("%m-%d %H:%M:%S"),
+                                 fg=self.colors['text_secondary'])
+                labels[1].config(text=player)
+                labels[2].config(text=computer)
+                labels[3].config(text=winner, bg=winner_colors[winner], fg=self.colors['bg_primary'])
+                labels[4].config(text=difficulty or "-")
+            if total:
+                scrollbar.set(top / total, min(top + visible_rows, total) / total)
+            else:
+                scrollbar.set(0, 1)
+            count_label.config(text=f"{total} games")
+
+        def scroll_to(top):
+            view["top"] = max(0, min(int(top), len(view["indexes"]) - visible_rows))
+            render()
+
+        def on_scrollbar(action, amount, unit=None):
+            if action == "moveto":
+                scroll_to(float(amount) * len(view["indexes"]))
+            elif action == "scroll":
+                step = visible_rows if unit == "pages" else 1
+                scroll_to(view["top"] + int(amount) * step)
+
+        def on_wheel(event):
+            if getattr(event, "num", None) == 4 or getattr(event, "delta", 0) > 0:
+                scroll_to(view["top"] - 3)
+            else:
+                scroll_to(view["top"] + 3)
 
-            tk.Label(scrollable_frame, text=game["timestamp"], bg=row_bg, fg=self.colors['text_secondary'], width=15, font=(self.custom_font, 9)).grid(row=idx+1, column=0, padx=5, pady=2)
-            tk.Label(scrollable_frame, text=game["player"], bg=row_bg, fg=self.colors['text_primary'], width=15, font=(self.custom_font, 9)).grid(row=idx+1, column=1, padx=5, pady=2)
-            tk.Label(scrollable_frame, text=game["computer"], bg=row_bg, fg=self.colors['text_primary'], width=15, font=(self.custom_font, 9)).grid(row=idx+1, column=2, padx=5, pady=2)
-            tk.Label(scrollable_frame, text=game["winner"], bg=bg_color, fg=self.colors['bg_primary'], width=15, font=(self.custom_font, 9, "bold")).grid(row=idx+1, column=3, padx=5, pady=2)
+        def apply_filter():
+            winner = None if result_filter.get() == "All" else result_filter.get()
+            difficulty = None if difficulty_filter.get() == "All" else difficulty_filter.get()
+            view["indexes"] = rounds.matching(winner, difficulty)
+            scroll_to(0)
 
-        canvas.pack(side="left", fill="both", expand=True)
+        scrollbar = ttk.Scrollbar(container, orient="vertical", command=on_scrollbar)
         scrollbar.pack(side="right", fill="y")
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            history_window.bind(sequence, on_wheel)
+        render()
+
+    def create_lifetime_summary(self, parent):
+        """Lifetime win rates and streaks from the running analytics"""
+        stats = self.analytics
+        if stats is None:
+            tk.Label(
+                parent,
+                text="Lifetime: still counting your past rounds...",
+                font=(self.custom_font, 9),
+                bg=self.colors['bg_secondary'],
+                fg=self.colors['text_secondary'],
+                padx=10,
+                pady=8
+            ).pack(padx=20, fill=tk.X)
+            return
+
+        by_difficulty = "  ".join(f"{name} {rate}%" for name, rate in stats.win_rate_by_difficulty().items())
+        by_move = "  ".join(f"{move} {rate}%" for move, rate in stats.win_rate_by_move().items())
+        by_hour = stats.win_rate_by_hour()
+        best_hour = max(by_hour, key=by_hour.get) if by_hour else None
+        streaks = stats.streak_distribution()
+
+        lines = [
+            f"Lifetime: {len(stats)} rounds, {stats.win_rate()}% won, last {stats.window}: {stats.rolling_win_rate()}%",
+            f"By difficulty: {by_difficulty or '-'}",
+            f"By your move: {by_move or '-'}",
+            f"Best hour: {f'{best_hour:02d}:00 ({by_hour[best_hour]}%)' if best_hour is not None else '-'}"
+            f"   Longest streak: {max(streaks, default=0)}   Streaks of 3+: {sum(n for length, n in streaks.items() if length >= 3)}",
+        ]
+        tk.Label(
+            parent,
+            text="\n".join(lines),
+            font=(self.custom_font, 9),
+            bg=self.colors['bg_secondary'],
+            fg=self.colors['text_secondary'],
+            justify=tk.LEFT,
+            padx=10,
+            pady=8
+        ).pack(padx=20, fill=tk.X)
 
     def show_challenges(self):
         """Display challenges window"""
@@ -981,13 +1086,14 @@ class RockPaperScissorsGame:
             bg=self.colors['bg_card']
         ).pack(pady=(12, 2))
 
-        tk.Label(
+        self.challenge_points_label = tk.Label(
             points_frame,
-            text=f"⭐ {self.total_challenge_points}",
+            text=f"⭐ {self.engine.total_challenge_points}",
             font=(self.custom_font, 28, "bold"),
             fg=self.colors['draw_color'],
             bg=self.colors['bg_card']
-        ).pack(pady=(0, 12))
+        )
+        self.challenge_points_label.pack(pady=(0, 12))
 
         challenges_container = tk.Frame(self.challenge_window, bg=self.colors['bg_primary'])
         challenges_container.pack(pady=15, padx=40, fill=tk.BOTH, expand=True)
@@ -1007,8 +1113,9 @@ class RockPaperScissorsGame:
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
 
-        for idx, challenge in enumerate(self.challenges):
-            self.create_challenge_card(challenges_frame, challenge, idx)
+        self.challenges_frame = challenges_frame
+        self.challenge_cards = [(challenge, self.create_challenge_card(challenges_frame, challenge, idx))
+                                for idx, challenge in enumerate(self.engine.challenges)]
 
         refresh_btn = tk.Button(
             self.challenge_window,
@@ -1036,7 +1143,7 @@ class RockPaperScissorsGame:
         info_label.pack(pady=(0, 15))
 
     def create_challenge_card(self, parent, challenge, idx):
-        """Create a challenge card widget - Modern design"""
+        """Create a challenge card widget - Modern design; returns a function that patches it in place"""
         card_bg = self.colors['bg_secondary'] if challenge.completed else self.colors['bg_card']
         card_frame = tk.Frame(parent, bg=card_bg, relief=tk.FLAT, bd=0)
         card_frame.pack(pady=8, fill=tk.X)
@@ -1060,125 +1167,116 @@ class RockPaperScissorsGame:
         }
         icon = challenge_icons.get(challenge.type, "🏆")
 
-        tk.Label(
+        name_label = tk.Label(
             name_frame,
             text=f"{icon} {challenge.name}",
             font=(self.custom_font, 13, "bold"),
             fg=self.colors['player_color'] if challenge.completed else self.colors['accent_secondary'],
             bg=card_bg
-        ).pack(side=tk.LEFT)
+        )
+        name_label.pack(side=tk.LEFT)
 
+        done_label = tk.Label(
+            header_frame,
+            text="✓ DONE",
+            font=(self.custom_font, 10, "bold"),
+            fg=self.colors['player_color'],
+            bg=card_bg,
+            padx=10,
+            pady=2
+        )
         if challenge.completed:
-            tk.Label(
-                header_frame,
-                text="✓ DONE",
-                font=(self.custom_font, 10, "bold"),
-                fg=self.colors['player_color'],
-                bg=card_bg,
-                padx=10,
-                pady=2
-            ).pack(side=tk.RIGHT)
+            done_label.pack(side=tk.RIGHT)
 
-        tk.Label(
+        description_label = tk.Label(
             inner_frame,
             text=challenge.description,
             font=(self.custom_font, 10),
             fg=self.colors['text_secondary'],
             bg=card_bg
-        ).pack(anchor=tk.W, pady=(0, 10))
+        )
+        description_label.pack(anchor=tk.W, pady=(0, 10))
 
         progress_container = tk.Frame(inner_frame, bg=card_bg)
         progress_container.pack(fill=tk.X, pady=(0, 8))
 
         progress_bg = tk.Canvas(progress_container, height=12, bg=self.colors['bg_primary'], highlightthickness=0)
         progress_bg.pack(side=tk.LEFT, fill=tk.X, expand=True)
-
-        progress_percent = challenge.get_progress_percentage()
-        bar_width = int(progress_bg.winfo_reqwidth() * progress_percent / 100) if progress_percent > 0 else 0
+        progress_bar = progress_bg.create_rectangle(0, 0, 0, 12, fill=self.colors['accent_primary'], outline="")
 
         def update_progress_bar(event=None):
-            progress_bg.delete("all")
-            canvas_width = progress_bg.winfo_width()
-            fill_width = int(canvas_width * progress_percent / 100)
-
-            bar_color = self.colors['player_color'] if challenge.completed else self.colors['accent_primary']
-            progress_bg.create_rectangle(0, 0, fill_width, 12, fill=bar_color, outline="")
+            canvas_width = event.width if event is not None else progress_bg.winfo_width()
+            fill_width = int(canvas_width * challenge.get_progress_percentage() / 100)
+            progress_bg.coords(progress_bar, 0, 0, fill_width, 12)
 
         progress_bg.bind("<Configure>", update_progress_bar)
-        progress_bg.after(10, update_progress_bar)
 
-        progress_text = f"{challenge.progress}/{challenge.target}"
-        tk.Label(
+        progress_label = tk.Label(
             progress_container,
-            text=progress_text,
+            text=f"{challenge.progress}/{challenge.target}",
             font=(self.custom_font, 10, "bold"),
             fg=self.colors['text_primary'],
             bg=card_bg
-        ).pack(side=tk.LEFT, padx=(12, 0))
+        )
+        progress_label.pack(side=tk.LEFT, padx=(12, 0))
 
         reward_frame = tk.Frame(inner_frame, bg=card_bg)
         reward_frame.pack(fill=tk.X)
 
-        tk.Label(
+        reward_label = tk.Label(
             reward_frame,
             text=f"💰 Reward: {challenge.reward_points} pts",
             font=(self.custom_font, 9, "bold"),
             fg=self.colors['draw_color'],
             bg=card_bg
-        ).pack(side=tk.LEFT)
+        )
+        reward_label.pack(side=tk.LEFT)
+
+        backgrounds = [card_frame, inner_frame, header_frame, name_frame, name_label, done_label,
+                       description_label, progress_container, progress_label, reward_frame, reward_label]
+        shown = {"progress": None, "completed": None}
+
+        def update_card():
+            """Patch only what changed since the last update"""
+            first = shown["completed"] is None
+            if challenge.progress != shown["progress"]:
+                shown["progress"] = challenge.progress
+                progress_label.config(text=f"{challenge.progress}/{challenge.target}")
+                update_progress_bar()
+            if challenge.completed != shown["completed"]:
+                shown["completed"] = challenge.completed
+                progress_bg.itemconfig(progress_bar, fill=self.colors['player_color'] if challenge.completed
+                                       else self.colors['accent_primary'])
+                if challenge.completed and not first:
+                    bg = self.colors['bg_secondary']
+                    for widget in backgrounds:
+                        widget.config(bg=bg)
+                    name_label.config(fg=self.colors['player_color'])
+                    done_label.pack(side=tk.RIGHT)
+
+        update_card()
+        return update_card
 
     def refresh_challenges_display(self):
-        """Refresh the challenges display"""
-        if self.challenge_window and tk.Toplevel.winfo_exists(self.challenge_window):
-            self.challenge_window.destroy()
-        self.show_challenges()
-
-    def update_challenges(self, player_choice, winner):
-        """Update challenge progress based on game results"""
-        completed_challenges = []
-
-        for challenge in self.challenges:
-            if challenge.completed:
-                continue
-
-            updated = False
-
-            if challenge.type == "wins" and winner == "Player":
-                updated = challenge.update_progress(1)
-
-            elif challenge.type == "streak":
-                if self.current_streak >= challenge.target:
-                    challenge.progress = challenge.target
-                    updated = challenge.update_progress(0)
-
-            elif challenge.type == "games":
-                updated = challenge.update_progress(1)
-
-            elif challenge.type == "specific_choice":
-                if winner == "Player" and player_choice == challenge.difficulty:
-                    updated = challenge.update_progress(1)
-
-            elif challenge.type == "difficulty":
-                if winner == "Player" and self.difficulty == challenge.difficulty:
-                    updated = challenge.update_progress(1)
-
-            elif challenge.type == "speed":
-                if winner == "Player":
-                    updated = challenge.update_progress(1)
-
-            if updated:
-                completed_challenges.append(challenge)
-
-        if completed_challenges:
-            self.show_challenge_completion(completed_challenges)
+        """Bring an open challenges window up to date, patching cards in place"""
+        if not (self.challenge_window and tk.Toplevel.winfo_exists(self.challenge_window)):
+            return
 
-        self.save_stats()
+        challenges = list(self.engine.challenges)
+        if [challenge for challenge, _ in self.challenge_cards] != challenges:
+            # A new day's challenges: only the cards are rebuilt, not the window
+            for child in self.challenges_frame.winfo_children():
+                child.destroy()
+            self.challenge_cards = [(challenge, self.create_challenge_card(self.challenges_frame, challenge, idx))
+                                    for idx, challenge in enumerate(challenges)]
+        else:
+            for _, update_card in self.challenge_cards:
+                update_card()
+        self.challenge_points_label.config(text=f"⭐ {self.engine.total_challenge_points}")
 
     def show_challenge_completion(self, completed_challenges):
         """Show notification for completed challenges"""
         for challenge in completed_challenges:
-            self.total_challenge_points += challenge.reward_points
-
             notification = tk.Toplevel(self.root)
             notification.title("Challenge Completed!")
             notification.geometry("400x250")
@@ -1232,115 +1330,134 @@ class RockPaperScissorsGame:
                 cursor="hand2"
             ).pack(pady=10)
 
-            notification.after(5000, notification.destroy)
-
-        if self.challenge_window and tk.Toplevel.winfo_exists(self.challenge_window):
-            self.refresh_challenges_display()
+            self.scheduler.after(5000, notification.destroy)
 
     def change_difficulty(self):
-        """Change difficulty level with Expert mode"""
-        difficulties = ["Easy", "Normal", "Hard", "Expert"]
-        current_index = difficulties.index(self.difficulty)
+        """Switch to the next strategy: the built-in difficulties, then any plugins"""
+        difficulties = strategy_names()
+        current_index = difficulties.index(self.engine.difficulty) if self.engine.difficulty in difficulties else -1
         next_index = (current_index + 1) % len(difficulties)
-        self.difficulty = difficulties[next_index]
+        self.engine.difficulty = difficulties[next_index]
+        if self.recorder is not None:
+            self.recorder.difficulty(self.engine.difficulty)
 
-        self.difficulty_btn.config(text=f"🎯 Difficulty: {self.difficulty}")
+        self.difficulty_btn.config(text=f"🎯 Difficulty: {self.engine.difficulty}")
 
-        descriptions = {
-            "Easy": "Computer makes random moves with occasional mistakes",
-            "Normal": "Computer plays completely random",
-            "Hard": "Computer analyzes your patterns and tries to counter",
-            "Expert": "Advanced AI with pattern recognition - Very challenging!"
-        }
+        strategy = self.engine.strategy
+        if strategy is not None:
+            description = strategy.description
+        else:
+            description = "\n".join(self.engine.strategy_errors) or "Could not load this strategy - playing random"
+        self.engine.strategy_errors.clear()
 
         messagebox.showinfo(
             "Difficulty Changed",
-            f"Difficulty: {self.difficulty}\n\n{descriptions[self.difficulty]}"
+            f"Difficulty: {self.engine.difficulty}\n\n{description}"
         )
 
+    def show_strategy_errors(self):
+        """Warn about strategies the engine had to drop (they play random until picked again)"""
+        if self.engine.strategy_errors:
+            errors = "\n".join(self.engine.strategy_errors)
+            self.engine.strategy_errors.clear()
+            messagebox.showwarning("Strategy Error", errors)
+
+    def record_round(self, result):
+        """Count a finished round in the analytics and queue it for the background stats writer"""
+        if self.analytics is not None:
+            self.analytics.add(*self.store.round_record(result))
+        else:
+            self.analytics_backlog.append(self.store.round_record(result))
+        self.writer.append_round(self.engine, result)
+
     def save_stats(self):
-        """Save game statistics to file"""
-        stats = {
-            "player_score": self.player_score,
-            "computer_score": self.computer_score,
-            "draws": self.draws,
-            "total_games": self.total_games,
-            "current_streak": self.current_streak,
-            "best_streak": self.best_streak,
-            "history": self.game_history,
-            "total_challenge_points": self.total_challenge_points,
-            "challenges": [c.to_dict() for c in self.challenges],
-            "last_challenge_date": datetime.now().strftime("%Y-%m-%d")
-        }
+        """Queue a full snapshot of game statistics for the background writer"""
+        self.writer.save_snapshot(self.engine)
 
+    def load_stats(self):
+        """Load game statistics from file"""
         try:
-            with open("rps_stats.json", "w", encoding="utf-8") as f:
-                json.dump(stats, f, indent=4)
+            if not self.store.load(self.engine):
+                self.engine.challenges = generate_daily_challenges(rng=self.engine.rng)
+                self.store.save_snapshot(self.engine)
         except Exception as e:
-            print(f"Error saving stats: {e}")
-
-    def generate_daily_challenges(self):
-        """Generate random daily challenges"""
-        challenge_pool = [
-            Challenge("win_3", "Quick Winner", "Win 3 games", 3, 50, "wins"),
-            Challenge("win_5", "Victory March", "Win 5 games", 5, 100, "wins"),
-            Challenge("win_10", "Dominator", "Win 10 games", 10, 250, "wins"),
-
-            Challenge("streak_3", "Hot Streak", "Win 3 games in a row", 3, 75, "streak"),
-            Challenge("streak_5", "Unstoppable", "Win 5 games in a row", 5, 150, "streak"),
-
-            Challenge("games_10", "Practice Makes Perfect", "Play 10 games", 10, 50, "games"),
-            Challenge("games_20", "Marathon Player", "Play 20 games", 20, 100, "games"),
-
-            Challenge("rock_wins", "Rock Solid", "Win 5 games using Rock", 5, 100, "specific_choice", "Rock"),
-            Challenge("paper_wins", "Paper Champion", "Win 5 games using Paper", 5, 100, "specific_choice", "Paper"),
-            Challenge("scissors_wins", "Scissors Master", "Win 5 games using Scissors", 5, 100, "specific_choice", "Scissors"),
-
-            Challenge("beat_hard", "Hard Mode Hero", "Win 3 games on Hard difficulty", 3, 150, "difficulty", "Hard"),
-            Challenge("beat_expert", "Expert Slayer", "Win 3 games on Expert difficulty", 3, 200, "difficulty", "Expert"),
-
-            Challenge("quick_5", "Speed Demon", "Win 5 games in under 5 minutes total", 5, 150, "speed"),
-        ]
+            print(f"Error loading stats: {e}")
+            if not self.engine.challenges:
+                self.engine.challenges = generate_daily_challenges(rng=self.engine.rng)
+
+    def open_recording(self):
+        """Start recording this session under RECORD_DIR, named by start time and seed"""
+        from recording import SessionRecorder
+        os.makedirs(RECORD_DIR, exist_ok=True)
+        path = os.path.join(RECORD_DIR, f"session-{datetime.now():%Y%m%d-%H%M%S}-{self.seed}.rpsrec")
+        return SessionRecorder(path, self.engine, self.seed, self.chess_clock, moves=self.moves)
+
+    def toggle_tracing(self):
+        """Start or stop recording per-round latency spans"""
+        self.tracer.enabled = not self.tracer.enabled
+        self.refresh_trace_overlay()
+
+    def show_trace_overlay(self):
+        """Open (or close) a small window with per-phase round latency, refreshed while it is open"""
+        if self.trace_window is not None and self.trace_window.winfo_exists():
+            self.trace_window.destroy()
+            self.trace_window = None
+            return
 
-        selected = random.sample(challenge_pool, min(3, len(challenge_pool)))
-        return selected
+        self.trace_window = tk.Toplevel(self.root)
+        self.trace_window.title("Round Latency (ms)")
+        self.trace_window.configure(bg=self.colors['bg_primary'])
+        self.trace_label = tk.Label(
+            self.trace_window,
+            font=(self.custom_font, 10),
+            justify=tk.LEFT,
+            bg=self.colors['bg_primary'],
+            fg=self.colors['text_primary']
+        )
+        self.trace_label.pack(padx=15, pady=10)
+        self.refresh_trace_overlay()
 
-    def load_stats(self):
-        """Load game statistics from file"""
-        if os.path.exists("rps_stats.json"):
-            try:
-                with open("rps_stats.json", "r", encoding="utf-8") as f:
-                    stats = json.load(f)
-                    self.player_score = stats.get("player_score", 0)
-                    self.computer_score = stats.get("computer_score", 0)
-                    self.draws = stats.get("draws", 0)
-                    self.total_games = stats.get("total_games", 0)
-                    self.current_streak = stats.get("current_streak", 0)
-                    self.best_streak = stats.get("best_streak", 0)
-                    self.game_history = stats.get("history", [])
-                    self.total_challenge_points = stats.get("total_challenge_points", 0)
-
-                    challenges_data = stats.get("challenges", [])
-                    last_challenge_date = stats.get("last_challenge_date", "")
-                    today = datetime.now().strftime("%Y-%m-%d")
-
-                    if last_challenge_date != today:
-                        self.challenges = self.generate_daily_challenges()
-                    else:
-                        self.challenges = [Challenge.from_dict(c) for c in challenges_data]
-
-                    if not self.challenges:
-                        self.challenges = self.generate_daily_challenges()
-            except Exception as e:
-                print(f"Error loading stats: {e}")
-                if not self.challenges:
-                    self.challenges = self.generate_daily_challenges()
-        else:
-            self.challenges = self.generate_daily_challenges()
+    def refresh_trace_overlay(self):
+        """Redraw the latency overlay every 500 ms until it is closed"""
+        if self.trace_window is None or not self.trace_window.winfo_exists():
+            return
+        state = "on" if self.tracer.enabled else "off - press F9 to start"
+        self.trace_label.config(text=f"tracing {state}\n\n{self.tracer.report()}")
+        if self.trace_refresh_id:
+            self.scheduler.after_cancel(self.trace_refresh_id)
+        self.trace_refresh_id = self.scheduler.after(500, self.refresh_trace_overlay)
+
+    def on_close(self):
+        """Flush stats to disk before the window closes"""
+        if self.tracer.histograms:
+            print(self.tracer.report())
+        if self.lag_monitor is not None:
+            self.lag_monitor.stop()
+            print(self.lag_monitor.report())
+        if self.recorder is not None:
+            self.recorder.close(self.engine)
+        self.writer.close(self.engine)
+        self.root.destroy()
 
 def main():
+    startup = PhaseTimer(STARTED)
+    startup.mark("imports")
     root = tk.Tk()
-    game = RockPaperScissorsGame(root)
+    startup.mark("Tk root")
+    game = RockPaperScissorsGame(root, startup)
+
+    if "--profile-startup" in sys.argv[1:]:
+        def report():
+            # The analytics phase runs on a worker thread while the window is already interactive
+            if game.analytics is None:
+                root.after(20, report)
+                return
+            print(startup.report())
+            print(f"{'time to interactive':<28}{startup.elapsed('first frame') * 1e3:>9.1f} ms")
+            game.on_close()
+        # Queued behind finish_startup
+        root.after_idle(root.after, 0, report)
+
     root.mainloop()
 
 if __name__ == "__main__":
@@ -0,0 +1,75 @@
+"""RoundAnalytics over a large lifetime history: one bulk pass, then per-round updates.
+
+Usage: python benchmarks/bench_analytics.py [rounds]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import analytics
+from ai import CHOICES
+from analytics import RoundAnalytics
+from history import DIFFICULTIES
+from history import WINNERS
+from lifetime import LifetimeHistory, load_numpy
+
+
+def write_columns(directory, count):
+    """Random lifetime columns written straight to disk (building tuples for 10M rounds takes longer than the pass)"""
+    os.makedirs(directory)
+    modulo = lambda n: bytes(i % n for i in range(256))
+    columns = {
+        "player": os.urandom(count).translate(modulo(3)),
+        "computer": os.urandom(count).translate(modulo(3)),
+        "winner": os.urandom(count).translate(modulo(3)),
+        "difficulty": os.urandom(count).translate(modulo(len(DIFFICULTIES))),
+        "epoch": array("q", range(int(time.time()) - count * 3, int(time.time()), 3)[:count]).tobytes(),
+    }
+    for name, data in columns.items():
+        with open(os.path.join(directory, name + ".bin"), "wb") as f:
+            f.write(data)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000000
+    directory = os.path.join(tempfile.mkdtemp(), "rps_history")
+    write_columns(directory, count)
+    lifetime = LifetimeHistory(directory)
+
+    print(f"{count:,} rounds")
+    vectorized = load_numpy() is not None and count >= analytics.NUMPY_MIN_ROUNDS
+    stats, bulk = timed(lambda: RoundAnalytics.from_lifetime(lifetime))
+    print(f"{'bulk pass, ' + ('numpy' if vectorized else 'pure Python'):<32}{bulk:>10.2f} s")
+
+    if vectorized and count <= 2000000:
+        analytics.NUMPY_MIN_ROUNDS = count + 1
+        _, pure = timed(lambda: RoundAnalytics.from_lifetime(lifetime))
+        print(f"{'bulk pass, pure Python':<32}{pure:>10.2f} s")
+
+    random.seed(1)
+    rounds = [(random.choice(CHOICES), random.choice(CHOICES), random.choice(WINNERS),
+               random.choice(DIFFICULTIES), int(time.time())) for _ in range(100000)]
+    _, live = timed(lambda: [stats.add(*r) for r in rounds])
+    print(f"{'add one round':<32}{live / len(rounds) * 1e6:>10.2f} us")
+
+    print()
+    print(f"win rate {stats.win_rate()}%, last {stats.window}: {stats.rolling_win_rate()}%")
+    print("by difficulty", stats.win_rate_by_difficulty())
+    print("by move", stats.win_rate_by_move())
+    print("longest streaks", dict(list(stats.streak_distribution().items())[-5:]))
+    lifetime.close()
+
+
+if __name__ == "__main__":
+    main()
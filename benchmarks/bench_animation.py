@@ -0,0 +1,118 @@
+"""Rapid play under simulated time: separate after() chains per animation vs one Animator tick.
+
+Counts scheduled callbacks, widget config calls and how many animations
+were fighting over the same label at once. No display needed.
+
+Usage: python benchmarks/bench_animation.py [moves_per_second]
+"""
+import heapq
+import itertools
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from animation import Animator
+
+COUNTDOWN = ["3", "2", "1", "GO!"]
+FLASH = ["#3ae374", "#00d2ff", "#3ae374", "#00d2ff", "#3ae374", "#16213e"]
+
+
+class VirtualLoop:
+    """``after``/``after_cancel`` over a simulated clock"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.queue = []
+        self.ids = itertools.count()
+        self.cancelled = set()
+        self.callbacks = 0
+
+    def after(self, ms, fn, *args):
+        after_id = next(self.ids)
+        heapq.heappush(self.queue, (self.now + ms / 1000, after_id, fn, args))
+        return after_id
+
+    def after_cancel(self, after_id):
+        self.cancelled.add(after_id)
+
+    def clock(self):
+        return self.now
+
+    def run_until(self, t):
+        while self.queue and self.queue[0][0] <= t:
+            when, after_id, fn, args = heapq.heappop(self.queue)
+            if after_id in self.cancelled:
+                continue
+            self.now = when
+            self.callbacks += 1
+            fn(*args)
+        self.now = t
+
+
+class Label:
+    def __init__(self):
+        self.configs = 0
+        self.writers = {}
+
+    def config(self, **options):
+        self.configs += 1
+
+
+def chained(loop, label_a, label_b, moves, gap):
+    """The previous approach: every animation schedules its own chain"""
+    active = {"text": 0, "bg": 0}
+    worst = {"text": 0, "bg": 0}
+
+    def chain(label, option, values, interval, index=0):
+        if index == 0:
+            active[option] += 1
+            worst[option] = max(worst[option], active[option])
+        if index < len(values):
+            label.config(**{option: values[index]})
+            loop.after(interval, chain, label, option, values, interval, index + 1)
+        else:
+            label.config(**{option: values[-1]})
+            active[option] -= 1
+
+    for move in range(moves):
+        loop.run_until(move * gap)
+        chain(label_a, "text", COUNTDOWN, 300)
+        chain(label_b, "text", COUNTDOWN, 300)
+        chain(label_a, "bg", FLASH, 150)
+    loop.run_until(moves * gap + 5)
+    return worst
+
+
+def animated(loop, label_a, label_b, moves, gap):
+    animator = Animator(loop, clock=loop.clock)
+    worst = 0
+    for move in range(moves):
+        loop.run_until(move * gap)
+        animator.sequence(label_a, "text", COUNTDOWN, 300, final="ROCK")
+        animator.sequence(label_b, "text", COUNTDOWN, 300, final="PAPER")
+        animator.sequence(label_a, "bg", FLASH, 150, final="#16213e")
+        worst = max(worst, sum(1 for key in animator.tracks if key == (label_a, "text")))
+    loop.run_until(moves * gap + 5)
+    return worst
+
+
+def main():
+    rate = float(sys.argv[1]) if len(sys.argv) > 1 else 8
+    moves = 200
+    gap = 1 / rate
+
+    loop, a, b = VirtualLoop(), Label(), Label()
+    worst = chained(loop, a, b, moves, gap)
+    print(f"{moves} moves at {rate:g}/s")
+    print(f"{'':<24}{'callbacks':>10}{'configs':>10}{'overlapping countdowns':>24}")
+    print(f"{'after() chains':<24}{loop.callbacks:>10}{a.configs + b.configs:>10}{worst['text']:>24}")
+
+    loop, a, b = VirtualLoop(), Label(), Label()
+    worst = animated(loop, a, b, moves, gap)
+    print(f"{'Animator (30 fps cap)':<24}{loop.callbacks:>10}{a.configs + b.configs:>10}{worst:>24}")
+    print(f"callbacks per second while animating: at most {1000 // Animator(loop).frame_ms}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""Challenge window redraw cost: full rebuild (destroy + show_challenges) vs patching cards in place.
+
+By default this times the redraws on a real display (run under Xvfb on a
+headless machine). ``--headless`` instead runs the app on a stub Tk that
+counts what each update asks of Tk: widgets created, widgets destroyed
+and other widget calls (configure, pack, coords...). The counts need no
+display and do not depend on the machine, so they show the difference
+between the two approaches anywhere.
+
+Usage: python benchmarks/bench_challenge_window.py [repeats] [--headless]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import types
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from challenges import CHALLENGE_POOL, Challenge
+
+
+class StubWidget:
+    """Stands in for every Tk widget, counting the calls a redraw makes instead of drawing"""
+
+    counts = Counter()
+
+    def __init__(self, master=None, *args, **options):
+        self.master = master if isinstance(master, StubWidget) else None
+        self.children = []
+        self.options = options
+        self.alive = True
+        if self.master is not None:
+            self.master.children.append(self)
+        StubWidget.counts["created"] += 1
+
+    def destroy(self):
+        # Like Tk, destroying a widget destroys everything inside it
+        for child in list(self.children):
+            child.destroy()
+        if self.alive:
+            self.alive = False
+            StubWidget.counts["destroyed"] += 1
+            if self.master is not None:
+                self.master.children.remove(self)
+
+    def winfo_exists(self):
+        return int(self.alive)
+
+    def winfo_children(self):
+        return list(self.children)
+
+    def __getattr__(self, name):
+        def call(*args, **options):
+            StubWidget.counts["calls"] += 1
+            if name in ("config", "configure"):
+                self.options.update(options)
+            elif name == "cget":
+                return self.options.get(args[0], "")
+            elif name.startswith("after"):
+                # Nothing is scheduled: only the redraws themselves are measured
+                return "after#0"
+            elif name.startswith("create_"):
+                return 1
+            elif name.startswith("winfo_"):
+                return 100
+            elif name in ("bbox", "coords"):
+                return (0, 0, 100, 100)
+            elif name == "yview":
+                return (0.0, 1.0)
+            return None
+        return call
+
+
+class StubVariable:
+    def __init__(self, master=None, value="", name=None):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+def install_stub_tk():
+    """Put a counting stub in place of tkinter; call before importing the app"""
+    tk = types.ModuleType("tkinter")
+    for name in ("Tk", "Toplevel", "Frame", "Label", "Button", "Canvas", "Scrollbar", "Entry", "Listbox", "Text"):
+        setattr(tk, name, StubWidget)
+    tk.StringVar = tk.IntVar = tk.BooleanVar = StubVariable
+    tk.TclError = RuntimeError
+    for name in ("FLAT", "X", "Y", "BOTH", "LEFT", "RIGHT", "TOP", "BOTTOM", "W", "E", "N", "S", "NW", "END",
+                 "NORMAL", "DISABLED", "HIDDEN", "CENTER", "SOLID", "VERTICAL", "HORIZONTAL"):
+        setattr(tk, name, name.lower())
+    ttk = types.ModuleType("tkinter.ttk")
+    ttk.Scrollbar = ttk.Combobox = ttk.Progressbar = StubWidget
+    messagebox = types.ModuleType("tkinter.messagebox")
+    messagebox.showinfo = messagebox.showwarning = messagebox.showerror = lambda *args, **options: None
+    messagebox.askyesno = lambda *args, **options: True
+    tk.ttk, tk.messagebox = ttk, messagebox
+    sys.modules.update({"tkinter": tk, "tkinter.ttk": ttk, "tkinter.messagebox": messagebox})
+
+
+def timed(root, fn):
+    """Seconds for ``fn`` plus the redraw it causes"""
+    root.update()
+    start = time.perf_counter()
+    fn()
+    root.update()
+    return time.perf_counter() - start
+
+
+def counted(root, fn):
+    """What ``fn`` asked of the stub Tk: (created, destroyed, calls)"""
+    before = StubWidget.counts.copy()
+    fn()
+    after = StubWidget.counts
+    return tuple(after[key] - before[key] for key in ("created", "destroyed", "calls"))
+
+
+def rebuild(game):
+    game.challenge_window.destroy()
+    game.show_challenges()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Challenge window redraw cost")
+    parser.add_argument("repeats", type=int, nargs="?", default=50)
+    parser.add_argument("--headless", action="store_true", help="count Tk calls on a stub instead of timing")
+    args = parser.parse_args()
+
+    if args.headless:
+        install_stub_tk()
+    import tkinter as tk
+    from app import RockPaperScissorsGame
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"No display: {e} (--headless counts Tk calls without one)")
+        return
+
+    os.chdir(tempfile.mkdtemp())
+    game = RockPaperScissorsGame(root)
+    game.update_timer = lambda: None
+
+    if args.headless:
+        measure = counted
+        print("Per update: widgets created / destroyed / other widget calls")
+        print(f"{'cards':>6}{'rebuild':>18}{'patch':>18}{'complete':>18}")
+    else:
+        measure = timed
+        print(f"{'cards':>6}{'rebuild (ms)':>16}{'patch (ms)':>14}{'complete (ms)':>16}")
+    for count in (3, 13):
+        game.engine.challenges = [Challenge(*spec[:3], 10 ** 6, *spec[4:]) for spec in CHALLENGE_POOL[:count]]
+        if game.challenge_window:
+            game.challenge_window.destroy()
+        game.show_challenges()
+
+        rebuilds = [measure(root, lambda: rebuild(game)) for _ in range(args.repeats)]
+
+        def advance():
+            game.engine.play_round("Rock", "Scissors")
+            game.refresh_challenges_display()
+        patches = [measure(root, advance) for _ in range(args.repeats)]
+
+        # Targets 1..count: every round now completes exactly one card
+        game.engine.challenges = [Challenge(f"games_{k}", f"Games {k}", f"Play {k} games", k, 10, "games")
+                                  for k in range(1, count + 1)]
+        game.refresh_challenges_display()
+        completions = [measure(root, advance) for _ in range(count)]
+
+        if args.headless:
+            print(f"{count:>6}" + "".join(f"{'%d / %d / %d' % tuple(map(statistics.median, zip(*runs))):>18}"
+                                          for runs in (rebuilds, patches, completions)))
+        else:
+            print(f"{count:>6}{statistics.median(rebuilds) * 1e3:>16.2f}"
+                  f"{statistics.median(patches) * 1e3:>14.2f}{statistics.median(completions) * 1e3:>16.2f}")
+
+    game.writer.close(game.engine)
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
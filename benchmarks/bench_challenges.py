@@ -0,0 +1,83 @@
+"""Per-round challenge update cost vs number of active challenges: event index vs scanning every challenge.
+
+Usage: python benchmarks/bench_challenges.py [rounds]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai import CHOICES
+from challenges import CHALLENGE_POOL, Challenge, ChallengeBoard, round_events
+from history import DIFFICULTIES
+from history import WINNERS
+
+
+def scan_update(challenges, player_choice, winner, difficulty, streak):
+    """The previous per-round loop: every challenge, an if/elif chain on its type"""
+    completed = []
+    for challenge in challenges:
+        if challenge.completed:
+            continue
+        updated = False
+        if challenge.type == "wins" and winner == "Player":
+            updated = challenge.update_progress(1)
+        elif challenge.type == "streak":
+            if streak >= challenge.target:
+                challenge.progress = challenge.target
+                updated = challenge.update_progress(0)
+        elif challenge.type == "games":
+            updated = challenge.update_progress(1)
+        elif challenge.type == "specific_choice":
+            if winner == "Player" and player_choice == challenge.difficulty:
+                updated = challenge.update_progress(1)
+        elif challenge.type == "difficulty":
+            if winner == "Player" and difficulty == challenge.difficulty:
+                updated = challenge.update_progress(1)
+        elif challenge.type == "speed":
+            if winner == "Player":
+                updated = challenge.update_progress(1)
+        if updated:
+            completed.append(challenge)
+    return completed
+
+
+def make_challenges(count):
+    """``count`` long-running challenges: the daily pool's types, spread over every move and difficulty"""
+    challenges = []
+    for i in range(count):
+        spec = list(CHALLENGE_POOL[i % len(CHALLENGE_POOL)])
+        spec[3] = 10 ** 9
+        if spec[5] == "difficulty":
+            spec[6] = DIFFICULTIES[i % len(DIFFICULTIES)]
+        challenges.append(Challenge(*spec))
+    return challenges
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    random.seed(1)
+    plays = [(random.choice(CHOICES), random.choice(WINNERS), random.choice(DIFFICULTIES), random.randrange(6))
+             for _ in range(rounds)]
+
+    print(f"{'active challenges':>18}{'scan (us/round)':>18}{'indexed (us/round)':>20}")
+    for count in (3, 13, 100, 1000):
+        challenges = make_challenges(count)
+        start = time.perf_counter()
+        for player, winner, difficulty, streak in plays:
+            scan_update(challenges, player, winner, difficulty, streak)
+        scan = time.perf_counter() - start
+
+        board = ChallengeBoard(make_challenges(count))
+        start = time.perf_counter()
+        for player, winner, difficulty, streak in plays:
+            board.dispatch(round_events(player, winner, difficulty, streak))
+        indexed = time.perf_counter() - start
+
+        print(f"{count:>18}{scan / rounds * 1e6:>18.2f}{indexed / rounds * 1e6:>20.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Drift of a 15-minute chess-clock game under late, jittery after() callbacks.
+
+Compares the old one-second decrement per callback with ChessClock against
+the exact time each side spent on its moves, switching turns at random.
+No display needed; exits non-zero if ChessClock drifts by 5 ms or more.
+
+Usage: python benchmarks/bench_chess_clock.py [seed] [increment]
+"""
+import math
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_animation import VirtualLoop
+from chess_clock import SIDES, ChessClock
+
+GAME_SECONDS = 15 * 60
+MAX_DRIFT = 0.005
+
+
+class LateLoop(VirtualLoop):
+    """Callbacks fire 0-40 ms late, with the odd 250 ms stall (a busy UI)"""
+
+    def __init__(self, rng):
+        super().__init__()
+        self.rng = rng
+
+    def after(self, ms, fn, *args):
+        late = self.rng.uniform(0, 40)
+        if self.rng.random() < 0.02:
+            late += 250
+        return super().after(ms + late, fn, *args)
+
+
+def play(rng, increment):
+    """One game: returns (worst ChessClock drift, worst tick-counter drift, moves, refreshes, flag latency)"""
+    loop = LateLoop(rng)
+    clock = ChessClock(GAME_SECONDS, increment=increment, clock=loop.clock)
+    truth = dict.fromkeys(SIDES, float(GAME_SECONDS))
+    ticks = dict.fromkeys(SIDES, GAME_SECONDS)
+    refreshes = [0]
+    pending = [None]
+    flag_seen = []
+    worst = [0.0, 0.0]
+
+    def measure():
+        for side in SIDES:
+            worst[0] = max(worst[0], abs(clock.remaining(side) - max(truth[side], 0.0)))
+            worst[1] = max(worst[1], abs(ticks[side] - max(truth[side], 0.0)))
+
+    def refresh():
+        # What the app's update_timer does
+        refreshes[0] += 1
+        pending[0] = None
+        if clock.flagged():
+            flag_seen.append(loop.now)
+        elif clock.running:
+            pending[0] = loop.after(max(1, math.ceil(clock.next_change() * 1000)), refresh)
+
+    def tick():
+        # The old update_timer: one second off whoever's turn it is, per callback
+        ticks[clock.turn] -= 1
+        loop.after(1000, tick)
+
+    clock.start("player")
+    refresh()
+    loop.after(1000, tick)
+    moves = 0
+    while min(truth.values()) > 0:
+        think = rng.choice((rng.uniform(0.2, 3), rng.uniform(3, 30)))
+        mover = clock.turn
+        think = min(think, truth[mover])
+        loop.run_until(loop.now + think)
+        truth[mover] -= think
+        measure()
+        if truth[mover] <= 0:
+            flagged_at = loop.now
+            loop.run_until(loop.now + 2)
+            break
+        clock.switch()
+        truth[mover] += increment
+        ticks[mover] += increment
+        moves += 1
+        # switch_turn cancels the pending refresh and refreshes at once
+        loop.after_cancel(pending[0])
+        refresh()
+    return worst[0], worst[1], moves, refreshes[0], flag_seen[0] - flagged_at
+
+
+def main():
+    seed = int(sys.argv[1]) if len(sys.argv) > 1 else 1
+    increment = float(sys.argv[2]) if len(sys.argv) > 2 else 0
+    rng = random.Random(seed)
+
+    print(f"{GAME_SECONDS // 60}-minute games, +{increment:g}s increment, callbacks 0-40 ms late (2% stall 250 ms)")
+    print(f"{'game':<6}{'moves':>7}{'refreshes':>11}{'tick drift (s)':>16}{'ChessClock drift (ms)':>23}"
+          f"{'flag seen after (ms)':>22}")
+    worst = 0.0
+    for game in range(1, 6):
+        drift, tick_drift, moves, refreshes, flag_latency = play(rng, increment)
+        worst = max(worst, drift)
+        print(f"{game:<6}{moves:>7}{refreshes:>11}{tick_drift:>16.1f}{drift * 1e3:>23.6f}"
+              f"{flag_latency * 1e3:>22.0f}")
+
+    print(f"max ChessClock drift: {worst * 1e3:.6f} ms (limit {MAX_DRIFT * 1e3:g} ms)")
+    if worst >= MAX_DRIFT:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""Headless engine throughput: rounds/sec for each difficulty.
+
+Usage: python benchmarks/bench_engine.py [rounds]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import GameEngine, CHOICES, generate_daily_challenges
+from history import DIFFICULTIES
+
+
+def bench(difficulty, rounds):
+    engine = GameEngine(difficulty=difficulty)
+    engine.challenges = generate_daily_challenges()
+    moves = [random.choice(CHOICES) for _ in range(1000)]
+    play_round = engine.play_round
+
+    start = time.perf_counter()
+    for i in range(rounds):
+        play_round(moves[i % 1000])
+    elapsed = time.perf_counter() - start
+    return rounds / elapsed
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    random.seed(1)
+    print(f"{'difficulty':<12}{'rounds/sec':>14}")
+    for difficulty in DIFFICULTIES:
+        print(f"{difficulty:<12}{bench(difficulty, rounds):>14,.0f}")
+
+
+if __name__ == "__main__":
+    main()
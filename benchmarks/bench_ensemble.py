@@ -0,0 +1,98 @@
+"""Grandmaster ensemble: win rate against scripted players and decision latency percentiles.
+
+Usage: python benchmarks/bench_ensemble.py [rounds]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai import CHOICES, COUNTERS
+from engine import GameEngine
+
+DIFFICULTIES = ["Expert", "Master", "Grandmaster"]
+
+
+def player_random(history):
+    return random.choice(CHOICES)
+
+
+def player_cycler(history):
+    return CHOICES[len(history) % 3] if random.random() > 0.1 else random.choice(CHOICES)
+
+
+def player_rock_lover(history):
+    return "Rock" if random.random() < 0.5 else random.choice(CHOICES)
+
+
+def player_win_stay(history):
+    if not history:
+        return random.choice(CHOICES)
+    last = history[-1]
+    return last["player"] if last["winner"] == "Player" else COUNTERS[last["computer"]]
+
+
+def player_beat_last(history):
+    return COUNTERS[history[-1]["computer"]] if history else random.choice(CHOICES)
+
+
+def player_sequence(history):
+    sequence = ["Rock", "Rock", "Paper", "Scissors", "Paper"]
+    return sequence[len(history) % 5] if random.random() > 0.2 else random.choice(CHOICES)
+
+
+PLAYERS = {
+    "random": player_random,
+    "cycler": player_cycler,
+    "rock_lover": player_rock_lover,
+    "win_stay": player_win_stay,
+    "beat_last": player_beat_last,
+    "sequence": player_sequence,
+}
+
+
+def percentile(samples, pct):
+    return samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
+
+
+def run(difficulty, player, rounds):
+    engine = GameEngine(difficulty=difficulty, max_history=rounds)
+    history = engine.game_history
+    latencies = []
+    for _ in range(rounds):
+        move = player(history)
+        start = time.perf_counter()
+        computer = engine.get_computer_choice()
+        latencies.append(time.perf_counter() - start)
+        engine.play_round(move, computer)
+    net = (engine.computer_score - engine.player_score) / rounds * 100
+    return net, latencies
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    random.seed(1)
+
+    print("CPU net win rate (CPU wins - player wins, % of rounds)")
+    print(f"{'player':<12}" + "".join(f"{d:>13}" for d in DIFFICULTIES))
+    latencies = {d: [] for d in DIFFICULTIES}
+    for name, player in PLAYERS.items():
+        cells = []
+        for difficulty in DIFFICULTIES:
+            net, samples = run(difficulty, player, rounds)
+            latencies[difficulty].extend(samples)
+            cells.append(f"{net:>+13.1f}")
+        print(f"{name:<12}" + "".join(cells))
+
+    print("\nDecision latency (us)")
+    print(f"{'difficulty':<12}{'p50':>10}{'p99':>10}{'max':>10}")
+    for difficulty, samples in latencies.items():
+        samples.sort()
+        p50, p99 = percentile(samples, 50) * 1e6, percentile(samples, 99) * 1e6
+        print(f"{difficulty:<12}{p50:>10.1f}{p99:>10.1f}{samples[-1] * 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
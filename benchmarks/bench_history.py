@@ -0,0 +1,89 @@
+"""History storage at 1M entries: list of dicts with pop(0) vs GameHistory ring buffer.
+
+Usage: python benchmarks/bench_history.py [entries]
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai import CHOICES
+from history import GameHistory, WINNERS
+
+APPENDS_WHEN_FULL = 2000
+
+
+def build_list(rounds):
+    history = []
+    for player, computer, winner, epoch in rounds:
+        history.append({
+            "player": player,
+            "computer": computer,
+            "winner": winner,
+            "timestamp": time.strftime("%H:%M:%S", time.localtime(epoch))
+        })
+    return history
+
+
+def build_ring(rounds, capacity):
+    history = GameHistory(capacity)
+    for player, computer, winner, epoch in rounds:
+        history.append(player, computer, winner, epoch)
+    return history
+
+
+def measure_memory(build):
+    tracemalloc.start()
+    result = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    random.seed(1)
+    base = int(time.time())
+    rounds = [(random.choice(CHOICES), random.choice(CHOICES), random.choice(WINNERS), base + i)
+              for i in range(size)]
+
+    as_list, list_bytes = measure_memory(lambda: build_list(rounds))
+    as_ring, ring_bytes = measure_memory(lambda: build_ring(rounds, size))
+
+    start = time.perf_counter()
+    for player, computer, winner, epoch in rounds[:APPENDS_WHEN_FULL]:
+        as_list.append({"player": player, "computer": computer, "winner": winner, "timestamp": "00:00:00"})
+        as_list.pop(0)
+    list_append = (time.perf_counter() - start) / APPENDS_WHEN_FULL
+
+    start = time.perf_counter()
+    for player, computer, winner, epoch in rounds[:APPENDS_WHEN_FULL]:
+        as_ring.append(player, computer, winner, epoch)
+    ring_append = (time.perf_counter() - start) / APPENDS_WHEN_FULL
+
+    start = time.perf_counter()
+    [h["player"] for h in as_list[-1000:]]
+    list_slice = time.perf_counter() - start
+
+    start = time.perf_counter()
+    as_ring.players(1000)
+    ring_slice = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in as_ring:
+        pass
+    ring_iterate = time.perf_counter() - start
+
+    print(f"{size:,} entries")
+    print(f"{'':<28}{'list of dicts':>16}{'GameHistory':>16}")
+    print(f"{'memory (MB)':<28}{list_bytes / 1e6:>16.1f}{ring_bytes / 1e6:>16.1f}")
+    print(f"{'append when full (us)':<28}{list_append * 1e6:>16.2f}{ring_append * 1e6:>16.2f}")
+    print(f"{'last 1000 player moves (us)':<28}{list_slice * 1e6:>16.1f}{ring_slice * 1e6:>16.1f}")
+    print(f"{'iterate all as dicts (s)':<28}{'':>16}{ring_iterate:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
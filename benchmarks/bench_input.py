@@ -0,0 +1,85 @@
+"""Key-repeat flood under simulated time: one round per press (old) vs MoveQueue policies.
+
+Reports rounds started, the most rounds in flight at once, and press-to-result latency.
+
+Usage: python benchmarks/bench_input.py [presses_per_second] [seconds]
+"""
+import os
+import statistics
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_animation import VirtualLoop
+from input_queue import POLICIES, MoveQueue
+
+THINK_MS = 800
+
+
+def flood_old(rate, seconds):
+    """Every press schedules its own computer response"""
+    loop = VirtualLoop()
+    latencies = []
+    in_flight = [0, 0]
+
+    def respond(pressed):
+        in_flight[0] -= 1
+        latencies.append(loop.now - pressed)
+
+    for i in range(int(rate * seconds)):
+        loop.run_until(i / rate)
+        in_flight[0] += 1
+        in_flight[1] = max(in_flight)
+        loop.after(THINK_MS, respond, loop.now)
+    loop.run_until(seconds + 60)
+    return len(latencies), in_flight[1], latencies
+
+
+def flood(policy, rate, seconds):
+    """The app's pipeline: one round at a time, the next move taken when it finishes"""
+    loop = VirtualLoop()
+    moves = MoveQueue(policy, clock=loop.clock)
+    pressed_at = {}
+    latencies = []
+    in_flight = [0, 0]
+
+    def start_next():
+        move = moves.take()
+        if move is not None:
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight)
+            loop.after(THINK_MS, respond, move)
+
+    def respond(move):
+        in_flight[0] -= 1
+        latencies.append(loop.now - pressed_at.pop(move))
+        moves.done()
+        start_next()
+
+    for i in range(int(rate * seconds)):
+        loop.run_until(i / rate)
+        # Presses a coalesce replaces never get a result, so they are not counted
+        if moves.offer(i):
+            pressed_at[i] = loop.now
+        start_next()
+    loop.run_until(seconds + 60)
+    return len(latencies), in_flight[1], latencies
+
+
+def main():
+    rate = float(sys.argv[1]) if len(sys.argv) > 1 else 30
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    print(f"{rate:g} presses/s for {seconds:g} s, {THINK_MS} ms thinking time")
+    print(f"{'':<18}{'rounds':>8}{'in flight':>11}{'p50 (ms)':>10}{'p99 (ms)':>10}{'max (ms)':>10}")
+    rows = [("one per press", flood_old(rate, seconds))]
+    rows += [(policy, flood(policy, rate, seconds)) for policy in POLICIES]
+    for name, (rounds, in_flight, latencies) in rows:
+        latencies = sorted(latencies)
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        print(f"{name:<18}{rounds:>8}{in_flight:>11}{statistics.median(latencies) * 1e3:>10.0f}"
+              f"{p99 * 1e3:>10.0f}{latencies[-1] * 1e3:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""LagMonitor on a small real-time loop: injected stalls are caught and pinned to their handler.
+
+A timer tick and a countdown run through the monitor while a slow save
+(blocking sleep) and a busy challenge-window rebuild stall the loop;
+prints the stall log, per-callback lateness and the proxy's overhead.
+No display needed.
+
+Usage: python benchmarks/bench_lag_monitor.py [threshold_ms]
+"""
+import heapq
+import itertools
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lag_monitor import LagMonitor
+
+
+class RealLoop:
+    """``after``/``after_idle``/``after_cancel`` in real time, on this thread"""
+
+    def __init__(self):
+        self.queue = []
+        self.ids = itertools.count()
+        self.cancelled = set()
+
+    def after(self, ms, fn, *args):
+        after_id = next(self.ids)
+        heapq.heappush(self.queue, (time.monotonic() + ms / 1000, after_id, fn, args))
+        return after_id
+
+    def after_idle(self, fn, *args):
+        return self.after(0, fn, *args)
+
+    def after_cancel(self, after_id):
+        self.cancelled.add(after_id)
+
+    def run(self, seconds):
+        end = time.monotonic() + seconds
+        while self.queue and self.queue[0][0] < end:
+            when, after_id, fn, args = heapq.heappop(self.queue)
+            if after_id in self.cancelled:
+                continue
+            time.sleep(max(0.0, when - time.monotonic()))
+            fn(*args)
+
+
+def update_timer(monitor):
+    monitor.after(100, update_timer, monitor)
+
+
+def countdown(monitor, step=0):
+    if step < 40:
+        monitor.after(300, countdown, monitor, step + 1)
+
+
+def save_stats():
+    time.sleep(0.3)
+
+
+def rebuild_challenge_window():
+    end = time.monotonic() + 0.25
+    while time.monotonic() < end:
+        sum(range(1000))
+
+
+def main():
+    threshold = float(sys.argv[1]) if len(sys.argv) > 1 else 100
+    loop = RealLoop()
+    logged = []
+    monitor = LagMonitor(loop, threshold_ms=threshold, log=logged.append)
+    monitor.start()
+    update_timer(monitor)
+    countdown(monitor)
+    monitor.after(1000, save_stats)
+    monitor.after(2000, rebuild_challenge_window)
+    loop.run(3.5)
+    monitor.stop()
+
+    print("\n".join(logged))
+    print()
+    print(monitor.report())
+
+    calls = 100000
+    start = time.perf_counter()
+    for _ in range(calls):
+        monitor._run("noop", None, int, ())
+    proxied = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(calls):
+        int()
+    direct = time.perf_counter() - start
+    print(f"proxy overhead per callback: {(proxied - direct) / calls * 1e6:.2f} us")
+
+    found = {stall["handler"] for stall in monitor.stalls}
+    sys.exit(0 if {"save_stats", "rebuild_challenge_window"} <= found else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Lifetime history at scale: JSON list vs columnar LifetimeHistory (append, open, scan, size).
+
+Usage: python benchmarks/bench_lifetime.py [rounds]
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai import CHOICES
+from history import DIFFICULTIES
+from history import WINNERS, WINNER_INDEX
+from lifetime import LifetimeHistory
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    random.seed(1)
+    base = int(time.time()) - count
+    rounds = [(random.choice(CHOICES), random.choice(CHOICES), random.choice(WINNERS),
+               random.choice(DIFFICULTIES), base + i) for i in range(count)]
+    directory = tempfile.mkdtemp()
+
+    json_path = os.path.join(directory, "history.json")
+    entries = [{"player": p, "computer": c, "winner": w, "difficulty": d, "epoch": t} for p, c, w, d, t in rounds]
+    _, json_write = timed(lambda: json.dump({"history": entries}, open(json_path, "w")))
+    loaded, json_load = timed(lambda: json.load(open(json_path))["history"])
+    json_wins, json_scan = timed(lambda: sum(1 for e in loaded if e["winner"] == "Player"))
+
+    history_dir = os.path.join(directory, "rps_history")
+    history = LifetimeHistory(history_dir)
+    _, bulk_append = timed(lambda: history.extend(rounds))
+    history.close()
+
+    single = LifetimeHistory(os.path.join(directory, "single"))
+    _, single_append = timed(lambda: [single.append(*r) for r in rounds[:10000]])
+    single.close()
+
+    reopened, mmap_open = timed(lambda: LifetimeHistory(history_dir))
+    column_wins, column_scan = timed(lambda: reopened.column("winner").tobytes().count(WINNER_INDEX["Player"]))
+    assert column_wins == json_wins
+
+    binary_size = sum(os.path.getsize(os.path.join(history_dir, f)) for f in os.listdir(history_dir))
+
+    print(f"{count:,} rounds")
+    print(f"{'':<34}{'JSON':>12}{'columnar':>12}")
+    print(f"{'size on disk (MB)':<34}{os.path.getsize(json_path) / 1e6:>12.1f}{binary_size / 1e6:>12.1f}")
+    print(f"{'write all (s)':<34}{json_write:>12.2f}{bulk_append:>12.2f}")
+    print(f"{'open / load (ms)':<34}{json_load * 1e3:>12.1f}{mmap_open * 1e3:>12.2f}")
+    print(f"{'count player wins (ms)':<34}{json_scan * 1e3:>12.1f}{column_scan * 1e3:>12.2f}")
+    print(f"{'single-round append (us)':<34}{'':>12}{single_append / 10000 * 1e6:>12.1f}")
+
+    if np is not None:
+        winners, numpy_scan = timed(lambda: np.frombuffer(reopened.column("winner"), dtype=np.uint8))
+        wins, numpy_count = timed(lambda: int((winners == WINNER_INDEX["Player"]).sum()))
+        print(f"{'count wins, numpy zero-copy (ms)':<34}{'':>12}{(numpy_scan + numpy_count) * 1e3:>12.2f}")
+    reopened.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Master difficulty: per-move predict+record latency, table memory and win rate.
+
+Usage: python benchmarks/bench_markov.py [moves]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai import CHOICES, COUNTERS, MarkovModel
+from engine import GameEngine
+
+
+def patterned_player(count):
+    """A habit-driven player: a repeating 5-move sequence with 20% noise"""
+    sequence = ["Rock", "Rock", "Paper", "Scissors", "Paper"]
+    return [random.choice(CHOICES) if random.random() < 0.2 else sequence[i % 5] for i in range(count)]
+
+
+def latency(model, moves):
+    start = time.perf_counter()
+    for move in moves:
+        prediction = model.predict_next()
+        computer = COUNTERS[prediction] if prediction else "Rock"
+        model.record(move, computer)
+    return (time.perf_counter() - start) / len(moves) * 1e6
+
+
+def win_rate(moves, joint):
+    engine = GameEngine(difficulty="Master", master_joint=joint)
+    for move in moves:
+        engine.play_round(move)
+    return engine.computer_score / engine.total_games * 100
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    random.seed(1)
+    moves = patterned_player(count)
+
+    print(f"{'model':<16}{'us/move':>10}{'table KB':>10}{'cpu win %':>11}")
+    for order in (2, 4, 6):
+        for joint in (False, True):
+            model = MarkovModel(max_order=order, joint=joint)
+            name = f"order {order}{' joint' if joint else ''}"
+            kb = len(model.table) * model.table.itemsize / 1024
+            print(f"{name:<16}{latency(model, moves):>10.2f}{kb:>10.0f}{'':>11}")
+
+    for joint in (False, True):
+        label = "Master joint" if joint else "Master"
+        print(f"{label:<16}{'':>10}{'':>10}{win_rate(moves, joint):>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
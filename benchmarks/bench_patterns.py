@@ -0,0 +1,60 @@
+"""Per-move cost of the Hard/Expert pattern lookup: list rescan vs RollingMoveModel.
+
+Usage: python benchmarks/bench_patterns.py [moves]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai import CHOICES, COUNTERS, RollingMoveModel
+
+WINDOWS = [5, 10, 100, 1000, 10000]
+
+
+def legacy(moves, window):
+    """The original approach: keep dict history, rebuild the window and rescan it every move"""
+    history = []
+    start = time.perf_counter()
+    for move in moves:
+        recent = [h["player"] for h in history[-window:]]
+        if recent:
+            most_common = max(set(recent), key=recent.count)
+            counters = {
+                "Rock": "Paper",
+                "Paper": "Scissors",
+                "Scissors": "Rock"
+            }
+            counters[most_common]
+        history.append({"player": move})
+        if len(history) > window:
+            history.pop(0)
+    return time.perf_counter() - start
+
+
+def incremental(moves, window):
+    model = RollingMoveModel(window)
+    start = time.perf_counter()
+    for move in moves:
+        if len(model):
+            COUNTERS[model.most_common()]
+        model.record(move)
+    return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    random.seed(1)
+    moves = [random.choice(CHOICES) for _ in range(count)]
+
+    print(f"{'window':>8}{'legacy us/move':>18}{'rolling us/move':>18}{'speedup':>10}")
+    for window in WINDOWS:
+        old = legacy(moves, window) / count * 1e6
+        new = incremental(moves, window) / count * 1e6
+        print(f"{window:>8}{old:>18.3f}{new:>18.3f}{old / new:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
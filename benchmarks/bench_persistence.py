@@ -0,0 +1,80 @@
+"""Main-loop blocking time per round: synchronous StatsStore vs BackgroundWriter.
+
+The slow-disk rows add a fixed delay to every write to mimic a busy or
+network disk. Rounds are spaced a few ms apart like fast key presses.
+
+Usage: python benchmarks/bench_persistence.py [rounds]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import CHOICES, GameEngine, generate_daily_challenges
+from storage import BackgroundWriter, StatsStore
+
+ROUND_GAP = 0.002
+SLOW_WRITE = 0.01
+
+
+class SlowStore(StatsStore):
+    writes = 0
+
+    def write_rounds(self, records):
+        SlowStore.writes += 1
+        time.sleep(SLOW_WRITE)
+        super().write_rounds(records)
+
+    def write_snapshot(self, stats):
+        SlowStore.writes += 1
+        time.sleep(SLOW_WRITE)
+        super().write_snapshot(stats)
+
+
+def percentile(samples, pct):
+    return sorted(samples)[min(len(samples) - 1, int(len(samples) * pct / 100))]
+
+
+def run(store, background, rounds):
+    engine = GameEngine()
+    engine.challenges = generate_daily_challenges()
+    sink = BackgroundWriter(store) if background else store
+    SlowStore.writes = 0
+    blocked = []
+    for _ in range(rounds):
+        result = engine.play_round(random.choice(CHOICES))
+        start = time.perf_counter()
+        sink.append_round(engine, result)
+        blocked.append(time.perf_counter() - start)
+        time.sleep(ROUND_GAP)
+    if background:
+        sink.close(engine)
+    else:
+        store.close(engine)
+    return blocked
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    random.seed(1)
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "rps_stats.json")
+
+    print(f"{'setup':<24}{'p50 us':>10}{'p99 us':>10}{'max us':>10}{'total ms':>10}{'writes':>8}")
+    for label, store_class, background in (
+        ("sync", StatsStore, False),
+        ("background", StatsStore, True),
+        ("sync, slow disk", SlowStore, False),
+        ("background, slow disk", SlowStore, True),
+    ):
+        blocked = run(store_class(path, compact_every=200), background, rounds)
+        writes = str(SlowStore.writes) if store_class is SlowStore else ""
+        print(f"{label:<24}{percentile(blocked, 50) * 1e6:>10.1f}{percentile(blocked, 99) * 1e6:>10.1f}"
+              f"{max(blocked) * 1e6:>10.1f}{sum(blocked) * 1e3:>10.1f}{writes:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Record a synthetic session of N rounds, then replay it headlessly at full speed.
+
+The session follows the app's flow (start the clock, switch on each
+press and again when the computer answers) with a patterned, partly
+random player on a virtual clock. It plays one difficulty, or with
+``--difficulty all`` changes difficulty every 10,000 rounds through all
+of them; the engine then keeps every model it has used trained, so that
+is the slowest case. Prints the recording's size, its replay speed and
+any divergence between the recorded and replayed AI; exits 1 on a
+divergence.
+
+Usage: python benchmarks/bench_replay.py [rounds] [--difficulty NAME|all] [--seed N]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chess_clock import ChessClock
+from engine import CHOICES, GameEngine
+from history import DIFFICULTIES
+from recording import Replayer, SessionRecorder, read_recording
+from strategies import load_strategy
+
+
+def record_session(path, rounds, seed, difficulties=DIFFICULTIES):
+    """Play ``rounds`` rounds the way the app does, recording them"""
+    now = [0.0]
+    clock = lambda: now[0]
+    player = random.Random(seed + 1)
+    engine = GameEngine(seed=seed, ensemble_budget=float("inf"), enforce_budget=False)
+    chess_clock = ChessClock(24 * 3600, increment=2, clock=clock)
+    recorder = SessionRecorder(path, engine, seed, chess_clock, clock=clock)
+    # How long the app shows each computer thinking
+    think_times = {name: load_strategy(name).think_ms / 1000 for name in difficulties}
+
+    chess_clock.start("player")
+    recorder.start()
+    previous = "Rock"
+    for index in range(rounds):
+        if index % 10000 == 0:
+            engine.difficulty = difficulties[index // 10000 % len(difficulties)]
+            recorder.difficulty(engine.difficulty)
+        # Mostly cycle, sometimes repeat, sometimes anything
+        roll = player.random()
+        move = CHOICES[(CHOICES.index(previous) + 1) % 3] if roll < 0.5 else previous if roll < 0.7 else player.choice(CHOICES)
+        previous = move
+
+        now[0] += 0.2 + player.random()
+        chess_clock.switch()
+        recorder.switch()
+        now[0] += think_times[engine.difficulty]
+        result = engine.play_round(move)
+        recorder.round(move, result["computer"])
+        chess_clock.switch()
+        recorder.switch()
+    recorder.close(engine)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record and replay a synthetic session")
+    parser.add_argument("rounds", type=int, nargs="?", default=1_000_000)
+    parser.add_argument("--difficulty", default="Normal", choices=DIFFICULTIES + ["all"])
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    difficulties = DIFFICULTIES if args.difficulty == "all" else [args.difficulty]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "session.rpsrec")
+        start = time.perf_counter()
+        record_session(path, args.rounds, args.seed, difficulties)
+        recorded = time.perf_counter() - start
+        size = os.path.getsize(path)
+
+        header, data = read_recording(path)
+        start = time.perf_counter()
+        replay = Replayer(header).run(data)
+        elapsed = time.perf_counter() - start
+
+    for line in replay.divergences[:10]:
+        print(line)
+    print(f"recording: {size:,} bytes ({len(data) / args.rounds:.2f} bytes/round), recorded in {recorded:.2f}s")
+    print(f"\n{replay.rounds:,} rounds in {elapsed:.2f}s ({replay.rounds / elapsed:,.0f} rounds/sec), "
+          f"{len(replay.divergences)} divergence(s)")
+    sys.exit(1 if replay.divergences or not replay.ended else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""Load generator for server.py: many concurrent clients, rounds/sec and round-trip latency.
+
+Half the clients (``--pvp``) pair up and play each other, the rest play
+the AI across every difficulty. Each client sends a move, waits for its
+result and repeats; pvp latency includes waiting for the partner's move.
+Starts a server in-process unless ``--port`` points at a running one.
+
+Usage: python benchmarks/bench_server.py [--clients 1000] [--rounds 50] [--pvp 0.5] [--port PORT]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import CHOICES
+from history import DIFFICULTIES
+from server import MatchServer
+from tracing import Histogram
+
+
+def raise_fd_limit(needed):
+    """Two sockets per in-process client; lift the soft open-file limit if it can be"""
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != resource.RLIM_INFINITY and soft < needed:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (needed if hard == resource.RLIM_INFINITY else min(needed, hard), hard))
+
+
+async def client(host, port, mode, difficulty, rounds, latency, rng):
+    reader, writer = await asyncio.open_connection(host, port, limit=4096)
+
+    def send(message):
+        writer.write(json.dumps(message).encode() + b"\n")
+
+    async def receive(*events):
+        while True:
+            message = json.loads(await reader.readline())
+            if message["event"] in events:
+                return message
+            if message["event"] in ("error", "timeout", "opponent_left"):
+                raise RuntimeError(message)
+
+    send({"op": "join", "mode": mode, "difficulty": difficulty})
+    await receive("joined")
+    for _ in range(rounds):
+        start = time.perf_counter_ns()
+        send({"op": "move", "choice": rng.choice(CHOICES)})
+        await receive("result")
+        latency.add(time.perf_counter_ns() - start)
+    send({"op": "leave"})
+    # A pvp partner who finished first has already left
+    while (await receive("left", "opponent_left"))["event"] != "left":
+        pass
+    writer.close()
+
+
+async def run(args):
+    listener = None
+    host, port = args.host, args.port
+    if port is None:
+        listener = await MatchServer().serve(host, 0)
+        port = listener.sockets[0].getsockname()[1]
+
+    rng = random.Random(args.seed)
+    pvp_clients = int(args.clients * args.pvp) // 2 * 2
+    latency = {"ai": Histogram(), "pvp": Histogram()}
+    tasks = []
+    for index in range(args.clients):
+        mode = "pvp" if index < pvp_clients else "ai"
+        difficulty = DIFFICULTIES[index % len(DIFFICULTIES)]
+        tasks.append(client(host, port, mode, difficulty, args.rounds, latency[mode], random.Random(rng.random())))
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    if listener is not None:
+        listener.close()
+        await listener.wait_closed()
+
+    failures = [result for result in results if isinstance(result, BaseException)]
+    # A pvp round is one round for two clients
+    total = latency["ai"].count + latency["pvp"].count // 2
+    print(f"{'mode':<6}{'clients':>9}{'rounds':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}  (ms)")
+    for mode, histogram in latency.items():
+        clients = pvp_clients if mode == "pvp" else args.clients - pvp_clients
+        values = [histogram.percentile(q) for q in (0.5, 0.95, 0.99)] + [histogram.max]
+        print(f"{mode:<6}{clients:>9,}{histogram.count:>10,}" + "".join(f"{ns / 1e6:>10.2f}" for ns in values))
+    print(f"\n{total:,} rounds in {elapsed:.2f}s ({total / elapsed:,.0f} rounds/sec), {len(failures)} failed client(s)")
+    for failure in failures[:5]:
+        print(f"  {failure!r}")
+    return 1 if failures else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the match server")
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--rounds", type=int, default=50, help="rounds per client")
+    parser.add_argument("--pvp", type=float, default=0.5, help="fraction of clients playing each other")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="an already running server (default: start one in-process)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    raise_fd_limit(2 * args.clients + 64)
+    sys.exit(asyncio.run(run(args)))
+
+
+if __name__ == "__main__":
+    main()
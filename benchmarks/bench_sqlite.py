@@ -0,0 +1,79 @@
+"""SqliteStatsStore at scale: batched inserts, indexed queries vs a full scan of the JSON list.
+
+Usage: python benchmarks/bench_sqlite.py [rounds]
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai import CHOICES
+from history import DIFFICULTIES
+from history import WINNERS
+from sqlite_store import WEEK, SqliteStatsStore
+
+BATCH = 10000
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def json_win_rate(entries, difficulty, since):
+    total = wins = 0
+    for e in entries:
+        if e["epoch"] >= since and e["difficulty"] == difficulty:
+            total += 1
+            wins += e["winner"] == "Player"
+    return round(wins / total * 100, 1) if total else 0
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    random.seed(1)
+    now = int(time.time())
+    # Spread over a year so "last week" is a narrow slice of the table
+    step = 365 * 24 * 3600 / count
+    rounds = [(random.choice(CHOICES), random.choice(CHOICES), random.choice(WINNERS),
+               random.choice(DIFFICULTIES), int(now - (count - i) * step)) for i in range(count)]
+    directory = tempfile.mkdtemp()
+
+    store = SqliteStatsStore(os.path.join(directory, "rps_stats.db"))
+    _, insert = timed(lambda: [store.write_rounds(rounds[i:i + BATCH]) for i in range(0, count, BATCH)])
+    _, single = timed(lambda: [store.write_rounds([r]) for r in rounds[:1000]])
+
+    since = now - WEEK
+    rate, indexed = timed(lambda: store.win_rate("Hard", since))
+    _, overall = timed(lambda: store.win_rate())
+    _, streaks = timed(lambda: store.best_streak_per_day(since))
+
+    json_path = os.path.join(directory, "history.json")
+    entries = [{"player": p, "computer": c, "winner": w, "difficulty": d, "epoch": t} for p, c, w, d, t in rounds]
+    with open(json_path, "w") as f:
+        json.dump({"history": entries}, f)
+    loaded, json_load = timed(lambda: json.load(open(json_path))["history"])
+    json_rate, json_scan = timed(lambda: json_win_rate(loaded, "Hard", since))
+    assert json_rate == rate
+    store.close_files()
+
+    db_size = sum(os.path.getsize(os.path.join(directory, f)) for f in os.listdir(directory)
+                  if f.startswith("rps_stats.db"))
+
+    print(f"{count:,} rounds")
+    print(f"{'size on disk (MB)':<40}{db_size / 1e6:>12.1f}   (JSON {os.path.getsize(json_path) / 1e6:.1f})")
+    print(f"{f'insert, batches of {BATCH:,} (s)':<40}{insert:>12.2f}")
+    print(f"{'insert, one round per commit (us)':<40}{single / 1000 * 1e6:>12.1f}")
+    print(f"{'win rate on Hard, last week (ms)':<40}{indexed * 1e3:>12.2f}")
+    print(f"{'win rate, all rounds (ms)':<40}{overall * 1e3:>12.1f}")
+    print(f"{'best streak per day, last week (ms)':<40}{streaks * 1e3:>12.2f}")
+    print(f"{'JSON: load + scan for the same (ms)':<40}{(json_load + json_scan) * 1e3:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
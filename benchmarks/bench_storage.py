@@ -0,0 +1,67 @@
+"""Per-round persistence cost: full JSON rewrite vs StatsStore journal, at several history sizes.
+
+Usage: python benchmarks/bench_storage.py [rounds]
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import CHOICES, GameEngine, generate_daily_challenges
+from storage import StatsStore
+
+HISTORY_SIZES = [10, 1000, 100000]
+
+
+def filled_engine(history_size):
+    engine = GameEngine(max_history=history_size)
+    engine.challenges = generate_daily_challenges()
+    for _ in range(history_size):
+        engine.play_round(random.choice(CHOICES))
+    return engine
+
+
+def rewrite(engine, path, rounds):
+    """The old save_stats: re-serialize everything on every round"""
+    written = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        engine.play_round(random.choice(CHOICES))
+        text = json.dumps(engine.to_dict(), indent=4)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        written += len(text)
+    return (time.perf_counter() - start) / rounds, written / rounds
+
+
+def journal(engine, path, rounds):
+    store = StatsStore(path, compact_every=rounds + 1)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        store.append_round(engine, engine.play_round(random.choice(CHOICES)))
+    elapsed = time.perf_counter() - start
+    written = os.path.getsize(store.journal_path)
+    store.close(engine)
+    return elapsed / rounds, written / rounds
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    random.seed(1)
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "rps_stats.json")
+
+    print(f"{'history':>8}{'rewrite us':>12}{'rewrite B':>12}{'journal us':>12}{'journal B':>12}")
+    for size in HISTORY_SIZES:
+        engine = filled_engine(size)
+        old_time, old_bytes = rewrite(engine, path, rounds)
+        new_time, new_bytes = journal(engine, path, rounds)
+        print(f"{size:>8}{old_time * 1e6:>12.0f}{old_bytes:>12,.0f}{new_time * 1e6:>12.1f}{new_bytes:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,228 @@
+"""Hot-path benchmark suite with committed baselines and a regression check.
+
+Times each case for about ``--seconds`` and prints ops/sec and per-op
+p50/p95/p99. Cheap operations are timed in small batches (~20 us) so
+timer overhead does not swamp them; the percentiles are per-op times of
+those batches. Each case's fastest batch - far steadier than the p50 on a
+busy machine - is compared with benchmarks/baseline.json, and the run
+exits non-zero if any case is more than ``--threshold`` slower. A case
+over the threshold is re-measured up to twice (keeping the best) before
+it counts as a regression, so one noisy run does not fail the suite.
+Baselines are machine-specific: record your own with ``--save`` before
+comparing changes.
+
+Usage: python benchmarks/suite.py [--seconds 0.3] [--threshold 0.3] [--filter NAME] [--save]
+"""
+import argparse
+import gc
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from challenges import Challenge, generate_daily_challenges
+from engine import CHOICES, GameEngine
+from history import DIFFICULTIES
+from storage import StatsStore
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+HISTORY_SIZES = [10, 1000, 10000]
+BATCH_NS = 20000
+MIN_SAMPLES = 10
+RETRIES = 2
+
+
+def played_engine(difficulty="Normal", rounds=200, max_history=10):
+    engine = GameEngine(difficulty=difficulty, max_history=max_history)
+    engine.challenges = generate_daily_challenges()
+    for _ in range(rounds):
+        engine.play_round(random.choice(CHOICES))
+    return engine
+
+
+def case_computer_choice(difficulty):
+    engine = played_engine(difficulty)
+    return engine.get_computer_choice, 1
+
+
+def case_determine_winner():
+    pairs = [(p, c) for p in CHOICES for c in CHOICES]
+    determine_winner = GameEngine.determine_winner
+
+    def op():
+        for player, computer in pairs:
+            determine_winner(player, computer)
+    return op, len(pairs)
+
+
+def case_update_challenges():
+    engine = played_engine()
+    rounds = [(random.choice(CHOICES), random.choice(("Player", "Computer", "Draw"))) for _ in range(1000)]
+    update = engine.update_challenges
+    index = [0]
+
+    def op():
+        player, winner = rounds[index[0] % 1000]
+        index[0] += 1
+        update(player, winner)
+    return op, 1
+
+
+def case_play_round(traced=False):
+    engine = played_engine()
+    engine.tracer.enabled = traced
+    moves = [random.choice(CHOICES) for _ in range(1000)]
+    play_round = engine.play_round
+    index = [0]
+
+    def op():
+        play_round(moves[index[0] % 1000])
+        index[0] += 1
+    return op, 1
+
+
+def case_save_stats(directory, history_size):
+    engine = played_engine(rounds=history_size, max_history=history_size)
+    store = StatsStore(os.path.join(directory, f"save_{history_size}.json"))
+    return lambda: store.save_snapshot(engine), 1
+
+
+def case_load_stats(directory, history_size):
+    path = os.path.join(directory, f"load_{history_size}.json")
+    StatsStore(path).save_snapshot(played_engine(rounds=history_size, max_history=history_size))
+    store = StatsStore(path)
+    engine = GameEngine(max_history=history_size)
+    return lambda: store.load(engine), 1
+
+
+def case_challenge_round_trip():
+    challenges = generate_daily_challenges()
+
+    def op():
+        for challenge in challenges:
+            Challenge.from_dict(challenge.to_dict())
+    return op, len(challenges)
+
+
+def cases(directory):
+    """``(name, setup)`` pairs; ``setup()`` returns ``(op, ops per call)``"""
+    yield "determine_winner", case_determine_winner
+    for difficulty in DIFFICULTIES:
+        yield f"get_computer_choice[{difficulty}]", lambda d=difficulty: case_computer_choice(d)
+    yield "update_challenges", case_update_challenges
+    yield "play_round[Normal]", case_play_round
+    yield "play_round[Normal, traced]", lambda: case_play_round(traced=True)
+    yield "challenge_round_trip", case_challenge_round_trip
+    for size in HISTORY_SIZES:
+        yield f"save_stats[{size}]", lambda s=size: case_save_stats(directory, s)
+        yield f"load_stats[{size}]", lambda s=size: case_load_stats(directory, s)
+
+
+def measure(op, per_call, seconds):
+    """Per-op times (ns) of batches of calls, and total ops/sec.
+
+    The garbage collector is off while timing, as in ``timeit``, so a
+    collection triggered by setup garbage does not land in one case.
+    """
+    start = time.perf_counter_ns()
+    op()
+    first = max(time.perf_counter_ns() - start, 1)
+    batch = max(1, math.ceil(BATCH_NS / first))
+    # Warm up for a tenth of the budget
+    deadline = time.perf_counter_ns() + seconds * 1e8
+    while time.perf_counter_ns() < deadline:
+        op()
+
+    samples = []
+    clock = time.perf_counter_ns
+    gc.collect()
+    gc.disable()
+    try:
+        total_start = clock()
+        deadline = total_start + seconds * 1e9
+        while len(samples) < MIN_SAMPLES or clock() < deadline:
+            start = clock()
+            for _ in range(batch):
+                op()
+            samples.append((clock() - start) / (batch * per_call))
+        total = clock() - total_start
+    finally:
+        gc.enable()
+    return sorted(samples), len(samples) * batch * per_call / (total / 1e9)
+
+
+def percentile(sorted_samples, q):
+    return sorted_samples[min(len(sorted_samples) - 1, int(len(sorted_samples) * q))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the game's hot paths against a baseline")
+    parser.add_argument("--seconds", type=float, default=0.3, help="measuring time per case")
+    parser.add_argument("--threshold", type=float, default=0.3,
+                        help="fail if a case's best time is this fraction slower than its baseline")
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this")
+    parser.add_argument("--save", action="store_true", help="record these results as the new baseline")
+    args = parser.parse_args()
+
+    baseline = {}
+    if os.path.exists(BASELINE):
+        with open(BASELINE, "r", encoding="utf-8") as f:
+            recorded = json.load(f)
+        baseline = recorded["cases"]
+        if recorded.get("python") != platform.python_version():
+            print(f"note: baseline recorded on Python {recorded.get('python')}, running {platform.python_version()}")
+
+    directory = tempfile.mkdtemp(prefix="rps_suite_")
+    results = {}
+    regressions = []
+    print(f"{'case':<30}{'ops/sec':>13}{'p50 (us)':>11}{'p95 (us)':>11}{'p99 (us)':>11}{'best (us)':>11}"
+          f"{'baseline':>11}{'change':>9}")
+    try:
+        for name, setup in cases(directory):
+            if args.filter not in name:
+                continue
+            random.seed(1)
+            op, per_call = setup()
+            samples, ops_per_sec = measure(op, per_call, args.seconds)
+            p50, p95, p99 = (percentile(samples, q) / 1e3 for q in (0.5, 0.95, 0.99))
+            best = samples[0] / 1e3
+            base = baseline.get(name, {}).get("best_us")
+            for _ in range(RETRIES if base and not args.save else 0):
+                if best / base - 1 <= args.threshold:
+                    break
+                best = min(best, measure(op, per_call, args.seconds)[0][0] / 1e3)
+            results[name] = {"ops_per_sec": round(ops_per_sec, 1), "p50_us": round(p50, 4), "best_us": round(best, 4)}
+
+            line = f"{name:<30}{ops_per_sec:>13,.0f}{p50:>11.3f}{p95:>11.3f}{p99:>11.3f}{best:>11.3f}"
+            if base:
+                change = best / base - 1
+                line += f"{base:>11.3f}{change:>+9.0%}"
+                if change > args.threshold:
+                    regressions.append(name)
+                    line += "  REGRESSION"
+            print(line)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    if args.save:
+        if args.filter and baseline:
+            results = {**baseline, **results}
+        with open(BASELINE, "w", encoding="utf-8") as f:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(), "cases": results},
+                      f, indent=4)
+            f.write("\n")
+        print(f"baseline saved to {os.path.relpath(BASELINE)}")
+    elif regressions:
+        print(f"{len(regressions)} case(s) more than {args.threshold:.0%} slower than baseline: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
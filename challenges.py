@@ -0,0 +1,211 @@
+import heapq
+import itertools
+import random
+from datetime import datetime
+
+
+class Challenge:
+    def __init__(self, challenge_id, name, description, target, reward_points, challenge_type, difficulty="Normal"):
+        self.id = challenge_id
+        self.name = name
+        self.description = description
+        self.target = target
+        self.reward_points = reward_points
+        self.type = challenge_type
+        self.difficulty = difficulty
+        self.progress = 0
+        self.completed = False
+        self.date_assigned = datetime.now().strftime("%Y-%m-%d")
+
+    def update_progress(self, value):
+        """Update challenge progress"""
+        if not self.completed:
+            self.progress = min(self.progress + value, self.target)
+            if self.progress >= self.target:
+                self.completed = True
+                return True
+        return False
+
+    def get_progress_percentage(self):
+        """Get progress as percentage"""
+        return int((self.progress / self.target) * 100) if self.target > 0 else 0
+
+    def to_dict(self):
+        """Convert challenge to dictionary for saving"""
+        return {
+            'id': self.id,
+            'name': self.name,
+            'description': self.description,
+            'target': self.target,
+            'reward_points': self.reward_points,
+            'type': self.type,
+            'difficulty': self.difficulty,
+            'progress': self.progress,
+            'completed': self.completed,
+            'date_assigned': self.date_assigned
+        }
+
+    @staticmethod
+    def from_dict(data):
+        """Create challenge from dictionary"""
+        challenge = Challenge(
+            data['id'],
+            data['name'],
+            data['description'],
+            data['target'],
+            data['reward_points'],
+            data['type'],
+            data.get('difficulty', 'Normal')
+        )
+        challenge.progress = data.get('progress', 0)
+        challenge.completed = data.get('completed', False)
+        challenge.date_assigned = data.get('date_assigned', datetime.now().strftime("%Y-%m-%d"))
+        return challenge
+
+
+# Challenge type -> (event it listens for, kind). A "count" challenge adds
+# up the event's values until they reach its target; a "reach" challenge
+# completes once a single event value does. Events are "game", "win",
+# "loss", "draw", "streak" (carrying the current streak), ("move", move),
+# ("win_with", move) and ("win_on", difficulty); for parameterised types
+# the parameter is stored in challenge.difficulty. Types sharing an event
+# must share its kind.
+CHALLENGE_TYPES = {
+    "wins": (lambda challenge: "win", "count"),
+    "games": (lambda challenge: "game", "count"),
+    "draws": (lambda challenge: "draw", "count"),
+    "streak": (lambda challenge: "streak", "reach"),
+    "moves": (lambda challenge: ("move", challenge.difficulty), "count"),
+    "specific_choice": (lambda challenge: ("win_with", challenge.difficulty), "count"),
+    "difficulty": (lambda challenge: ("win_on", challenge.difficulty), "count"),
+    "speed": (lambda challenge: "win", "count"),
+}
+
+
+def register_challenge_type(name, event, kind="count"):
+    """Add a challenge type; ``event(challenge)`` names the event it listens for"""
+    CHALLENGE_TYPES[name] = (event, kind)
+
+
+def round_events(player_choice, winner, difficulty, streak):
+    """``(event, value)`` pairs one round produces"""
+    events = [("game", 1), (("move", player_choice), 1), ("streak", streak)]
+    if winner == "Player":
+        events += [("win", 1), (("win_with", player_choice), 1), (("win_on", difficulty), 1)]
+    elif winner == "Computer":
+        events.append(("loss", 1))
+    else:
+        events.append(("draw", 1))
+    return events
+
+
+class ChallengeBoard:
+    """The active challenges, indexed by the events they listen for.
+
+    Rounds never walk the challenges. Each event keeps one running total
+    and a min-heap of the totals at which its unfinished challenges
+    complete, so an event costs one addition and a heap peek however many
+    daily, weekly or achievement challenges listen to it; only completions
+    pay O(log n). A challenge's ``progress`` is brought up to date from the
+    running total when the board is iterated or indexed (for display and
+    saving). Iterates, indexes and ``len``s like the list it replaces.
+    """
+
+    def __init__(self, challenges=()):
+        self.challenges = []
+        self.totals = {}
+        self.thresholds = {}
+        self.pending = {}
+        self._order = itertools.count()
+        for challenge in challenges:
+            self.add(challenge)
+
+    def __len__(self):
+        return len(self.challenges)
+
+    def __iter__(self):
+        self.sync()
+        return iter(self.challenges)
+
+    def __getitem__(self, index):
+        self.sync()
+        return self.challenges[index]
+
+    def add(self, challenge):
+        """Activate a challenge"""
+        self.challenges.append(challenge)
+        if challenge.completed or challenge.type not in CHALLENGE_TYPES:
+            return
+        event, kind = CHALLENGE_TYPES[challenge.type]
+        event = event(challenge)
+        if kind == "count":
+            base = self.totals.setdefault(event, 0) - challenge.progress
+            threshold = base + challenge.target
+        else:
+            base = None
+            threshold = challenge.target
+        order = next(self._order)
+        self.pending[challenge] = (event, base, order)
+        heapq.heappush(self.thresholds.setdefault(event, []), (threshold, order, challenge))
+
+    def remove(self, challenge):
+        """Drop a challenge"""
+        self.sync()
+        self.challenges.remove(challenge)
+        self.pending.pop(challenge, None)
+
+    def sync(self):
+        """Copy running totals into the progress of unfinished counting challenges"""
+        for challenge, (event, base, _) in self.pending.items():
+            if base is not None:
+                challenge.progress = min(self.totals[event] - base, challenge.target)
+
+    def dispatch(self, events):
+        """Apply ``(event, value)`` pairs; returns the challenges they completed, in board order"""
+        completed = []
+        for event, value in events:
+            heap = self.thresholds.get(event)
+            if not heap:
+                continue
+            if event in self.totals:
+                value = self.totals[event] = self.totals[event] + value
+            while heap and heap[0][0] <= value:
+                _, order, challenge = heapq.heappop(heap)
+                # Entries of removed challenges are dropped here, lazily
+                if self.pending.get(challenge, (None, None, None))[2] == order:
+                    del self.pending[challenge]
+                    challenge.progress = challenge.target
+                    challenge.completed = True
+                    completed.append(challenge)
+        if len(completed) > 1:
+            completed.sort(key=self.challenges.index)
+        return completed
+
+
+# (id, name, description, target, reward points, type, parameter)
+CHALLENGE_POOL = [
+    ("win_3", "Quick Winner", "Win 3 games", 3, 50, "wins"),
+    ("win_5", "Victory March", "Win 5 games", 5, 100, "wins"),
+    ("win_10", "Dominator", "Win 10 games", 10, 250, "wins"),
+
+    ("streak_3", "Hot Streak", "Win 3 games in a row", 3, 75, "streak"),
+    ("streak_5", "Unstoppable", "Win 5 games in a row", 5, 150, "streak"),
+
+    ("games_10", "Practice Makes Perfect", "Play 10 games", 10, 50, "games"),
+    ("games_20", "Marathon Player", "Play 20 games", 20, 100, "games"),
+
+    ("rock_wins", "Rock Solid", "Win 5 games using Rock", 5, 100, "specific_choice", "Rock"),
+    ("paper_wins", "Paper Champion", "Win 5 games using Paper", 5, 100, "specific_choice", "Paper"),
+    ("scissors_wins", "Scissors Master", "Win 5 games using Scissors", 5, 100, "specific_choice", "Scissors"),
+
+    ("beat_hard", "Hard Mode Hero", "Win 3 games on Hard difficulty", 3, 150, "difficulty", "Hard"),
+    ("beat_expert", "Expert Slayer", "Win 3 games on Expert difficulty", 3, 200, "difficulty", "Expert"),
+
+    ("quick_5", "Speed Demon", "Win 5 games in under 5 minutes total", 5, 150, "speed"),
+]
+
+
+def generate_daily_challenges(count=3, pool=None, rng=random):
+    """Generate random daily challenges"""
+    pool = CHALLENGE_POOL if pool is None else pool
+    return [Challenge(*spec) for spec in rng.sample(pool, min(count, len(pool)))]
@@ -0,0 +1,104 @@
+import math
+import time
+
+SIDES = ("player", "computer")
+
+
+def format_clock(seconds):
+    """MM:SS, or S.t (tenths) under 10 seconds"""
+    seconds = max(seconds, 0.0)
+    if seconds < 10:
+        return f"{math.floor(seconds * 10 + 1e-9) / 10:.1f}"
+    whole = int(seconds + 1e-9)
+    return f"{whole // 60:02d}:{whole % 60:02d}"
+
+
+class ChessClock:
+    """Two-sided game clock measured from monotonic time, not from ticks.
+
+    The running side's time is ``banked - (now - segment start)``, so it is
+    exact however late the UI's refresh callbacks fire, and no part of a
+    second is lost on a switch or pause. After each move the mover gets
+    ``increment`` seconds (Fischer) and, with ``delay``, back whatever they
+    used of the move up to ``delay`` seconds (Bronstein).
+
+    ``clock`` returns seconds; tests pass a fake one.
+    """
+
+    def __init__(self, time_limit=300, increment=0, delay=0, clock=time.monotonic):
+        self.increment = increment
+        self.delay = delay
+        self.clock = clock
+        self.reset(time_limit)
+
+    def reset(self, time_limit=None):
+        """Stop the clock and give both sides ``time_limit`` seconds"""
+        if time_limit is not None:
+            self.time_limit = time_limit
+        self.running = False
+        self.turn = None
+        self.set_time(self.time_limit)
+
+    def set_time(self, seconds):
+        """Set both sides' remaining time"""
+        self.banked = dict.fromkeys(SIDES, float(seconds))
+        self.move_used = 0.0
+        self.segment_start = self.clock()
+
+    def _elapsed(self):
+        return self.clock() - self.segment_start if self.running else 0.0
+
+    def remaining(self, side):
+        """Seconds left for ``side`` right now"""
+        left = self.banked[side]
+        if side == self.turn:
+            left -= self._elapsed()
+        return max(left, 0.0)
+
+    def start(self, side="player"):
+        """Start or resume; the first start hands the move to ``side``"""
+        if self.running:
+            return
+        if self.turn is None:
+            self.turn = side
+            self.move_used = 0.0
+        self.segment_start = self.clock()
+        self.running = True
+
+    def _bank(self):
+        elapsed = self._elapsed()
+        self.banked[self.turn] -= elapsed
+        self.move_used += elapsed
+        self.segment_start += elapsed
+
+    def pause(self):
+        """Stop the running side's time where it is"""
+        if self.running:
+            self._bank()
+            self.running = False
+
+    def switch(self):
+        """End the current move: apply delay and increment, and start the other side"""
+        if not self.running:
+            return
+        self._bank()
+        mover = self.turn
+        if self.banked[mover] > 0:
+            self.banked[mover] += min(self.move_used, self.delay) + self.increment
+        self.turn = SIDES[1 - SIDES.index(mover)]
+        self.move_used = 0.0
+
+    def flagged(self):
+        """The side whose time has run out, or None"""
+        if self.turn is not None and self.remaining(self.turn) <= 0:
+            return self.turn
+        return None
+
+    def next_change(self):
+        """Seconds until the running side's display changes (or its time runs out)"""
+        if not self.running:
+            return None
+        left = self.remaining(self.turn)
+        step = 0.1 if left <= 10 else 1.0
+        until = left - math.floor(left / step + 1e-9) * step
+        return max(until if until > 1e-9 else step, 0.001) if left > 0 else 0.001
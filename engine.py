@@ -0,0 +1,311 @@
+import random
+import time
+from datetime import datetime
+
+from ai import CHOICES, COUNTERS
+from challenges import Challenge, ChallengeBoard, generate_daily_challenges, round_events
+from history import GameHistory, format_timestamp
+from strategies import BudgetOverrun, StrategyError, call_within_budget, load_strategy
+from tracing import Tracer
+
+WINNING_COMBINATIONS = {
+    "Rock": "Scissors",
+    "Paper": "Rock",
+    "Scissors": "Paper"
+}
+
+
+class GameEngine:
+    """Tk-free game state and rules: scoring, streaks, challenges and AI"""
+
+    def __init__(self, difficulty="Normal", max_history=10, hard_window=5, expert_window=10, master_joint=False,
+                 ensemble_budget=0.002, seed=None, enforce_budget=True):
+        self.player_score = 0
+        self.computer_score = 0
+        self.draws = 0
+        self.total_games = 0
+        self.game_history = GameHistory(max_history)
+        self.max_history = max_history
+        self.current_streak = 0
+        self.best_streak = 0
+
+        self.choices = CHOICES
+        # A seeded engine draws from its own generator (a session or a replay); unseeded ones share random's
+        self.rng = random.Random(seed) if seed is not None else random
+
+        # Strategies are built on first use: Master's Markov table and the ensemble take ~100 KB each
+        self.strategy_options = {
+            "Hard": {"window": hard_window},
+            "Expert": {"window": expert_window},
+            "Master": {"joint": master_joint},
+            "Grandmaster": {"ensemble_budget": ensemble_budget}
+        }
+        self.strategies = {}
+        self.trained = []
+        # Off for tournaments and replays: a random fallback on a loaded machine would break reproducibility
+        self.enforce_budget = enforce_budget
+        self.overruns = 0
+        # Messages about strategies that failed to load or were dropped, for the app to show
+        self.strategy_errors = []
+
+        self.difficulty = difficulty
+
+        self.challenges = []
+        self.total_challenge_points = 0
+
+        self._timestamp_second = None
+        self._timestamp = ""
+
+        # Spans "ai" and "challenges"; the app shares its own tracer here
+        self.tracer = Tracer()
+
+    @property
+    def difficulty(self):
+        return self._difficulty
+
+    @difficulty.setter
+    def difficulty(self, value):
+        self._difficulty = value
+        self.train_model(value)
+
+    @property
+    def strategy(self):
+        """The current difficulty's strategy (None if it could not be loaded)"""
+        return self.strategies.get(self._difficulty)
+
+    def train_model(self, difficulty):
+        """Start feeding a difficulty's strategy, warming it up from the saved history.
+
+        Only strategies that have actually been played are updated each
+        round, so unused AIs cost nothing.
+        """
+        strategy = self.strategies.get(difficulty)
+        try:
+            if strategy is None:
+                strategy_class = load_strategy(difficulty)
+                if strategy_class is None:
+                    return
+                strategy = self.call_strategy(strategy_class.budget, strategy_class, self.rng,
+                                              **self.strategy_options.get(difficulty, {}))
+                self.strategies[difficulty] = strategy
+            elif strategy in self.trained:
+                return
+            self.call_strategy(strategy.budget, strategy.clear)
+            for player_move, computer_move in self.game_history.moves():
+                self.call_strategy(strategy.budget, strategy.record, player_move, computer_move)
+        except StrategyError as e:
+            self.strategy_errors.append(f"{e} - playing random")
+            return
+        except BudgetOverrun as e:
+            self.drop_strategy(difficulty, e)
+            return
+        except Exception as e:
+            self.drop_strategy(difficulty, e)
+            return
+        self.trained.append(strategy)
+
+    def call_strategy(self, budget, function, *args, **kwargs):
+        """``function(*args, **kwargs)`` within ``budget`` CPU seconds, unless that is None or enforcement is off"""
+        if budget is None or not self.enforce_budget:
+            return function(*args, **kwargs)
+        return call_within_budget(budget, lambda: function(*args, **kwargs))
+
+    def drop_strategy(self, difficulty, error):
+        """Stop using a strategy that raised or overran; its difficulty plays random until picked again"""
+        strategy = self.strategies.pop(difficulty, None)
+        if strategy in self.trained:
+            self.trained.remove(strategy)
+        reason = "ran past its CPU budget" if isinstance(error, BudgetOverrun) else f"failed: {error!r}"
+        self.strategy_errors.append(f"Strategy {difficulty} {reason} - playing random")
+
+    def drop_strategies(self, failures):
+        """``drop_strategy`` for each (strategy, error) in ``failures``"""
+        for strategy, error in failures:
+            for difficulty, candidate in list(self.strategies.items()):
+                if candidate is strategy:
+                    self.drop_strategy(difficulty, error)
+
+    def timestamp(self, now):
+        """HH:MM:SS for epoch second ``now``, formatted at most once per second"""
+        if now != self._timestamp_second:
+            self._timestamp_second = now
+            self._timestamp = format_timestamp(now)
+        return self._timestamp
+
+    def get_computer_choice(self):
+        """The current strategy's move; random if there is none or it overran its CPU budget"""
+        strategy = self.strategies.get(self._difficulty)
+        if strategy is None:
+            return self.rng.choice(self.choices)
+        try:
+            if strategy.budget is None or not self.enforce_budget:
+                move = strategy.choose(self.game_history)
+            else:
+                move = call_within_budget(strategy.budget, strategy.choose, self.game_history)
+        except BudgetOverrun:
+            move = None
+        except Exception as e:
+            self.drop_strategy(self._difficulty, e)
+            move = None
+        if move not in COUNTERS:
+            self.overruns += 1
+            return self.rng.choice(self.choices)
+        return move
+
+    @staticmethod
+    def determine_winner(player_choice, computer_choice):
+        """Determine the winner"""
+        if player_choice == computer_choice:
+            return "Draw"
+
+        if WINNING_COMBINATIONS[player_choice] == computer_choice:
+            return "Player"
+        else:
+            return "Computer"
+
+    def play_round(self, player_choice, computer_choice=None, epoch=None, difficulty=None, count_challenges=True):
+        """Play one round and return its result.
+
+        Passing ``computer_choice``, ``epoch`` and ``difficulty`` replays a
+        recorded round instead of asking the AI.
+        """
+        if difficulty is None:
+            difficulty = self.difficulty
+        if computer_choice is None:
+            start = self.tracer.now()
+            computer_choice = self.get_computer_choice()
+            self.tracer.record("ai", start)
+
+        winner = self.determine_winner(player_choice, computer_choice)
+
+        self.total_games += 1
+
+        if winner == "Player":
+            self.player_score += 1
+            self.current_streak += 1
+            if self.current_streak > self.best_streak:
+                self.best_streak = self.current_streak
+        elif winner == "Computer":
+            self.computer_score += 1
+            self.current_streak = 0
+        else:
+            self.draws += 1
+
+        if count_challenges:
+            start = self.tracer.now()
+            completed_challenges = self.update_challenges(player_choice, winner, difficulty)
+            self.tracer.record("challenges", start)
+        else:
+            completed_challenges = []
+
+        failures = []
+        for strategy in self.trained:
+            try:
+                if strategy.budget is None or not self.enforce_budget:
+                    strategy.record(player_choice, computer_choice)
+                else:
+                    call_within_budget(strategy.budget, strategy.record, player_choice, computer_choice)
+            except BudgetOverrun:
+                # Like a late move: this strategy just misses the round
+                self.overruns += 1
+            except Exception as e:
+                failures.append((strategy, e))
+        if failures:
+            self.drop_strategies(failures)
+
+        now = int(time.time()) if epoch is None else epoch
+        self.game_history.append(player_choice, computer_choice, winner, now)
+
+        return {
+            "player": player_choice,
+            "computer": computer_choice,
+            "winner": winner,
+            "difficulty": difficulty,
+            "epoch": now,
+            "timestamp": self.timestamp(now),
+            "completed_challenges": completed_challenges
+        }
+
+    @property
+    def challenges(self):
+        return self._challenges
+
+    @challenges.setter
+    def challenges(self, challenges):
+        self._challenges = ChallengeBoard(challenges)
+
+    def update_challenges(self, player_choice, winner, difficulty=None):
+        """Update challenge progress and return newly completed challenges"""
+        if difficulty is None:
+            difficulty = self.difficulty
+
+        completed_challenges = self.challenges.dispatch(
+            round_events(player_choice, winner, difficulty, self.current_streak))
+        for challenge in completed_challenges:
+            self.total_challenge_points += challenge.reward_points
+        return completed_challenges
+
+    def calculate_win_rate(self):
+        """Calculate player's win rate"""
+        if self.total_games == 0:
+            return 0
+        return round((self.player_score / self.total_games) * 100, 1)
+
+    def reset(self):
+        """Reset scores, streak and history (best streak and challenges are kept)"""
+        self.player_score = 0
+        self.computer_score = 0
+        self.draws = 0
+        self.total_games = 0
+        self.game_history.clear()
+        self.current_streak = 0
+        failures = []
+        for strategy in self.trained:
+            try:
+                self.call_strategy(strategy.budget, strategy.clear)
+            except BudgetOverrun:
+                self.overruns += 1
+            except Exception as e:
+                failures.append((strategy, e))
+        self.drop_strategies(failures)
+
+    def to_dict(self):
+        """Convert engine state to dictionary for saving"""
+        return {
+            "player_score": self.player_score,
+            "computer_score": self.computer_score,
+            "draws": self.draws,
+            "total_games": self.total_games,
+            "current_streak": self.current_streak,
+            "best_streak": self.best_streak,
+            "history": self.game_history.to_list(),
+            "total_challenge_points": self.total_challenge_points,
+            "challenges": [c.to_dict() for c in self.challenges],
+            "last_challenge_date": datetime.now().strftime("%Y-%m-%d")
+        }
+
+    def load_dict(self, stats):
+        """Restore engine state from a saved dictionary"""
+        self.player_score = stats.get("player_score", 0)
+        self.computer_score = stats.get("computer_score", 0)
+        self.draws = stats.get("draws", 0)
+        self.total_games = stats.get("total_games", 0)
+        self.current_streak = stats.get("current_streak", 0)
+        self.best_streak = stats.get("best_streak", 0)
+        self.game_history = GameHistory.from_list(stats.get("history", []), self.max_history)
+        self.total_challenge_points = stats.get("total_challenge_points", 0)
+
+        self.trained = []
+        self.train_model(self.difficulty)
+
+        challenges_data = stats.get("challenges", [])
+        last_challenge_date = stats.get("last_challenge_date", "")
+        today = datetime.now().strftime("%Y-%m-%d")
+
+        if last_challenge_date != today:
+            self.challenges = generate_daily_challenges(rng=self.rng)
+        else:
+            self.challenges = [Challenge.from_dict(c) for c in challenges_data]
+
+        if not self.challenges:
+            self.challenges = generate_daily_challenges(rng=self.rng)
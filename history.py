@@ -0,0 +1,155 @@
+import time
+from array import array
+
+from ai import CHOICES, MOVE_INDEX
+
+WINNERS = ["Player", "Computer", "Draw"]
+WINNER_INDEX = {winner: index for index, winner in enumerate(WINNERS)}
+
+# The built-in strategies. Lifetime history stores difficulties by index here, so only ever append;
+# plugin strategies get the codes after these (see lifetime.DifficultyTable).
+DIFFICULTIES = ["Easy", "Normal", "Hard", "Expert", "Master", "Grandmaster"]
+
+
+def format_timestamp(epoch):
+    """Epoch seconds as local HH:MM:SS"""
+    return time.strftime("%H:%M:%S", time.localtime(epoch))
+
+
+def parse_timestamp(text):
+    """Old HH:MM:SS history entries carry no date; pin them to today"""
+    try:
+        clock = time.strptime(text, "%H:%M:%S")
+    except (TypeError, ValueError):
+        return int(time.time())
+    today = time.localtime()
+    return int(time.mktime((today.tm_year, today.tm_mon, today.tm_mday,
+                            clock.tm_hour, clock.tm_min, clock.tm_sec, 0, 0, -1)))
+
+
+class GameHistory:
+    """Fixed-capacity ring buffer of rounds stored as small integer codes.
+
+    Moves and winners are one byte each and timestamps are epoch seconds, so
+    an entry costs 11 bytes instead of a dict of four strings. Appending is
+    O(1) once the buffer is full - the oldest round is overwritten in place
+    rather than popped from the front of a list. Indexing, slicing and
+    iteration yield the same ``{"player", "computer", "winner", "timestamp"}``
+    dicts the rest of the game already uses.
+    """
+
+    def __init__(self, capacity=10):
+        self.capacity = capacity
+        self.player_codes = array("b")
+        self.computer_codes = array("b")
+        self.winner_codes = array("b")
+        self.times = array("q")
+        self.start = 0
+
+    def __len__(self):
+        return len(self.times)
+
+    def _position(self, index):
+        size = len(self.times)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("history index out of range")
+        return (self.start + index) % size
+
+    def _entry(self, position):
+        return {
+            "player": CHOICES[self.player_codes[position]],
+            "computer": CHOICES[self.computer_codes[position]],
+            "winner": WINNERS[self.winner_codes[position]],
+            "timestamp": format_timestamp(self.times[position])
+        }
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._entry(self._position(i)) for i in range(*index.indices(len(self)))]
+        return self._entry(self._position(index))
+
+    def __iter__(self):
+        size = len(self.times)
+        for i in range(size):
+            yield self._entry((self.start + i) % size)
+
+    def __reversed__(self):
+        size = len(self.times)
+        for i in range(size - 1, -1, -1):
+            yield self._entry((self.start + i) % size)
+
+    def append(self, player, computer, winner, epoch=None):
+        """Record a round, overwriting the oldest one when full"""
+        if epoch is None:
+            epoch = int(time.time())
+        p, c, w = MOVE_INDEX[player], MOVE_INDEX[computer], WINNER_INDEX[winner]
+
+        if len(self.times) < self.capacity:
+            self.player_codes.append(p)
+            self.computer_codes.append(c)
+            self.winner_codes.append(w)
+            self.times.append(epoch)
+        elif self.capacity > 0:
+            position = self.start
+            self.player_codes[position] = p
+            self.computer_codes[position] = c
+            self.winner_codes[position] = w
+            self.times[position] = epoch
+            self.start = (position + 1) % self.capacity
+
+    def player(self, index):
+        """Player move at ``index`` without building a dict"""
+        return CHOICES[self.player_codes[self._position(index)]]
+
+    def _tail(self, codes, count):
+        """The last ``count`` items of a column in logical order, as at most two slices"""
+        size = len(codes)
+        first = (self.start + size - count) % size if size else 0
+        if first + count <= size:
+            return codes[first:first + count]
+        return codes[first:] + codes[:first + count - size]
+
+    def players(self, count=None):
+        """The last ``count`` player moves (all by default), oldest first"""
+        size = len(self.times)
+        count = size if count is None else min(count, size)
+        return [CHOICES[code] for code in self._tail(self.player_codes, count)]
+
+    def moves(self):
+        """(player, computer) move pairs, oldest first"""
+        size = len(self.times)
+        return [(CHOICES[p], CHOICES[c])
+                for p, c in zip(self._tail(self.player_codes, size), self._tail(self.computer_codes, size))]
+
+    def clear(self):
+        """Drop every round"""
+        self.player_codes = array("b")
+        self.computer_codes = array("b")
+        self.winner_codes = array("b")
+        self.times = array("q")
+        self.start = 0
+
+    def to_list(self):
+        """Entries as dicts for saving, oldest first"""
+        entries = []
+        for entry, epoch in zip(self, self.epochs()):
+            entry["epoch"] = epoch
+            entries.append(entry)
+        return entries
+
+    def epochs(self):
+        """Timestamps as epoch seconds, oldest first"""
+        return list(self._tail(self.times, len(self.times)))
+
+    @staticmethod
+    def from_list(entries, capacity=10):
+        """Build a history from saved dicts"""
+        history = GameHistory(capacity)
+        for entry in entries:
+            epoch = entry.get("epoch")
+            if epoch is None:
+                epoch = parse_timestamp(entry.get("timestamp"))
+            history.append(entry["player"], entry["computer"], entry["winner"], epoch)
+        return history
@@ -0,0 +1,68 @@
+import time
+from collections import deque
+
+POLICIES = ("drop", "coalesce", "queue")
+
+
+class MoveQueue:
+    """Player moves waiting for the round in flight to finish.
+
+    Only one round is played at a time; what happens to moves pressed
+    meanwhile depends on ``policy``:
+
+    - ``"drop"``: ignore them until the round is over.
+    - ``"coalesce"``: keep just the latest one, so a held key plays one
+      more round with the most recent choice.
+    - ``"queue"``: keep them in order, up to ``capacity``; later presses
+      are dropped.
+
+    Moves are taken strictly in the order they were kept. ``waits`` holds
+    the recent times (seconds) moves spent queued.
+    """
+
+    def __init__(self, policy="coalesce", capacity=3, clock=time.monotonic):
+        if policy not in POLICIES:
+            raise ValueError(f"policy must be one of {POLICIES}")
+        self.policy = policy
+        self.capacity = capacity if policy == "queue" else 1
+        self.clock = clock
+        self.pending = deque()
+        self.busy = False
+        self.dropped = 0
+        self.replaced = 0
+        self.waits = deque(maxlen=256)
+
+    def __len__(self):
+        return len(self.pending)
+
+    def offer(self, move):
+        """Add a pressed move; returns False if the policy dropped it"""
+        if self.busy and self.policy == "drop":
+            self.dropped += 1
+            return False
+        if len(self.pending) >= self.capacity:
+            if self.policy != "coalesce":
+                self.dropped += 1
+                return False
+            self.pending.pop()
+            self.replaced += 1
+        self.pending.append((move, self.clock()))
+        return True
+
+    def take(self):
+        """The next move to play (marking a round in flight), or None if nothing is waiting"""
+        if self.busy or not self.pending:
+            return None
+        move, pressed = self.pending.popleft()
+        self.waits.append(self.clock() - pressed)
+        self.busy = True
+        return move
+
+    def done(self):
+        """The round in flight has finished"""
+        self.busy = False
+
+    def clear(self):
+        """Forget waiting moves and any round in flight"""
+        self.pending.clear()
+        self.busy = False
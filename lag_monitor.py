@@ -0,0 +1,157 @@
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+
+from tracing import Histogram
+
+
+def callback_name(fn):
+    """A readable name for a scheduled callback"""
+    return getattr(fn, "__qualname__", None) or getattr(fn, "__name__", None) or repr(fn)
+
+
+def print_stderr(message):
+    print(message, file=sys.stderr)
+
+
+class LagMonitor:
+    """Watchdog for the Tk main loop.
+
+    Stands in for the root window as a scheduler: ``after`` callbacks
+    scheduled through it record how late they fired, per callback, into
+    histograms. A heartbeat every ``interval_ms`` catches stalls in any
+    handler, not only scheduled ones. A heartbeat more than
+    ``threshold_ms`` late is logged as a stall, with the handler that was
+    running and the main thread's most frequent stack. A sampler thread
+    takes that stack every ``sample_ms`` while the heartbeat is overdue.
+    """
+
+    def __init__(self, root, threshold_ms=100, interval_ms=50, sample_ms=10, log=print_stderr,
+                 clock=time.monotonic):
+        self.root = root
+        self.threshold = threshold_ms / 1000
+        self.interval_ms = interval_ms
+        self.sample_interval = sample_ms / 1000
+        self.log = log
+        self.clock = clock
+        self.lateness = {}
+        self.stalls = []
+        self.running = None
+        self.due = None
+        self.beat_id = None
+        self.samples = []
+        self.lock = threading.Lock()
+        self.main_thread_id = threading.get_ident()
+        self.sampler = None
+        self.stopped = threading.Event()
+
+    # Scheduler interface
+
+    def after(self, ms, fn, *args):
+        return self.root.after(ms, self._run, callback_name(fn), self.clock() + ms / 1000, fn, args)
+
+    def after_idle(self, fn, *args):
+        return self.root.after_idle(self._run, callback_name(fn), None, fn, args)
+
+    def after_cancel(self, after_id):
+        self.root.after_cancel(after_id)
+
+    def _run(self, name, due, fn, args):
+        if due is not None:
+            histogram = self.lateness.get(name)
+            if histogram is None:
+                histogram = self.lateness[name] = Histogram()
+            histogram.add(max(0, int((self.clock() - due) * 1e9)))
+        self.running = name
+        try:
+            fn(*args)
+        finally:
+            self.running = None
+
+    # Watchdog
+
+    def start(self):
+        """Start the heartbeat and the stack sampler"""
+        if self.sampler is not None:
+            return
+        self.stopped.clear()
+        self._schedule_beat()
+        self.sampler = threading.Thread(target=self._sample, name="lag-monitor", daemon=True)
+        self.sampler.start()
+
+    def stop(self):
+        self.stopped.set()
+        if self.beat_id is not None:
+            self.root.after_cancel(self.beat_id)
+            self.beat_id = None
+        if self.sampler is not None:
+            self.sampler.join()
+            self.sampler = None
+
+    def _schedule_beat(self):
+        self.due = self.clock() + self.interval_ms / 1000
+        self.beat_id = self.root.after(self.interval_ms, self._beat)
+
+    def _beat(self):
+        lag = self.clock() - self.due
+        with self.lock:
+            samples, self.samples = self.samples, []
+        if lag >= self.threshold:
+            self._stall(lag, samples)
+        self._schedule_beat()
+
+    def _sample(self):
+        """Sampler thread: record the main thread's stack while the heartbeat is overdue"""
+        while not self.stopped.wait(self.sample_interval):
+            due = self.due
+            if due is None or self.clock() - due < self.threshold:
+                continue
+            frame = sys._current_frames().get(self.main_thread_id)
+            if frame is None:
+                continue
+            stack = tuple((f.filename, f.lineno, f.name) for f in traceback.extract_stack(frame))
+            with self.lock:
+                self.samples.append((self.running, stack))
+
+    @staticmethod
+    def handler_frames(stack):
+        """The frames from the running handler inwards (below Tk's or the monitor's dispatch)"""
+        for index in range(len(stack) - 1, -1, -1):
+            filename, _, name = stack[index]
+            if (name == "__call__" and "tkinter" in filename) or (name == "_run" and filename == __file__):
+                return stack[index + 1:]
+        return stack
+
+    def _stall(self, lag, samples):
+        stack = ()
+        handler = None
+        if samples:
+            (handler, stack), count = Counter(samples).most_common(1)[0]
+            stack = self.handler_frames(stack)
+            if handler is None and stack:
+                handler = stack[0][2]
+        stall = {
+            "at": time.time(),
+            "lag_ms": lag * 1000,
+            "handler": handler or "unknown",
+            "stack": stack,
+            "samples": len(samples),
+        }
+        self.stalls.append(stall)
+
+        lines = [f"main loop stalled {stall['lag_ms']:.0f} ms in {stall['handler']}"]
+        if stack:
+            lines.append(f"  most frequent stack ({count} of {len(samples)} samples):")
+            lines += [f"    {filename}:{lineno} in {name}" for filename, lineno, name in stack]
+        self.log("\n".join(lines))
+
+    def report(self):
+        """Lateness per scheduled callback (p50/p99/max, ms) and the stall count, as text lines"""
+        lines = [f"{'callback':<40}{'count':>7}{'p50':>9}{'p99':>9}{'max':>9}"]
+        for name, histogram in sorted(self.lateness.items()):
+            values = (histogram.percentile(0.5), histogram.percentile(0.99), histogram.max)
+            lines.append(f"{name:<40}{histogram.count:>7}" + "".join(f"{ns / 1e6:>9.1f}" for ns in values))
+        lines.append(f"{len(self.stalls)} stall(s) over {self.threshold * 1000:.0f} ms")
+        return "\n".join(lines)
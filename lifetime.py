@@ -0,0 +1,238 @@
+import functools
+import mmap
+import os
+import threading
+from array import array
+
+from ai import CHOICES, MOVE_INDEX
+from history import DIFFICULTIES as DIFFICULTY_CODES, WINNERS, WINNER_INDEX, parse_timestamp
+
+UNKNOWN_DIFFICULTY = 255
+# Below this many rounds a plain loop is quicker than importing NumPy
+NUMPY_MIN_ROUNDS = 100000
+
+
+@functools.lru_cache(maxsize=None)
+def load_numpy():
+    """NumPy, or None if it is not installed; imported on first use, as it takes longer to import than the game"""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+COLUMNS = {
+    "player": "B",
+    "computer": "B",
+    "winner": "B",
+    "difficulty": "B",
+    "epoch": "q",
+}
+
+
+class DifficultyTable:
+    """Difficulty name <-> one-byte code: the built-ins first, then other strategies as they are first seen.
+
+    Names that are None or contain a newline, or that arrive once every
+    code is taken, get ``UNKNOWN_DIFFICULTY``.
+    """
+
+    def __init__(self, names=DIFFICULTY_CODES):
+        self.names = list(names)
+        self.codes = {name: code for code, name in enumerate(self.names)}
+
+    def code(self, name, add=True):
+        """The code for ``name``, given the next free one if it is new; None if new and ``add`` is off"""
+        code = self.codes.get(name)
+        if code is None:
+            if not add:
+                return None
+            # Names are saved one per line
+            if name is None or "\n" in name or len(self.names) >= UNKNOWN_DIFFICULTY:
+                return UNKNOWN_DIFFICULTY
+            code = self.codes[name] = len(self.names)
+            self.names.append(name)
+        return code
+
+    def name(self, code):
+        """The name for ``code``, or None for unknown"""
+        return self.names[code] if code < len(self.names) else None
+
+
+class LifetimeHistory:
+    """Every round ever played, stored column by column in fixed-width binary files.
+
+    Each column lives in ``<directory>/<name>.bin``: one byte per round for
+    moves, winner and difficulty, and a native-endian int64 epoch. Appends
+    write a few bytes per column; reads go through ``mmap`` so ``column()``
+    hands out zero-copy memoryviews that can be scanned directly, or wrapped
+    with ``numpy.frombuffer``. On open, columns left uneven by a crash are
+    trimmed to the shortest one.
+
+    Difficulty codes come from a ``DifficultyTable`` kept in
+    ``difficulties.txt``, one name per line in code order. A strategy's
+    name is appended the first time one of its rounds is stored, before
+    the round itself, so plugins keep their own codes and names.
+
+    The stats writer thread appends while other threads read, so appends
+    and mapping go through one lock; ``columns()`` hands out views of
+    several columns cut at the same length.
+    """
+
+    def __init__(self, directory="rps_history"):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.paths = {name: os.path.join(directory, name + ".bin") for name in COLUMNS}
+        self.files = {}
+        self.maps = {}
+        self.mapped_length = 0
+        # Maps replaced while a view of them was still in use, closed once it is released
+        self.retired = []
+        self.lock = threading.Lock()
+        self.difficulties_path = os.path.join(directory, "difficulties.txt")
+        self.difficulties = DifficultyTable(self.read_difficulties())
+
+        lengths = []
+        for name, typecode in COLUMNS.items():
+            path = self.paths[name]
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            lengths.append(size // array(typecode).itemsize)
+        self.length = min(lengths)
+
+        for name, typecode in COLUMNS.items():
+            f = open(self.paths[name], "ab")
+            f.truncate(self.length * array(typecode).itemsize)
+            self.files[name] = f
+
+    def read_difficulties(self):
+        """The saved name table, dropping a line torn by a crash (no round can use it yet)"""
+        if not os.path.exists(self.difficulties_path):
+            return DIFFICULTY_CODES
+        with open(self.difficulties_path, "r+", encoding="utf-8") as f:
+            text = f.read()
+            complete = text[:text.rfind("\n") + 1]
+            if len(complete) != len(text):
+                f.seek(0)
+                f.truncate(len(complete.encode("utf-8")))
+        return complete.splitlines() or DIFFICULTY_CODES
+
+    def __len__(self):
+        return self.length
+
+    def append(self, player, computer, winner, difficulty, epoch):
+        """Record one round"""
+        self.extend([(player, computer, winner, difficulty, epoch)])
+
+    def extend(self, rounds):
+        """Record ``(player, computer, winner, difficulty, epoch)`` tuples with one write per column"""
+        columns = {name: array(typecode) for name, typecode in COLUMNS.items()}
+        difficulties = self.difficulties
+        known = len(difficulties.names)
+        for player, computer, winner, difficulty, epoch in rounds:
+            columns["player"].append(MOVE_INDEX[player])
+            columns["computer"].append(MOVE_INDEX[computer])
+            columns["winner"].append(WINNER_INDEX[winner])
+            columns["difficulty"].append(difficulties.code(difficulty))
+            columns["epoch"].append(int(epoch))
+
+        if not columns["epoch"]:
+            return
+        if len(difficulties.names) > known:
+            self.write_difficulties(known)
+        with self.lock:
+            for name, values in columns.items():
+                self.files[name].write(values.tobytes())
+            for f in self.files.values():
+                f.flush()
+            self.length += len(columns["epoch"])
+
+    def write_difficulties(self, known):
+        """Save the names from code ``known`` on (the whole table if the file is new)"""
+        new_file = not os.path.exists(self.difficulties_path)
+        names = self.difficulties.names if new_file else self.difficulties.names[known:]
+        with open(self.difficulties_path, "a", encoding="utf-8") as f:
+            f.write("".join(name + "\n" for name in names))
+
+    def column(self, name):
+        """Zero-copy read-only view of a whole column, typed by its format"""
+        return self.columns(name)[0]
+
+    def columns(self, *names):
+        """Zero-copy read-only views of ``names``, all cut at the same length"""
+        with self.lock:
+            if self.length == 0:
+                return [memoryview(array(COLUMNS[name])) for name in names]
+            if self.mapped_length != self.length:
+                # The maps end where the files did when they were made; map the new rounds in
+                self._release_maps()
+                self.mapped_length = self.length
+            views = []
+            for name in names:
+                if name not in self.maps:
+                    with open(self.paths[name], "rb") as f:
+                        self.maps[name] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                views.append(memoryview(self.maps[name]).cast(COLUMNS[name])[:self.length])
+            return views
+
+    def _release_maps(self):
+        """Close the current maps, keeping any that still have views out until a later call"""
+        maps = self.retired + list(self.maps.values())
+        self.maps = {}
+        self.retired = []
+        for m in maps:
+            try:
+                m.close()
+            except BufferError:
+                self.retired.append(m)
+
+    def rounds(self, start=0, stop=None):
+        """Decoded ``(player, computer, winner, difficulty, epoch)`` tuples"""
+        players, computers, winners, difficulties, epochs = self.columns(
+            "player", "computer", "winner", "difficulty", "epoch")
+        for i in range(*slice(start, stop).indices(len(epochs))):
+            difficulty = self.difficulties.name(difficulties[i])
+            yield CHOICES[players[i]], CHOICES[computers[i]], WINNERS[winners[i]], difficulty, epochs[i]
+
+    def round(self, index):
+        """One decoded ``(player, computer, winner, difficulty, epoch)`` tuple"""
+        return next(self.rounds(index, index + 1 or None))
+
+    def matching(self, winner=None, difficulty=None):
+        """Indexes of the rounds with this winner and/or difficulty, oldest first"""
+        winners, difficulties = self.columns("winner", "difficulty")
+        length = len(winners)
+        tests = []
+        if winner is not None:
+            tests.append((winners, WINNER_INDEX[winner]))
+        if difficulty is not None:
+            code = self.difficulties.code(difficulty, add=False)
+            if code is None:
+                return array("q")
+            tests.append((difficulties, code))
+
+        if not tests:
+            return range(length)
+        np = load_numpy() if length >= NUMPY_MIN_ROUNDS else None
+        if np is not None:
+            mask = np.ones(length, dtype=bool)
+            for column, code in tests:
+                mask &= np.frombuffer(column, dtype=np.uint8) == code
+            return np.flatnonzero(mask)
+        return array("q", (i for i, codes in enumerate(zip(*(column for column, _ in tests)))
+                           if all(value == code for value, (_, code) in zip(codes, tests))))
+
+    def import_history(self, entries):
+        """Append saved ``{"player", "computer", "winner", "timestamp"}`` dicts (JSON migration)"""
+        self.extend(
+            (entry["player"], entry["computer"], entry["winner"], entry.get("difficulty"),
+             entry["epoch"] if "epoch" in entry else parse_timestamp(entry.get("timestamp")))
+            for entry in entries)
+
+    def close(self):
+        """Release files and maps"""
+        with self.lock:
+            for f in self.files.values():
+                f.close()
+            self.files = {}
+            self._release_maps()
@@ -0,0 +1,353 @@
+"""Seeded session recordings, replayed headlessly through the engine.
+
+A recording is a JSON header (seed, engine snapshot, clock settings)
+followed by every key press, round, timer and settings event the session
+saw. Each event is one opcode byte, the milliseconds since the previous
+event as a varint, then any arguments as varints. A round is a single
+opcode that packs the (player, computer) move pair and whether the clock
+switched back to the player in the same millisecond, so a round and its
+clock switches take about 5 bytes, and the press behind it 3 or 4 more.
+
+Presses are recorded as they reach the input queue, including those its
+backpressure policy (``RPS_INPUT_POLICY``) dropped or merged. The
+replayer runs them through a ``MoveQueue`` with the recorded policy and
+checks that it hands out the moves the rounds were played with.
+
+The session's engine is reseeded from the header's seed just before
+recording starts. Replaying the same inputs through a fresh engine must
+therefore draw the same computer moves. The replayer checks every round,
+each timeout and the final scores, and reports any divergence. A
+Grandmaster that ran out of its per-move budget in the app can diverge
+here, because the replay does not enforce the budget.
+
+Usage: python recording.py RECORDING [--real-time] [--speed X]
+"""
+import argparse
+import json
+import re
+import sys
+import time
+
+from ai import CHOICES
+from challenges import Challenge
+from chess_clock import SIDES, ChessClock
+from engine import GameEngine
+from history import DIFFICULTIES
+from input_queue import MoveQueue
+from strategies import strategy_names
+
+MAGIC = b"RPSREC1\n"
+
+# Opcodes 0-8 are rounds: player move index * 3 + computer move index; 9-17 the same, then a clock switch
+ROUNDS = 9
+# PRESS is a key press reaching the input queue; RESTART clears the game over after a timeout
+(SWITCH, START, PAUSE, TIMEOUT, CLOCK_RESET, CONTROL, DIFFICULTY, RESET, END,
+ PRESS, RESTART) = range(2 * ROUNDS, 2 * ROUNDS + 11)
+# Varint arguments per opcode; durations are in milliseconds
+ARGUMENTS = bytes([0] * 2 * ROUNDS + [0, 0, 0, 1, 1, 2, 1, 0, 4, 1, 0])
+
+MOVE_INDEX = {move: index for index, move in enumerate(CHOICES)}
+ROUND_MOVES = [(player, computer) for player in CHOICES for computer in CHOICES]
+
+
+def varint(value):
+    """``value`` (>= 0) in 7-bit groups, low first, high bit set on all but the last"""
+    out = bytearray()
+    while value > 0x7F:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+class SessionRecorder:
+    """Appends a session's events to a recording file.
+
+    Create it right after reseeding the engine with ``seed``; the header
+    snapshots the engine and clock as they are at that moment. Pass the
+    app's ``MoveQueue`` as ``moves`` when presses are recorded, so the
+    replay knows its policy.
+    """
+
+    def __init__(self, path, engine, seed, chess_clock, clock=time.monotonic, moves=None):
+        self.clock = clock
+        self.start_time = clock()
+        self.last = 0
+        # A round waits here for the event after it, to be folded together with an immediate switch
+        self.pending = None
+        # Difficulty events index this list, so plugin strategies replay by name
+        self.strategies = strategy_names()
+        header = {
+            "seed": seed,
+            "started": time.time(),
+            "difficulty": engine.difficulty,
+            "strategies": self.strategies,
+            "time_limit": chess_clock.time_limit,
+            "increment": chess_clock.increment,
+            "delay": chess_clock.delay,
+            "state": engine.to_dict(),
+        }
+        if moves is not None:
+            header.update(input_policy=moves.policy, input_capacity=moves.capacity)
+        self.file = open(path, "wb")
+        self.file.write(MAGIC + json.dumps(header).encode() + b"\n")
+
+    def _delta(self):
+        """Milliseconds since the previous event"""
+        now = int((self.clock() - self.start_time) * 1000)
+        delta, self.last = now - self.last, now
+        return delta
+
+    def _emit(self, op, delta, args=()):
+        if delta < 0x80 and not args:
+            self.file.write(bytes((op, delta)))
+        else:
+            self.file.write(bytes((op,)) + varint(delta) + b"".join(varint(arg) for arg in args))
+
+    def _write(self, op, *args):
+        delta = self._delta()
+        if self.pending is not None:
+            round_op, round_delta = self.pending
+            self.pending = None
+            if op == SWITCH and delta == 0:
+                self._emit(round_op + ROUNDS, round_delta)
+                return
+            self._emit(round_op, round_delta)
+        self._emit(op, delta, args)
+
+    def round(self, player_choice, computer_choice):
+        delta = self._delta()
+        if self.pending is not None:
+            self._emit(*self.pending)
+        self.pending = (MOVE_INDEX[player_choice] * 3 + MOVE_INDEX[computer_choice], delta)
+
+    def press(self, move):
+        self._write(PRESS, MOVE_INDEX[move])
+
+    def restart(self):
+        self._write(RESTART)
+
+    def switch(self):
+        self._write(SWITCH)
+
+    def start(self):
+        self._write(START)
+
+    def pause(self):
+        self._write(PAUSE)
+
+    def timeout(self, side):
+        self._write(TIMEOUT, SIDES.index(side))
+
+    def clock_reset(self, time_limit):
+        self._write(CLOCK_RESET, round(time_limit * 1000))
+
+    def control(self, increment, delay):
+        self._write(CONTROL, round(increment * 1000), round(delay * 1000))
+
+    def difficulty(self, difficulty):
+        self._write(DIFFICULTY, self.strategies.index(difficulty))
+
+    def reset(self):
+        self._write(RESET)
+
+    def close(self, engine):
+        """End the recording with the final scores, for the replay to check against"""
+        if self.file.closed:
+            return
+        self._write(END, engine.player_score, engine.computer_score, engine.draws, engine.total_challenge_points)
+        self.file.close()
+
+
+def read_recording(path):
+    """The header and the raw event bytes of a recording"""
+    with open(path, "rb") as file:
+        if file.readline() != MAGIC:
+            raise ValueError(f"{path} is not a session recording")
+        header = json.loads(file.readline())
+        return header, file.read()
+
+
+# A varint: any continuation bytes (high bit set), then its last byte
+VARINT = re.compile(rb"[\x80-\xff]*[\x00-\x7f]")
+
+
+class VarintValues(dict):
+    """Varint bytes -> value, precomputed for one and two bytes (gaps under 16.4 s), decoded on a miss"""
+
+    def __init__(self):
+        super().__init__((varint(value), value) for value in range(1 << 14))
+
+    def __missing__(self, encoded):
+        return sum((byte & 0x7F) << 7 * index for index, byte in enumerate(encoded))
+
+
+VARINT_VALUES = VarintValues()
+
+
+def fields(data):
+    """Every varint in event bytes, decoded in bulk; an opcode is a one-byte varint too"""
+    return list(map(VARINT_VALUES.__getitem__, VARINT.findall(data)))
+
+
+def events(data):
+    """Decode event bytes into (milliseconds since start, opcode, args) tuples"""
+    values = fields(data)
+    size = len(values)
+    position = 0
+    now = 0
+    arguments = ARGUMENTS
+    while position < size:
+        op = values[position]
+        now += values[position + 1]
+        count = arguments[op]
+        if count:
+            yield now, op, tuple(values[position + 2:position + 2 + count])
+        else:
+            yield now, op, ()
+        position += 2 + count
+
+
+class Replayer:
+    """Feeds a recording through a fresh engine and chess clock"""
+
+    def __init__(self, header):
+        self.header = header
+        self.now = 0.0
+        self.engine = GameEngine(difficulty=header["difficulty"], ensemble_budget=float("inf"), seed=header["seed"],
+                                 enforce_budget=False)
+        self.strategies = header.get("strategies", DIFFICULTIES)
+        state = header["state"]
+        self.engine.load_dict(state)
+        # load_dict starts a new day's challenges when the date has changed; keep the recorded ones
+        self.engine.challenges = [Challenge.from_dict(c) for c in state.get("challenges", [])]
+        self.engine.rng.seed(header["seed"])
+        self.chess_clock = ChessClock(header["time_limit"], header["increment"], header["delay"],
+                                      clock=lambda: self.now)
+        policy = header.get("input_policy")
+        # Only for recordings with presses: the app's input queue, and the move of the round in flight
+        self.moves = MoveQueue(policy, header["input_capacity"], clock=lambda: self.now) if policy else None
+        self.playing = None
+        self.game_over = False
+        self.rounds = 0
+        self.divergences = []
+        self.ended = False
+
+    def run(self, data, real_time=False, speed=1.0):
+        """Replay every event; ``real_time`` waits out the recorded gaps (divided by ``speed``)"""
+        engine = self.engine
+        chess_clock = self.chess_clock
+        started = int(self.header["started"])
+        divergences = self.divergences
+        wall_start = time.monotonic()
+        # Bound once: a replay runs these millions of times
+        choose, play_round, switch = engine.get_computer_choice, engine.play_round, chess_clock.switch
+
+        for now, op, args in events(data):
+            if real_time:
+                wait = wall_start + now / 1000 / speed - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+            self.now = now / 1000
+
+            if op < 2 * ROUNDS:
+                player_choice, computer_choice = ROUND_MOVES[op % ROUNDS]
+                # Ask the AI, then follow the recording so one divergence does not derail the rest
+                predicted = choose()
+                play_round(player_choice, computer_choice, started + now // 1000)
+                self.rounds += 1
+                if predicted != computer_choice:
+                    divergences.append(f"round {self.rounds}: computer played {computer_choice}, "
+                                       f"replay chose {predicted}")
+                if self.moves is not None:
+                    self.next_move(player_choice)
+                if op >= ROUNDS:
+                    switch()
+            elif op == PRESS:
+                if self.moves is not None:
+                    self.moves.offer(CHOICES[args[0]])
+                    if self.playing is None:
+                        self.playing = self.moves.take()
+            elif op == SWITCH:
+                switch()
+            elif op == START:
+                chess_clock.start("player")
+            elif op == PAUSE:
+                chess_clock.pause()
+            elif op == TIMEOUT:
+                side = SIDES[args[0]]
+                left = chess_clock.remaining(side)
+                # Event times are whole milliseconds, so the replayed clock is close but not exact
+                if left > 0.05:
+                    divergences.append(f"{side} timed out at {self.now:.3f}s with {left:.3f}s on the replayed clock")
+                chess_clock.pause()
+                if side == "player":
+                    engine.computer_score += 3
+                else:
+                    engine.player_score += 3
+                self.game_over = True
+            elif op == RESTART:
+                self.game_over = False
+            elif op == CLOCK_RESET:
+                chess_clock.reset(args[0] / 1000)
+            elif op == CONTROL:
+                chess_clock.increment, chess_clock.delay = args[0] / 1000, args[1] / 1000
+            elif op == DIFFICULTY:
+                engine.difficulty = self.strategies[args[0]]
+            elif op == RESET:
+                engine.reset()
+                if self.moves is not None:
+                    self.moves.clear()
+                    self.playing = None
+            elif op == END:
+                self.ended = True
+                final = (engine.player_score, engine.computer_score, engine.draws, engine.total_challenge_points)
+                if final != args:
+                    divergences.append(f"final score/draws/points {final}, recorded {args}")
+        return self
+
+    def next_move(self, player_choice):
+        """Check a round against the queue's move in flight, then start the next one as the app does"""
+        if self.playing != player_choice:
+            self.divergences.append(f"round {self.rounds}: played {player_choice}, "
+                                    f"the input queue had {self.playing}")
+        self.moves.done()
+        if self.game_over:
+            self.moves.clear()
+            self.playing = None
+        else:
+            self.playing = self.moves.take()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded session through the engine")
+    parser.add_argument("recording")
+    parser.add_argument("--real-time", action="store_true", help="wait out the recorded gaps between events")
+    parser.add_argument("--speed", type=float, default=1.0, help="real-time speed-up factor")
+    args = parser.parse_args()
+
+    header, data = read_recording(args.recording)
+    start = time.perf_counter()
+    replay = Replayer(header).run(data, args.real_time, args.speed)
+    elapsed = time.perf_counter() - start
+
+    engine = replay.engine
+    for line in replay.divergences[:20]:
+        print(line)
+    if len(replay.divergences) > 20:
+        print(f"... and {len(replay.divergences) - 20} more")
+    print(f"seed {header['seed']}: {engine.player_score}-{engine.computer_score} ({engine.draws} draws), "
+          f"{engine.total_challenge_points} challenge points, clock "
+          f"{replay.chess_clock.remaining('player'):.1f}s / {replay.chess_clock.remaining('computer'):.1f}s")
+    if replay.moves is not None:
+        print(f"input queue ({replay.moves.policy}): {replay.moves.dropped} press(es) dropped, "
+              f"{replay.moves.replaced} replaced")
+    if not replay.ended:
+        print("recording ends early (the session did not close cleanly)")
+    print(f"\n{replay.rounds:,} rounds in {elapsed:.2f}s ({replay.rounds / elapsed:,.0f} rounds/sec), "
+          f"{len(replay.divergences)} divergence(s)")
+    sys.exit(1 if replay.divergences else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,329 @@
+"""Headless asyncio match server: many human-vs-AI and human-vs-human games at once.
+
+Clients talk newline-delimited JSON over TCP. Each connection is one seat
+with its own chess clock; AI matches run the same ``GameEngine`` as the
+Tk game, so every match keeps its own scores, streaks and AI model.
+
+Client -> server:
+    {"op": "join", "mode": "ai", "difficulty": "Hard"}   play the computer
+    {"op": "join", "mode": "pvp"}                        play the next player who joins
+    {"op": "move", "choice": "Rock"}
+    {"op": "stats"}
+    {"op": "leave"}
+
+Server -> client (``event``): "waiting" (pvp, until paired), "joined",
+"moved" (pvp: waiting for the opponent's move), "result", "timeout",
+"stats", "opponent_left", "left" and "error". Results and stats carry
+``score`` as [you, opponent, draws] and ``clock`` as your and your
+opponent's remaining seconds.
+
+A seat's clock runs while that player is choosing; in pvp both clocks run
+until each side has moved. Running out of time ends the match, and the
+opponent scores 3 as in the Tk game.
+
+Usage: python server.py [--host 127.0.0.1] [--port 8765] [--time-limit 300] [--increment 0] [--delay 0]
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import time
+
+from chess_clock import ChessClock
+from engine import CHOICES, GameEngine
+from strategies import strategy_names
+
+OUTCOMES = {"Player": "you", "Computer": "opponent", "Draw": "draw"}
+SWAPPED = {"you": "opponent", "opponent": "you", "draw": "draw"}
+
+
+class Seat:
+    """One connected player: their stream, clock and match.
+
+    The clock's "player" side is this player choosing a move; its
+    "computer" side is idle time spent waiting for the opponent.
+    """
+
+    def __init__(self, writer, clock):
+        self.writer = writer
+        self.clock = clock
+        self.match = None
+        self.flag_handle = None
+
+    def send(self, message):
+        if not self.writer.is_closing():
+            self.writer.write(json.dumps(message, separators=(",", ":")).encode() + b"\n")
+
+    def remaining(self):
+        return round(self.clock.remaining("player"), 3)
+
+
+class Match:
+    def __init__(self, match_id, seats, engine=None):
+        self.id = match_id
+        self.seats = seats
+        self.engine = engine
+        self.moves = {}
+        self.rounds = 0
+        self.scores = {seat: 0 for seat in seats}
+        self.draws = 0
+        self.over = False
+
+    def opponent(self, seat):
+        for other in self.seats:
+            if other is not seat:
+                return other
+        return None
+
+    def score(self, seat):
+        """[you, opponent, draws] from ``seat``'s side"""
+        if self.engine is not None:
+            return [self.engine.player_score, self.engine.computer_score, self.engine.draws]
+        return [self.scores[seat], self.scores[self.opponent(seat)], self.draws]
+
+    def clocks(self, seat):
+        opponent = self.opponent(seat)
+        return [seat.remaining(), opponent.remaining() if opponent else None]
+
+
+class MatchServer:
+    """Hosts every match on one event loop; all state lives in the seats and matches"""
+
+    def __init__(self, time_limit=300, increment=0, delay=0):
+        self.time_limit = time_limit
+        self.increment = increment
+        self.delay = delay
+        self.ids = itertools.count(1)
+        self.matches = {}
+        self.lobby = None
+        self.rounds = 0
+        self.connections = 0
+        self.loop = None
+
+    async def serve(self, host="127.0.0.1", port=8765):
+        """Start listening; returns the ``asyncio.Server``"""
+        self.loop = asyncio.get_running_loop()
+        return await asyncio.start_server(self.handle, host, port, limit=4096, backlog=4096)
+
+    async def handle(self, reader, writer):
+        seat = Seat(writer, ChessClock(self.time_limit, self.increment, self.delay, clock=self.loop.time))
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    # readline has already discarded the oversized line
+                    seat.send({"event": "error", "message": "request too long"})
+                    await writer.drain()
+                    continue
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    op = request["op"]
+                    if not isinstance(op, str):
+                        raise TypeError
+                except (ValueError, KeyError, TypeError):
+                    seat.send({"event": "error", "message": "expected a JSON object with an \"op\""})
+                    await writer.drain()
+                    continue
+                if op == "leave":
+                    seat.send({"event": "left"})
+                    break
+                handler = self.ops.get(op)
+                if handler is None:
+                    seat.send({"event": "error", "message": f"unknown op {op!r}"})
+                else:
+                    handler(self, seat, request)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.connections -= 1
+            self.leave(seat)
+            writer.close()
+
+    # Requests
+
+    def join(self, seat, request):
+        if seat.match is not None or seat is self.lobby:
+            seat.send({"event": "error", "message": "already in a match"})
+            return
+        mode = request.get("mode", "ai")
+        if mode == "ai":
+            difficulty = request.get("difficulty", "Normal")
+            if difficulty not in strategy_names():
+                seat.send({"event": "error", "message": f"difficulty must be one of {strategy_names()}"})
+                return
+            match = self.start_match([seat], GameEngine(difficulty=difficulty))
+            seat.send({"event": "joined", "match": match.id, "mode": "ai", "opponent": difficulty})
+        elif mode == "pvp":
+            if self.lobby is None:
+                self.lobby = seat
+                seat.send({"event": "waiting"})
+                return
+            first, self.lobby = self.lobby, None
+            match = self.start_match([first, seat])
+            for player in match.seats:
+                player.send({"event": "joined", "match": match.id, "mode": "pvp"})
+        else:
+            seat.send({"event": "error", "message": "mode must be \"ai\" or \"pvp\""})
+
+    def move(self, seat, request):
+        match = seat.match
+        choice = request.get("choice")
+        if match is None or match.over:
+            seat.send({"event": "error", "message": "not in a match"})
+            return
+        if choice not in CHOICES:
+            seat.send({"event": "error", "message": f"choice must be one of {CHOICES}"})
+            return
+        if seat in match.moves:
+            seat.send({"event": "error", "message": "already moved this round"})
+            return
+
+        self.stop_thinking(seat)
+        match.moves[seat] = choice
+        if match.engine is not None:
+            result = match.engine.play_round(choice, count_challenges=False)
+            self.finish_round(match, {seat: (result["computer"], OUTCOMES[result["winner"]])})
+        elif len(match.moves) == 2:
+            first, second = match.seats
+            winner = OUTCOMES[GameEngine.determine_winner(match.moves[first], match.moves[second])]
+            if winner == "draw":
+                match.draws += 1
+            else:
+                match.scores[first if winner == "you" else second] += 1
+            self.finish_round(match, {first: (match.moves[second], winner),
+                                      second: (match.moves[first], SWAPPED[winner])})
+        else:
+            seat.send({"event": "moved"})
+
+    def stats(self, seat, request):
+        match = seat.match
+        if match is None:
+            seat.send({"event": "stats", "match": None})
+            return
+        stats = {"event": "stats", "match": match.id, "rounds": match.rounds,
+                 "score": match.score(seat), "clock": match.clocks(seat)}
+        if match.engine is not None:
+            stats.update(win_rate=match.engine.calculate_win_rate(), streak=match.engine.current_streak,
+                         best_streak=match.engine.best_streak)
+        seat.send(stats)
+
+    ops = {"join": join, "move": move, "stats": stats}
+
+    # Matches and clocks
+
+    def start_match(self, seats, engine=None):
+        match = Match(next(self.ids), seats, engine)
+        self.matches[match.id] = match
+        for seat in seats:
+            seat.match = match
+            seat.clock.start("player")
+            self.watch_flag(seat)
+        return match
+
+    def finish_round(self, match, outcomes):
+        """Send each seat its result and start the next round"""
+        match.rounds += 1
+        self.rounds += 1
+        match.moves.clear()
+        for seat in outcomes:
+            # Back from waiting to choosing
+            seat.clock.switch()
+        for seat, (opponent_choice, winner) in outcomes.items():
+            seat.send({"event": "result", "round": match.rounds, "opponent": opponent_choice, "winner": winner,
+                       "score": match.score(seat), "clock": match.clocks(seat)})
+
+    def stop_thinking(self, seat):
+        """The seat has moved: bank its time (its flag timer is left to re-arm itself)"""
+        seat.clock.switch()
+
+    def watch_flag(self, seat):
+        """Check ``seat`` for a flag once its remaining time could have run out.
+
+        One timer per seat, re-armed when it fires early rather than
+        rescheduled on every move, so a round costs no timer churn.
+        """
+        seat.flag_handle = self.loop.call_later(seat.clock.remaining("player") + 0.001, self.check_flag, seat)
+
+    def check_flag(self, seat):
+        seat.flag_handle = None
+        match = seat.match
+        if match is None or match.over:
+            return
+        if seat.clock.flagged() != "player":
+            self.watch_flag(seat)
+            return
+
+        opponent = match.opponent(seat)
+        if match.engine is not None:
+            match.engine.computer_score += 3
+        else:
+            match.scores[opponent] += 3
+        seat.send({"event": "timeout", "loser": "you", "score": match.score(seat)})
+        if opponent is not None:
+            opponent.send({"event": "timeout", "loser": "opponent", "score": match.score(opponent)})
+        self.end_match(match)
+
+    def end_match(self, match):
+        match.over = True
+        self.matches.pop(match.id, None)
+        for seat in match.seats:
+            seat.match = None
+            if seat.flag_handle is not None:
+                seat.flag_handle.cancel()
+                seat.flag_handle = None
+            seat.clock.reset()
+
+    def leave(self, seat):
+        if self.lobby is seat:
+            self.lobby = None
+        match = seat.match
+        if match is not None:
+            opponent = match.opponent(seat)
+            self.end_match(match)
+            if opponent is not None:
+                opponent.send({"event": "opponent_left"})
+
+
+async def report(server, every):
+    """Print rounds/sec and open matches every ``every`` seconds"""
+    last_rounds, last_time = server.rounds, time.perf_counter()
+    while True:
+        await asyncio.sleep(every)
+        now = time.perf_counter()
+        rate = (server.rounds - last_rounds) / (now - last_time)
+        print(f"{rate:>10,.0f} rounds/s  {len(server.matches):>7,} matches  {server.connections:>7,} connections")
+        last_rounds, last_time = server.rounds, now
+
+
+async def run(args):
+    server = MatchServer(args.time_limit, args.increment, args.delay)
+    listener = await server.serve(args.host, args.port)
+    print(f"Serving on {args.host}:{args.port}")
+    if args.report_every > 0:
+        asyncio.get_running_loop().create_task(report(server, args.report_every))
+    async with listener:
+        await listener.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless Rock Paper Scissors match server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--time-limit", type=float, default=300, help="seconds on each player's clock")
+    parser.add_argument("--increment", type=float, default=0, help="Fischer increment per move (seconds)")
+    parser.add_argument("--delay", type=float, default=0, help="Bronstein delay per move (seconds)")
+    parser.add_argument("--report-every", type=float, default=5, help="seconds between throughput lines (0: off)")
+    args = parser.parse_args()
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""Vectorized AI-vs-AI tournament simulator.
+
+Runs many independent matches side by side as NumPy arrays, so one Python
+step advances every match by a round. Moves are encoded as 0=Rock,
+1=Paper, 2=Scissors; ``(m + 1) % 3`` is the move that beats ``m``.
+
+The AI strategies mirror ``GameEngine.get_computer_choice`` - keep them in
+sync when tweaking the Hard or Expert heuristics.
+
+Usage: python simulator.py [--games N] [--rounds N] [--seed N]
+"""
+import argparse
+import sys
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+ROCK, PAPER, SCISSORS = 0, 1, 2
+WINDOW = 10
+
+
+class MatchView:
+    """What one side of a batch of matches can see before choosing a move"""
+
+    def __init__(self, games):
+        self.games = games
+        self.round = 0
+        self.own = np.zeros((games, WINDOW), dtype=np.int8)
+        self.opp = np.zeros((games, WINDOW), dtype=np.int8)
+        self.last_outcome = np.zeros(games, dtype=np.int8)
+
+    def record(self, own_move, opp_move, outcome):
+        """Shift the round into the rolling windows"""
+        self.own[:, :-1] = self.own[:, 1:]
+        self.own[:, -1] = own_move
+        self.opp[:, :-1] = self.opp[:, 1:]
+        self.opp[:, -1] = opp_move
+        self.last_outcome = outcome
+        self.round += 1
+
+
+def random_moves(view, rng):
+    return rng.integers(0, 3, view.games, dtype=np.int8)
+
+
+def most_common(moves, rng):
+    """Most frequent move per row, ties broken at random"""
+    counts = np.stack([(moves == c).sum(axis=1) for c in range(3)], axis=1)
+    return (counts + rng.random(counts.shape) * 0.5).argmax(axis=1).astype(np.int8)
+
+
+def ai_easy(view, rng):
+    moves = random_moves(view, rng)
+    if view.round > 0:
+        counter_last = (view.opp[:, -1] + 1) % 3
+        mask = rng.random(view.games) < 0.5
+        moves[mask] = counter_last[mask]
+    return moves
+
+
+def ai_normal(view, rng):
+    return random_moves(view, rng)
+
+
+def ai_hard(view, rng):
+    moves = random_moves(view, rng)
+    if view.round < 3:
+        return moves
+
+    recent = view.opp[:, -min(5, view.round):]
+    counter = (most_common(recent, rng) + 1) % 3
+    mask = rng.random(view.games) < 0.8
+    moves[mask] = counter[mask]
+
+    cycle = (recent[:, -1] == ROCK) & (recent[:, -2] == SCISSORS) & (recent[:, -3] == PAPER)
+    moves[cycle] = PAPER
+    return moves
+
+
+def ai_expert(view, rng):
+    if view.round < 2:
+        return random_moves(view, rng)
+
+    recent = view.opp[:, -min(WINDOW, view.round):]
+    moves = (most_common(recent, rng) + 1) % 3
+
+    if view.round >= 3:
+        r1, r2, r3 = recent[:, -1], recent[:, -2], recent[:, -3]
+        not_used = 3 - r1.astype(np.int16) - r2
+        anti_cycle = (r1 != r2) & (r2 != r3) & (rng.random(view.games) < 0.9)
+        moves[anti_cycle] = ((not_used + 1) % 3)[anti_cycle]
+    return moves.astype(np.int8)
+
+
+def human_rock_lover(view, rng):
+    """Plays Rock half the time, random otherwise"""
+    moves = random_moves(view, rng)
+    moves[rng.random(view.games) < 0.5] = ROCK
+    return moves
+
+
+def human_cycler(view, rng):
+    """Rock -> Paper -> Scissors with the odd slip"""
+    moves = np.full(view.games, view.round % 3, dtype=np.int8)
+    slip = rng.random(view.games) < 0.1
+    moves[slip] = random_moves(view, rng)[slip]
+    return moves
+
+
+def human_win_stay_lose_shift(view, rng):
+    """Repeats a winning move, switches to what would have beaten the opponent otherwise"""
+    if view.round == 0:
+        return random_moves(view, rng)
+    moves = (view.opp[:, -1] + 1) % 3
+    won = view.last_outcome == 1
+    moves[won] = view.own[won, -1]
+    return moves.astype(np.int8)
+
+
+def human_copycat(view, rng):
+    """Copies the opponent's previous move"""
+    if view.round == 0:
+        return random_moves(view, rng)
+    return view.opp[:, -1].copy()
+
+
+STRATEGIES = {
+    "Easy": ai_easy,
+    "Normal": ai_normal,
+    "Hard": ai_hard,
+    "Expert": ai_expert,
+    "RockLover": human_rock_lover,
+    "Cycler": human_cycler,
+    "WinStay": human_win_stay_lose_shift,
+    "Copycat": human_copycat,
+}
+
+
+def run_match(strategy_a, strategy_b, games, rounds, rng):
+    """Play ``games`` parallel matches of ``rounds`` rounds; returns per-game win/draw/loss counts for A"""
+    view_a = MatchView(games)
+    view_b = MatchView(games)
+    wins = np.zeros(games, dtype=np.int64)
+    draws = np.zeros(games, dtype=np.int64)
+
+    for _ in range(rounds):
+        move_a = strategy_a(view_a, rng)
+        move_b = strategy_b(view_b, rng)
+        diff = (move_a.astype(np.int16) - move_b) % 3
+        wins += diff == 1
+        draws += diff == 0
+        outcome = np.where(diff == 1, 1, np.where(diff == 0, 0, -1)).astype(np.int8)
+        view_a.record(move_a, move_b, outcome)
+        view_b.record(move_b, move_a, -outcome)
+
+    return wins, draws, rounds - wins - draws
+
+
+def rate_with_ci(counts, rounds):
+    """Mean per-game rate with a 95% confidence half-width across games"""
+    rates = counts / rounds
+    half_width = 1.96 * rates.std(ddof=1) / np.sqrt(len(rates)) if len(rates) > 1 else 0.0
+    return rates.mean(), half_width
+
+
+def run_tournament(names, games=1000, rounds=200, seed=None):
+    """Every strategy against every other; returns win/draw/loss matrices of (rate, ci) pairs"""
+    rng = np.random.default_rng(seed)
+    size = len(names)
+    matrices = {key: [[None] * size for _ in range(size)] for key in ("win", "draw", "loss")}
+
+    for i, name_a in enumerate(names):
+        for j, name_b in enumerate(names):
+            wins, draws, losses = run_match(STRATEGIES[name_a], STRATEGIES[name_b], games, rounds, rng)
+            matrices["win"][i][j] = rate_with_ci(wins, rounds)
+            matrices["draw"][i][j] = rate_with_ci(draws, rounds)
+            matrices["loss"][i][j] = rate_with_ci(losses, rounds)
+
+    return matrices
+
+
+def print_matrix(title, names, matrix):
+    width = max(len(n) for n in names) + 2
+    print(f"\n{title} (row vs column, % ± 95% CI)")
+    print(" " * width + "".join(f"{n:>15}" for n in names))
+    for name, row in zip(names, matrix):
+        cells = "".join(f"{f'{rate * 100:.1f}±{ci * 100:.1f}':>15}" for rate, ci in row)
+        print(f"{name:<{width}}{cells}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vectorized AI-vs-AI tournament")
+    parser.add_argument("--games", type=int, default=2000, help="parallel matches per pairing")
+    parser.add_argument("--rounds", type=int, default=500, help="rounds per match")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--strategies", nargs="+", default=list(STRATEGIES), choices=list(STRATEGIES))
+    args = parser.parse_args()
+
+    if np is None:
+        sys.exit("simulator.py needs NumPy: pip install numpy")
+
+    start = time.perf_counter()
+    matrices = run_tournament(args.strategies, args.games, args.rounds, args.seed)
+    elapsed = time.perf_counter() - start
+
+    for key, title in (("win", "WIN"), ("draw", "DRAW"), ("loss", "LOSS")):
+        print_matrix(title, args.strategies, matrices[key])
+
+    total = len(args.strategies) ** 2 * args.games * args.rounds
+    print(f"\n{total:,} rounds in {elapsed:.2f}s ({total / elapsed:,.0f} rounds/sec)")
+
+
+if __name__ == "__main__":
+    main()
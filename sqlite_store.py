@@ -0,0 +1,281 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from datetime import datetime
+
+from ai import CHOICES, MOVE_INDEX
+from history import WINNERS, WINNER_INDEX
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rounds (
+    id INTEGER PRIMARY KEY,
+    epoch INTEGER NOT NULL,
+    player INTEGER NOT NULL,
+    computer INTEGER NOT NULL,
+    winner INTEGER NOT NULL,
+    difficulty TEXT
+);
+CREATE INDEX IF NOT EXISTS rounds_epoch ON rounds (epoch);
+CREATE INDEX IF NOT EXISTS rounds_difficulty_epoch ON rounds (difficulty, epoch);
+
+CREATE TABLE IF NOT EXISTS challenges (
+    position INTEGER PRIMARY KEY,
+    id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    description TEXT NOT NULL,
+    target INTEGER NOT NULL,
+    reward_points INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    difficulty TEXT,
+    progress INTEGER NOT NULL,
+    completed INTEGER NOT NULL,
+    date_assigned TEXT
+);
+
+CREATE TABLE IF NOT EXISTS aggregates (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+CHALLENGE_FIELDS = ["id", "name", "description", "target", "reward_points", "type",
+                    "difficulty", "progress", "completed", "date_assigned"]
+
+WEEK = 7 * 24 * 3600
+
+
+class RoundTable:
+    """The ``rounds`` table read like a ``LifetimeHistory``: ``len``, ``round(i)`` and ``matching()``.
+
+    Rounds are never deleted, so row ids run 1..N and round ``i`` is a
+    primary-key lookup.
+    """
+
+    def __init__(self, store):
+        self.store = store
+
+    @property
+    def connection(self):
+        return self.store.connection
+
+    def __len__(self):
+        return self.connection.execute("SELECT COALESCE(MAX(id), 0) FROM rounds").fetchone()[0]
+
+    def round(self, index):
+        """One decoded ``(player, computer, winner, difficulty, epoch)`` tuple"""
+        if index < 0:
+            index += len(self)
+        row = self.connection.execute(
+            "SELECT player, computer, winner, difficulty, epoch FROM rounds WHERE id = ?", (index + 1,)).fetchone()
+        if row is None:
+            raise IndexError("round index out of range")
+        player, computer, winner, difficulty, epoch = row
+        return CHOICES[player], CHOICES[computer], WINNERS[winner], difficulty, epoch
+
+    def matching(self, winner=None, difficulty=None):
+        """Indexes of the rounds with this winner and/or difficulty, oldest first"""
+        if winner is None and difficulty is None:
+            return range(len(self))
+        query, params = "SELECT id - 1 FROM rounds WHERE 1", []
+        if difficulty is not None:
+            query += " AND difficulty = ?"
+            params.append(difficulty)
+        if winner is not None:
+            query += " AND winner = ?"
+            params.append(WINNER_INDEX[winner])
+        return array("q", (row[0] for row in self.connection.execute(query + " ORDER BY id", params)))
+
+
+class SqliteStatsStore:
+    """Stats backend on a stdlib ``sqlite3`` database in WAL mode.
+
+    ``rounds`` holds every round ever played (moves and winner as the same
+    small integer codes ``GameHistory`` uses), indexed on epoch and on
+    (difficulty, epoch). ``challenges`` holds the current challenge cards and
+    ``aggregates`` the remaining snapshot values - scores, streaks, points,
+    recent history - as JSON, plus ``last_round_id``, the last round the
+    snapshot already includes. Loading replays rounds after it, so rounds
+    can be inserted on their own between snapshots.
+
+    It speaks the same protocol as ``StatsStore``, so ``BackgroundWriter``
+    can drive it; rounds are inserted in batches inside one transaction.
+    Each thread gets its own connection, so the writer thread and the Tk
+    thread never share one; WAL lets them read while the other writes.
+    """
+
+    lifetime = None
+
+    def __init__(self, path="rps_stats.db", compact_every=200):
+        self.path = path
+        self.compact_every = compact_every
+        self.journal_rounds = 0
+        self.local = threading.local()
+        self.connections = []
+        self.connections_lock = threading.Lock()
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+        self.round_table = RoundTable(self)
+
+    @property
+    def connection(self):
+        """The calling thread's connection, opened on its first use"""
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            # Only ever used by this thread; close_files closes it from another once that thread is done
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self.local.connection = connection
+            with self.connections_lock:
+                self.connections.append(connection)
+        return connection
+
+    def is_empty(self):
+        """True until the first snapshot is written"""
+        return self.connection.execute("SELECT COUNT(*) FROM aggregates").fetchone()[0] == 0
+
+    def load(self, engine):
+        """Restore the snapshot into ``engine`` and replay newer rounds; returns False if nothing is stored"""
+        if self.is_empty():
+            return False
+
+        db = self.connection
+        stats = {key: json.loads(value) for key, value in db.execute("SELECT key, value FROM aggregates")}
+        columns = ", ".join(CHALLENGE_FIELDS)
+        stats["challenges"] = [
+            dict(zip(CHALLENGE_FIELDS, row), completed=bool(row[8]))
+            for row in db.execute(f"SELECT {columns} FROM challenges ORDER BY position")
+        ]
+        engine.load_dict(stats)
+
+        today = datetime.now().strftime("%Y-%m-%d")
+        stale = stats.get("last_challenge_date") != today
+        for player, computer, epoch, difficulty in db.execute(
+                "SELECT player, computer, epoch, difficulty FROM rounds WHERE id > ? ORDER BY id",
+                (stats.get("last_round_id", 0),)):
+            played_today = datetime.fromtimestamp(epoch).strftime("%Y-%m-%d") == today
+            engine.play_round(CHOICES[player], CHOICES[computer], epoch=epoch, difficulty=difficulty,
+                              count_challenges=played_today)
+            stale = True
+
+        if stale:
+            self.save_snapshot(engine)
+        return True
+
+    @staticmethod
+    def round_record(result):
+        """The ``(player, computer, winner, difficulty, epoch)`` record stored for a ``play_round`` result"""
+        return result["player"], result["computer"], result["winner"], result["difficulty"], result["epoch"]
+
+    def append_round(self, engine, result):
+        """Insert one round, snapshotting every ``compact_every`` rounds"""
+        self.write_rounds([self.round_record(result)])
+
+        self.journal_rounds += 1
+        if self.journal_rounds >= self.compact_every:
+            self.save_snapshot(engine)
+
+    def write_rounds(self, records):
+        """Insert rounds in one transaction"""
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO rounds (epoch, player, computer, winner, difficulty) VALUES (?, ?, ?, ?, ?)",
+                [(epoch, MOVE_INDEX[player], MOVE_INDEX[computer], WINNER_INDEX[winner], difficulty)
+                 for player, computer, winner, difficulty, epoch in records])
+
+    def save_snapshot(self, engine):
+        """Write the engine's full state"""
+        self.write_snapshot(engine.to_dict())
+
+    def write_snapshot(self, stats):
+        """Replace aggregates and challenges with ``stats`` in one transaction"""
+        stats = dict(stats)
+        challenges = stats.pop("challenges", [])
+        with self.connection as db:
+            stats["last_round_id"] = db.execute("SELECT COALESCE(MAX(id), 0) FROM rounds").fetchone()[0]
+            db.execute("DELETE FROM aggregates")
+            db.executemany("INSERT INTO aggregates (key, value) VALUES (?, ?)",
+                           [(key, json.dumps(value)) for key, value in stats.items()])
+            db.execute("DELETE FROM challenges")
+            db.executemany(
+                f"INSERT INTO challenges (position, {', '.join(CHALLENGE_FIELDS)}) "
+                f"VALUES (?, {', '.join('?' * len(CHALLENGE_FIELDS))})",
+                [(position, *(challenge[field] for field in CHALLENGE_FIELDS))
+                 for position, challenge in enumerate(challenges)])
+        self.journal_rounds = 0
+
+    def close(self, engine):
+        """Snapshot and close the database (call on exit)"""
+        self.save_snapshot(engine)
+        self.close_files()
+
+    def close_files(self):
+        """Close every thread's database connection"""
+        with self.connections_lock:
+            connections, self.connections = self.connections, []
+        for connection in connections:
+            connection.close()
+        self.local = threading.local()
+
+    def migrate_from_json(self, json_path="rps_stats.json", history_dir="rps_history"):
+        """Import the JSON store - snapshot, journal and lifetime history - into an empty database, leaving it untouched"""
+        from engine import GameEngine
+        from lifetime import LifetimeHistory
+        from storage import StatsStore
+
+        engine = GameEngine()
+        json_store = StatsStore(json_path)
+        # Read only: the JSON files are left as they were
+        if not json_store.load(engine, compact=False):
+            return False
+        json_store.close_files()
+
+        if history_dir and os.path.isdir(history_dir):
+            lifetime = LifetimeHistory(history_dir)
+            records = list(lifetime.rounds())
+            lifetime.close()
+        else:
+            records = [(h["player"], h["computer"], h["winner"], None, epoch)
+                       for h, epoch in zip(engine.game_history, engine.game_history.epochs())]
+
+        self.write_rounds(records)
+        self.save_snapshot(engine)
+        return True
+
+    def rounds(self, stop=None):
+        """Every stored ``(player, computer, winner, difficulty, epoch)`` (the first ``stop``), oldest first, streamed from a cursor"""
+        query, params = "SELECT player, computer, winner, difficulty, epoch FROM rounds", ()
+        if stop is not None:
+            query, params = query + " WHERE id <= ?", (stop,)
+        for player, computer, winner, difficulty, epoch in self.connection.execute(query + " ORDER BY id", params):
+            yield CHOICES[player], CHOICES[computer], WINNERS[winner], difficulty, epoch
+
+    def win_rate(self, difficulty=None, since=None):
+        """Player win percentage over rounds, optionally for one difficulty and since an epoch"""
+        query = "SELECT COUNT(*), COALESCE(SUM(winner = ?), 0) FROM rounds WHERE epoch >= ?"
+        params = [WINNER_INDEX["Player"], since or 0]
+        if difficulty is not None:
+            query += " AND difficulty = ?"
+            params.append(difficulty)
+        total, wins = self.connection.execute(query, params).fetchone()
+        return round(wins / total * 100, 1) if total else 0
+
+    def win_rate_last_week(self, difficulty=None):
+        """Win percentage over the last seven days"""
+        return self.win_rate(difficulty, int(time.time()) - WEEK)
+
+    def best_streak_per_day(self, since=None):
+        """``[(YYYY-MM-DD, best win streak)]``; draws do not break a streak, computer wins do"""
+        return self.connection.execute("""
+            WITH marked AS (
+                SELECT date(epoch, 'unixepoch', 'localtime') AS day, winner,
+                       SUM(winner = ?) OVER (ORDER BY id) AS run
+                FROM rounds WHERE epoch >= ?
+            )
+            SELECT day, MAX(wins) FROM (
+                SELECT day, run, SUM(winner = ?) AS wins FROM marked GROUP BY day, run
+            )
+            GROUP BY day ORDER BY day
+        """, (WINNER_INDEX["Computer"], since or 0, WINNER_INDEX["Player"])).fetchall()
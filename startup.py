@@ -0,0 +1,39 @@
+import time
+
+
+class PhaseTimer:
+    """Wall time of consecutive startup phases, for ``--profile-startup``.
+
+    Each ``mark`` ends the current phase; ``start`` is when the first
+    one began (``time.perf_counter`` seconds).
+    """
+
+    def __init__(self, start=None, clock=time.perf_counter):
+        self.clock = clock
+        self.start = clock() if start is None else start
+        self.last = self.start
+        self.phases = []
+
+    def mark(self, phase):
+        """End ``phase`` now and start timing the next one"""
+        now = self.clock()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+
+    def total(self):
+        return self.last - self.start
+
+    def elapsed(self, phase):
+        """Seconds from the start to the end of ``phase``"""
+        seconds = 0.0
+        for name, duration in self.phases:
+            seconds += duration
+            if name == phase:
+                return seconds
+        raise KeyError(phase)
+
+    def report(self):
+        """The breakdown as aligned text lines, in milliseconds"""
+        lines = [f"{phase:<28}{seconds * 1e3:>9.1f} ms" for phase, seconds in self.phases]
+        lines.append(f"{'total':<28}{self.total() * 1e3:>9.1f} ms")
+        return "\n".join(lines)
@@ -0,0 +1,287 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from lifetime import LifetimeHistory
+
+
+def write_atomic(path, text):
+    """Write ``text`` to ``path`` via a temp file and rename, so readers never see a partial file"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(prefix=".rps_", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class StatsStore:
+    """Snapshot + append-only journal persistence for a ``GameEngine``.
+
+    Each round appends one short JSON line to ``<snapshot>.journal``, so the
+    write per round stays the same size whatever the history length. The
+    full stats dict is written to the snapshot only on compaction - every
+    ``compact_every`` rounds, on exit, or after changes that are not rounds
+    (reset, timeout bonus). Snapshots are written atomically and carry a
+    generation number that the journal's header line must match, so a
+    crash between writing a snapshot and deleting the old journal cannot
+    replay rounds twice. A torn last journal line is ignored on load.
+
+    With ``history_dir`` set, every live round is also appended to a
+    ``LifetimeHistory`` there, which keeps all rounds ever played; the
+    history already in the JSON is migrated into it the first time.
+    """
+
+    def __init__(self, path="rps_stats.json", compact_every=200, history_dir=None):
+        self.path = path
+        self.journal_path = path + ".journal"
+        self.compact_every = compact_every
+        self.journal = None
+        self.journal_rounds = 0
+        self.generation = 0
+        self.lifetime = LifetimeHistory(history_dir) if history_dir else None
+
+    def load(self, engine, compact=True):
+        """Restore the snapshot into ``engine`` and replay the journal on top; returns False if no snapshot exists.
+
+        ``compact=False`` leaves the files untouched, for reading a store
+        without taking it over (a migration).
+        """
+        found = os.path.exists(self.path)
+        stale = False
+        if found:
+            with open(self.path, "r", encoding="utf-8") as f:
+                stats = json.load(f)
+            engine.load_dict(stats)
+            self.generation = stats.get("journal_generation", 0)
+            stale = stats.get("last_challenge_date") != datetime.now().strftime("%Y-%m-%d")
+
+        if os.path.exists(self.journal_path):
+            self.replay(engine)
+            stale = True
+
+        if self.lifetime is not None and len(self.lifetime) == 0 and len(engine.game_history):
+            self.lifetime.import_history(engine.game_history.to_list())
+
+        # Fresh daily challenges and replayed rounds are folded into the
+        # snapshot now, so later journal lines apply to the same state.
+        if stale and compact:
+            self.save_snapshot(engine)
+        return found
+
+    def replay(self, engine):
+        """Apply journaled rounds to ``engine``; returns how many were applied"""
+        if not os.path.exists(self.journal_path):
+            return 0
+
+        today = datetime.now().strftime("%Y-%m-%d")
+        applied = 0
+        with open(self.journal_path, "r", encoding="utf-8") as f:
+            try:
+                header = json.loads(f.readline())
+            except ValueError:
+                return 0
+            if header.get("generation") != self.generation:
+                return 0
+
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    player, computer, epoch, difficulty = entry["p"], entry["c"], entry["t"], entry["d"]
+                except (ValueError, KeyError):
+                    break
+                played_today = datetime.fromtimestamp(epoch).strftime("%Y-%m-%d") == today
+                engine.play_round(player, computer, epoch=epoch, difficulty=difficulty,
+                                  count_challenges=played_today)
+                applied += 1
+        return applied
+
+    @staticmethod
+    def round_record(result):
+        """The ``(player, computer, winner, difficulty, epoch)`` record stored for a ``play_round`` result"""
+        return result["player"], result["computer"], result["winner"], result["difficulty"], result["epoch"]
+
+    def append_round(self, engine, result):
+        """Journal one round, compacting into a snapshot every ``compact_every`` rounds"""
+        self.write_rounds([self.round_record(result)])
+
+        self.journal_rounds += 1
+        if self.journal_rounds >= self.compact_every:
+            self.save_snapshot(engine)
+
+    def write_rounds(self, records):
+        """Append rounds to the journal in a single write, and to the lifetime history"""
+        if self.journal is None:
+            self.journal = open(self.journal_path, "a", encoding="utf-8")
+            if self.journal.tell() == 0:
+                self.journal.write(json.dumps({"generation": self.generation}) + "\n")
+
+        self.journal.write("".join(
+            json.dumps({"p": player, "c": computer, "t": epoch, "d": difficulty}, separators=(",", ":")) + "\n"
+            for player, computer, winner, difficulty, epoch in records))
+        self.journal.flush()
+
+        if self.lifetime is not None:
+            self.lifetime.extend(records)
+
+    def save_snapshot(self, engine):
+        """Write the full state atomically and start an empty journal"""
+        self.write_snapshot(engine.to_dict())
+
+    def write_snapshot(self, stats):
+        """Atomically replace the snapshot with ``stats`` and drop the journal it supersedes"""
+        stats["journal_generation"] = self.generation + 1
+        write_atomic(self.path, json.dumps(stats, indent=4))
+        self.generation += 1
+
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+        if os.path.exists(self.journal_path):
+            os.remove(self.journal_path)
+        self.journal_rounds = 0
+
+    def close(self, engine):
+        """Compact and release files (call on exit)"""
+        self.save_snapshot(engine)
+        self.close_files()
+
+    def close_files(self):
+        """Release the journal and lifetime history files"""
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+        if self.lifetime is not None:
+            self.lifetime.close()
+
+
+class BackgroundWriter:
+    """Moves a stats store's disk writes off the caller's thread.
+
+    The caller only captures data - a round record, or ``engine.to_dict()``
+    for a snapshot - and queues it. A daemon thread writes at most once per
+    ``interval`` seconds: queued rounds go out in one batch, and of several
+    queued snapshots only the newest is written, after the rounds it
+    covers. ``flush()`` blocks until the queue is on disk; ``close()``
+    snapshots, flushes and stops the thread.
+
+    Any store with ``round_record``, ``write_rounds``, ``write_snapshot``,
+    ``close_files``, ``compact_every`` and ``journal_rounds`` can be used.
+    """
+
+    def __init__(self, store, interval=0.25):
+        self.store = store
+        self.interval = interval
+        self.condition = threading.Condition()
+        self.rounds = []
+        self.snapshot = None
+        self.rounds_after = []
+        self.journal_rounds = store.journal_rounds
+        self.writing = False
+        self.urgent = False
+        self.running = True
+        self.last_write = 0.0
+        self.thread = threading.Thread(target=self._run, name="stats-writer", daemon=True)
+        self.thread.start()
+
+    def _pending(self):
+        return self.rounds or self.snapshot is not None or self.rounds_after
+
+    def append_round(self, engine, result):
+        """Queue one round, and a snapshot every ``compact_every`` rounds"""
+        record = self.store.round_record(result)
+        with self.condition:
+            if self.snapshot is None:
+                self.rounds.append(record)
+            else:
+                self.rounds_after.append(record)
+            self.journal_rounds += 1
+            if self.journal_rounds >= self.store.compact_every:
+                self._queue_snapshot(engine.to_dict())
+            self.condition.notify_all()
+
+    def save_snapshot(self, engine):
+        """Queue a full snapshot of the engine's current state"""
+        with self.condition:
+            self._queue_snapshot(engine.to_dict())
+            self.condition.notify_all()
+
+    def _queue_snapshot(self, stats):
+        self.rounds.extend(self.rounds_after)
+        self.rounds_after = []
+        self.snapshot = stats
+        self.journal_rounds = 0
+
+    def flush(self, timeout=None):
+        """Write everything queued now and wait for it; returns False on timeout"""
+        with self.condition:
+            self.urgent = True
+            self.condition.notify_all()
+            done = self.condition.wait_for(
+                lambda: not (self._pending() or self.writing) or not self.thread.is_alive(),
+                timeout)
+            self.urgent = False
+            return done
+
+    def close(self, engine, timeout=5.0):
+        """Snapshot, flush and stop the writer thread (call on exit)"""
+        self.save_snapshot(engine)
+        self.flush(timeout)
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        self.thread.join(timeout)
+        self.store.close_files()
+
+    def _run(self):
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self._pending() or not self.running)
+                if not self._pending():
+                    return
+
+                if not self.urgent:
+                    delay = self.last_write + self.interval - time.monotonic()
+                    if delay > 0:
+                        self.condition.wait_for(lambda: self.urgent or not self.running, delay)
+
+                rounds, snapshot, rounds_after = self.rounds, self.snapshot, self.rounds_after
+                self.rounds, self.snapshot, self.rounds_after = [], None, []
+                self.writing = True
+
+            try:
+                if rounds:
+                    self.store.write_rounds(rounds)
+                if snapshot is not None:
+                    self.store.write_snapshot(snapshot)
+                if rounds_after:
+                    self.store.write_rounds(rounds_after)
+            except Exception as e:
+                print(f"Error saving stats: {e}")
+
+            with self.condition:
+                self.writing = False
+                self.last_write = time.monotonic()
+                self.condition.notify_all()
+
+
+def open_stats_store(backend="json"):
+    """The stats store for a backend name: ``"json"`` (default) or ``"sqlite"``"""
+    if backend == "sqlite":
+        # Imported only here: sqlite3 is not needed by the default backend
+        from sqlite_store import SqliteStatsStore
+        store = SqliteStatsStore("rps_stats.db")
+        if store.is_empty() and os.path.exists("rps_stats.json"):
+            store.migrate_from_json("rps_stats.json", "rps_history")
+        return store
+
+    return StatsStore("rps_stats.json", history_dir="rps_history")
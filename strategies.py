@@ -0,0 +1,317 @@
+"""Computer strategies: the built-in difficulties and a registry for plugins.
+
+A strategy is a ``Strategy`` subclass registered under the name the
+player picks it by. Plugins are found on first use without being
+imported: entry points in the ``rps_game.strategies`` group, and
+``*.py`` files in ``RPS_PLUGIN_DIR`` (``plugins/`` next to this file by
+default) registered under the file's name. A plugin's module is only
+imported when its strategy is first played. Plugin modules expose their
+class as ``strategy``.
+
+Every call into a strategy (building it, ``choose``, ``record`` and
+``clear``) runs under its CPU ``budget``; see ``call_within_budget``. A
+move that overruns or is not a move is replaced by a random one for that
+round, and a ``record`` or ``clear`` that overruns is skipped. A
+strategy that raises, or overruns while being built or trained, is
+dropped and the engine plays random until it is picked again.
+"""
+import importlib.util
+import os
+import random
+import signal
+import threading
+import time
+
+from ai import CHOICES, COUNTERS, EnsemblePredictor, MarkovModel, RollingMoveModel
+
+ENTRY_POINT_GROUP = "rps_game.strategies"
+PLUGIN_DIR = os.environ.get("RPS_PLUGIN_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "plugins"))
+
+# CPU seconds a strategy call (a move, or recording a round) may take
+DEFAULT_BUDGET = 0.005
+
+
+class Strategy:
+    """A computer opponent.
+
+    ``choose(history)`` returns the next move, given the engine's recent
+    ``GameHistory``. Strategies that learn override ``record`` (called
+    after every round once the strategy has been played) and ``clear``.
+    Draw any randomness from ``self.rng`` so seeded sessions replay
+    exactly. ``think_ms`` is how long the app shows the computer
+    thinking. ``budget`` is the CPU seconds each call may take; None skips
+    the check, for strategies whose calls are constant-time.
+    """
+
+    description = ""
+    think_ms = 800
+    budget = DEFAULT_BUDGET
+
+    def __init__(self, rng=random):
+        self.rng = rng
+
+    def choose(self, history):
+        raise NotImplementedError
+
+    def record(self, player_move, computer_move):
+        pass
+
+    def clear(self):
+        pass
+
+
+class Easy(Strategy):
+    description = "Computer makes random moves with occasional mistakes"
+    think_ms = 500
+    budget = None
+
+    def choose(self, history):
+        if len(history) > 0 and self.rng.random() < 0.5:
+            return COUNTERS[history.player(-1)]
+        return self.rng.choice(CHOICES)
+
+
+class Normal(Strategy):
+    description = "Computer plays completely random"
+    budget = None
+
+    def choose(self, history):
+        return self.rng.choice(CHOICES)
+
+
+class Hard(Strategy):
+    description = "Computer analyzes your patterns and tries to counter"
+    think_ms = 1200
+    budget = None
+
+    def __init__(self, rng=random, window=5):
+        super().__init__(rng)
+        self.model = RollingMoveModel(window)
+
+    def choose(self, history):
+        model = self.model
+        if len(model) >= 3:
+            recent = model.moves
+            if recent[-1] == "Rock" and recent[-2] == "Scissors" and recent[-3] == "Paper":
+                return "Paper"
+
+            if self.rng.random() < 0.8:
+                return COUNTERS[model.most_common()]
+        return self.rng.choice(CHOICES)
+
+    def record(self, player_move, computer_move):
+        self.model.record(player_move)
+
+    def clear(self):
+        self.model.clear()
+
+
+class Expert(Hard):
+    description = "Advanced AI with pattern recognition - Very challenging!"
+    think_ms = 1500
+
+    def __init__(self, rng=random, window=10):
+        super().__init__(rng, window)
+
+    def choose(self, history):
+        model = self.model
+        if len(model) >= 2:
+            recent = model.moves
+
+            if len(recent) >= 3:
+                if recent[-1] != recent[-2] and recent[-2] != recent[-3]:
+                    not_used = [c for c in CHOICES if c != recent[-1] and c != recent[-2]]
+                    if not_used and self.rng.random() < 0.9:
+                        return COUNTERS[not_used[0]]
+
+            return COUNTERS[model.most_common()]
+        return self.rng.choice(CHOICES)
+
+
+class Master(Strategy):
+    description = "Markov model that learns your move sequences - Brutal!"
+    think_ms = 1500
+    budget = None
+
+    def __init__(self, rng=random, joint=False):
+        super().__init__(rng)
+        self.model = MarkovModel(joint=joint)
+
+    def choose(self, history):
+        prediction = self.model.predict_next()
+        if prediction is not None:
+            return COUNTERS[prediction]
+        return self.rng.choice(CHOICES)
+
+    def record(self, player_move, computer_move):
+        self.model.record(player_move, computer_move)
+
+    def clear(self):
+        self.model.clear()
+
+
+class Grandmaster(Strategy):
+    description = "Ensemble of predictors that second-guesses you - Good luck!"
+    think_ms = 1500
+
+    def __init__(self, rng=random, ensemble_budget=0.002):
+        super().__init__(rng)
+        self.ensemble = EnsemblePredictor(budget=ensemble_budget, rng=rng)
+
+    def choose(self, history):
+        return self.ensemble.choose()
+
+    def record(self, player_move, computer_move):
+        self.ensemble.record(player_move, computer_move)
+
+    def clear(self):
+        self.ensemble.clear()
+
+
+# name -> Strategy subclass, or (for names in _loaders) a function that imports and returns one on first use
+STRATEGIES = {strategy.__name__: strategy for strategy in (Easy, Normal, Hard, Expert, Master, Grandmaster)}
+_loaders = set()
+_discovered = False
+
+
+class StrategyError(Exception):
+    """A plugin strategy could not be loaded"""
+
+
+def register_strategy(name, strategy):
+    """Add a strategy: a ``Strategy`` subclass, or a function returning one (called on first use)"""
+    if isinstance(strategy, type):
+        if not issubclass(strategy, Strategy):
+            raise TypeError(f"{strategy.__name__} is not a Strategy subclass")
+        _loaders.discard(name)
+    elif callable(strategy):
+        _loaders.add(name)
+    else:
+        raise TypeError(f"expected a Strategy subclass or a function returning one, got {strategy!r}")
+    STRATEGIES[name] = strategy
+
+
+def discover(directory=None, group=ENTRY_POINT_GROUP):
+    """Register plugin strategies from entry points and a directory, without importing them"""
+    global _discovered
+    _discovered = True
+    try:
+        from importlib.metadata import entry_points
+        found = entry_points(group=group)
+    except Exception:
+        found = ()
+    for entry_point in found:
+        _add_loader(entry_point.name, entry_point.load)
+
+    directory = PLUGIN_DIR if directory is None else directory
+    if os.path.isdir(directory):
+        for filename in sorted(os.listdir(directory)):
+            name, extension = os.path.splitext(filename)
+            if extension == ".py" and not name.startswith("_"):
+                path = os.path.join(directory, filename)
+                _add_loader(name, lambda name=name, path=path: _load_file(name, path))
+
+
+def _add_loader(name, loader):
+    """Register ``loader`` unless ``name`` is already taken (built-ins and earlier plugins win)"""
+    if name not in STRATEGIES:
+        STRATEGIES[name] = loader
+        _loaders.add(name)
+
+
+def _load_file(name, path):
+    spec = importlib.util.spec_from_file_location(f"rps_plugins.{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.strategy
+
+
+def strategy_names():
+    """Every registered strategy, built-ins first"""
+    if not _discovered:
+        discover()
+    return list(STRATEGIES)
+
+
+def load_strategy(name):
+    """The ``Strategy`` subclass registered as ``name``, importing it if needed; None if unknown.
+
+    Raises ``StrategyError`` if the plugin fails to import or does not
+    provide a ``Strategy`` subclass.
+    """
+    if name not in STRATEGIES and not _discovered:
+        discover()
+    strategy = STRATEGIES.get(name)
+    if strategy is None:
+        return None
+    loaded = name in _loaders
+    if loaded:
+        try:
+            strategy = strategy()
+        except Exception as e:
+            raise StrategyError(f"Error loading strategy {name}: {e}") from e
+    if not (isinstance(strategy, type) and issubclass(strategy, Strategy)):
+        raise StrategyError(f"Error loading strategy {name}: expected a Strategy subclass, got {strategy!r}")
+    if loaded:
+        STRATEGIES[name] = strategy
+        _loaders.discard(name)
+    return strategy
+
+
+class BudgetOverrun(BaseException):
+    """A strategy ran past its CPU budget.
+
+    Not an ``Exception``, so a plugin's own ``except Exception`` cannot
+    swallow the interrupt.
+    """
+
+
+def _overrun(signum, frame):
+    if _deadline is None:
+        # Delivered after the call returned
+        return
+    remaining = _deadline - time.thread_time()
+    if remaining > 0:
+        # The timer also counted other threads' CPU; this call still has budget left
+        signal.setitimer(signal.ITIMER_PROF, max(remaining, 1e-5))
+        return
+    raise BudgetOverrun
+
+
+MAIN_THREAD = threading.main_thread().ident
+_interrupt_ready = False
+# Main thread CPU time the budgeted call may run to
+_deadline = None
+
+
+def call_within_budget(budget, function, *args):
+    """``function(*args)``, raising ``BudgetOverrun`` if it takes more than ``budget`` CPU seconds.
+
+    Only the calling thread's CPU time counts. On a Unix main thread an
+    ITIMER_PROF timer interrupts the call at its budget, so a runaway
+    plugin cannot hang the game. That timer counts the CPU time of the
+    whole process, so when it fires early because other threads (the
+    stats writer, the watchdog's sampler) were busy, the handler checks
+    the main thread's own clock and re-arms for what is left. The
+    SIGPROF handler is installed process-wide on first use, replacing
+    any other (a sampling profiler's, say). Elsewhere the call runs to
+    the end, is timed on the calling thread's CPU clock, and overruns
+    are raised afterwards. Exceptions from ``function`` propagate.
+    """
+    global _interrupt_ready, _deadline
+    if hasattr(signal, "setitimer") and threading.get_ident() == MAIN_THREAD:
+        if not _interrupt_ready:
+            signal.signal(signal.SIGPROF, _overrun)
+            _interrupt_ready = True
+        try:
+            _deadline = time.thread_time() + budget
+            signal.setitimer(signal.ITIMER_PROF, budget)
+            return function(*args)
+        finally:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            _deadline = None
+    start = time.thread_time()
+    result = function(*args)
+    if time.thread_time() - start > budget:
+        raise BudgetOverrun
+    return result
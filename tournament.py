@@ -0,0 +1,153 @@
+"""Round-robin tournament between the game's AI difficulties, across all CPU cores.
+
+Unlike simulator.py this plays the real ``GameEngine`` AIs (Master and
+Grandmaster included) against each other, one round at a time. Every
+pairing is split into chunks of games that run in a
+``ProcessPoolExecutor``. Each game is seeded from (seed, pairing, game
+number), so results are the same for any worker count or completion
+order. A pairing's line is printed as soon as all its games are in,
+followed by the standings.
+
+Usage: python tournament.py [--games N] [--rounds N] [--seed N] [--workers N] [--strategies NAME ...]
+"""
+import argparse
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from engine import GameEngine
+from strategies import strategy_names
+
+
+class EnginePlayer:
+    """One side of a match: a GameEngine whose "player" is the opponent"""
+
+    def __init__(self, difficulty, seed):
+        # No time budget: a Grandmaster that skipped predictors under load would break reproducibility
+        self.engine = GameEngine(difficulty=difficulty, ensemble_budget=float("inf"), seed=seed, enforce_budget=False)
+
+    def choose(self):
+        return self.engine.get_computer_choice()
+
+    def record(self, own_move, opponent_move):
+        self.engine.play_round(opponent_move, computer_choice=own_move, epoch=0, count_challenges=False)
+
+
+def game_seed(seed, name_a, name_b, game):
+    return f"{seed}:{name_a}:{name_b}:{game}"
+
+
+def play_chunk(name_a, name_b, first_game, games, rounds, seed):
+    """Play games ``first_game``.. of a pairing; returns round and game win/draw/loss counts for A"""
+    wins = draws = losses = game_wins = game_draws = game_losses = 0
+    for game in range(first_game, first_game + games):
+        seed_a = game_seed(seed, name_a, name_b, game)
+        player_a = EnginePlayer(name_a, seed_a)
+        player_b = EnginePlayer(name_b, seed_a + ":b")
+        won = lost = 0
+        for _ in range(rounds):
+            move_a = player_a.choose()
+            move_b = player_b.choose()
+            winner = GameEngine.determine_winner(move_a, move_b)
+            if winner == "Player":
+                won += 1
+            elif winner == "Computer":
+                lost += 1
+            player_a.record(move_a, move_b)
+            player_b.record(move_b, move_a)
+        wins += won
+        losses += lost
+        draws += rounds - won - lost
+        if won > lost:
+            game_wins += 1
+        elif won < lost:
+            game_losses += 1
+        else:
+            game_draws += 1
+    return name_a, name_b, (wins, draws, losses, game_wins, game_draws, game_losses)
+
+
+def run_tournament(names, games=50, rounds=1000, seed=0, workers=None, chunk=10, on_pairing=None):
+    """Every strategy against every other once; returns {(a, b): counts} with counts as in ``play_chunk``.
+
+    ``on_pairing(a, b, counts)`` is called as each pairing completes.
+    """
+    pairings = list(itertools.combinations(names, 2))
+    results = {pairing: [0] * 6 for pairing in pairings}
+    remaining = {pairing: 0 for pairing in pairings}
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = []
+        for name_a, name_b in pairings:
+            for first_game in range(0, games, chunk):
+                futures.append(pool.submit(play_chunk, name_a, name_b, first_game,
+                                           min(chunk, games - first_game), rounds, seed))
+                remaining[name_a, name_b] += 1
+
+        for future in as_completed(futures):
+            name_a, name_b, counts = future.result()
+            totals = results[name_a, name_b]
+            for index, count in enumerate(counts):
+                totals[index] += count
+            remaining[name_a, name_b] -= 1
+            if not remaining[name_a, name_b] and on_pairing is not None:
+                on_pairing(name_a, name_b, totals)
+
+    return results
+
+
+def standings(names, results):
+    """(name, games, wins, draws, losses, points, round win rate) rows, best first"""
+    table = {name: [0, 0, 0, 0, 0] for name in names}
+    for (name_a, name_b), (wins, draws, losses, game_wins, game_draws, game_losses) in results.items():
+        for name, won, drawn, lost, round_wins, rounds in (
+                (name_a, game_wins, game_draws, game_losses, wins, wins + draws + losses),
+                (name_b, game_losses, game_draws, game_wins, losses, wins + draws + losses)):
+            row = table[name]
+            row[0] += won
+            row[1] += drawn
+            row[2] += lost
+            row[3] += round_wins
+            row[4] += rounds
+
+    rows = []
+    for name, (won, drawn, lost, round_wins, rounds) in table.items():
+        rows.append((name, won + drawn + lost, won, drawn, lost, won + drawn / 2, round_wins / rounds if rounds else 0))
+    rows.sort(key=lambda row: (row[5], row[6]), reverse=True)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Round-robin tournament between the game's AIs")
+    parser.add_argument("--games", type=int, default=50, help="games per pairing")
+    parser.add_argument("--rounds", type=int, default=1000, help="rounds per game")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--chunk", type=int, default=10, help="games per task")
+    parser.add_argument("--strategies", nargs="+", default=strategy_names(), choices=strategy_names())
+    args = parser.parse_args()
+
+    width = max(len(name) for name in args.strategies)
+    print(f"{'pairing':<{2 * width + 4}}{'W':>7}{'D':>7}{'L':>7}   rounds (row side)")
+
+    def print_pairing(name_a, name_b, counts):
+        wins, draws, losses, game_wins, game_draws, game_losses = counts
+        print(f"{name_a:>{width}} vs {name_b:<{width}}{game_wins:>7}{game_draws:>7}{game_losses:>7}"
+              f"   {wins}/{draws}/{losses}", flush=True)
+
+    start = time.perf_counter()
+    results = run_tournament(args.strategies, args.games, args.rounds, args.seed, args.workers, args.chunk,
+                             print_pairing)
+    elapsed = time.perf_counter() - start
+
+    print(f"\n{'#':<3}{'strategy':<{width + 2}}{'games':>7}{'W':>6}{'D':>6}{'L':>6}{'points':>8}{'round win %':>13}")
+    for place, (name, games, won, drawn, lost, points, rate) in enumerate(standings(args.strategies, results), 1):
+        print(f"{place:<3}{name:<{width + 2}}{games:>7}{won:>6}{drawn:>6}{lost:>6}{points:>8.1f}{rate * 100:>13.1f}")
+
+    total = len(results) * args.games * args.rounds
+    print(f"\n{total:,} rounds in {elapsed:.2f}s ({total / elapsed:,.0f} rounds/sec) on {args.workers} worker(s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import time
+from array import array
+
+# Report order of the spans a round records (others follow in first-seen order):
+# input       play(): offering the pressed move and starting its round
+# queue       the move waiting in the MoveQueue for the previous round
+# think       scheduling the computer's reply until it runs (think time + loop lateness)
+# ai          GameEngine.get_computer_choice
+# challenges  GameEngine.update_challenges
+# render      result label, animations, scores and challenge cards
+# save        analytics update and handing the round to the background writer
+# respond     all of computer_responds
+# paint       end of computer_responds until Tk's idle redraw has run
+# round       keypress to the end of computer_responds
+ROUND_PHASES = ("input", "queue", "think", "ai", "challenges", "render", "save", "respond", "paint", "round")
+
+SUB_BUCKETS = 16
+BUCKETS = 40 * SUB_BUCKETS
+
+
+class Histogram:
+    """Log-linear histogram of nanosecond durations.
+
+    Each power of two is split into ``SUB_BUCKETS`` equal buckets, so a
+    percentile is within 1/16 (about 6%) of the true value; recording is
+    a bit length, a shift and one counter increment. Durations over
+    about two hours share the top bucket.
+    """
+
+    def __init__(self):
+        self.counts = array("q", bytes(8 * BUCKETS))
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    @staticmethod
+    def bucket(ns):
+        if ns < SUB_BUCKETS:
+            return max(ns, 0)
+        shift = ns.bit_length() - 5
+        return min((shift + 1) * SUB_BUCKETS + (ns >> shift) - SUB_BUCKETS, BUCKETS - 1)
+
+    @staticmethod
+    def highest(index):
+        """The largest duration that falls in bucket ``index``"""
+        if index < SUB_BUCKETS:
+            return index
+        shift = index // SUB_BUCKETS - 1
+        return ((index % SUB_BUCKETS + SUB_BUCKETS + 1) << shift) - 1
+
+    def add(self, ns):
+        self.counts[self.bucket(ns)] += 1
+        self.count += 1
+        self.total += ns
+        if ns > self.max:
+            self.max = ns
+
+    def percentile(self, q):
+        """The duration (ns) that a fraction ``q`` of the samples do not exceed"""
+        if not self.count:
+            return 0
+        rank = max(1, round(q * self.count))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self.highest(index), self.max)
+        return self.max
+
+    def mean(self):
+        return self.total / self.count if self.count else 0
+
+
+class Tracer:
+    """Named latency spans recorded into histograms, switchable at runtime.
+
+    A span is ``start = tracer.now()`` ... ``tracer.record(phase, start)``.
+    While disabled ``now`` returns 0 and ``record`` ignores a 0 start, so
+    instrumented code pays two cheap calls and no clock reads; a span
+    that straddles enabling or disabling is dropped. ``hooks`` are called
+    with ``(phase, start_ns, duration_ns)`` for every recorded span, for
+    forwarding to an external tracer.
+    """
+
+    def __init__(self, enabled=False, clock=time.perf_counter_ns):
+        self.enabled = enabled
+        self.clock = clock
+        self.histograms = {}
+        self.hooks = []
+
+    def now(self):
+        """The start of a span (0 while disabled)"""
+        return self.clock() if self.enabled else 0
+
+    def record(self, phase, start):
+        """End the span ``phase`` that began at ``start``"""
+        if start and self.enabled:
+            now = self.clock()
+            self.add(phase, now - start, start)
+
+    def add(self, phase, ns, start=None):
+        """Record a duration measured elsewhere"""
+        histogram = self.histograms.get(phase)
+        if histogram is None:
+            histogram = self.histograms[phase] = Histogram()
+        histogram.add(ns)
+        for hook in self.hooks:
+            hook(phase, start, ns)
+
+    def reset(self):
+        self.histograms.clear()
+
+    def report(self):
+        """p50/p95/p99 and max per phase (ms), as aligned text lines"""
+        order = [phase for phase in ROUND_PHASES if phase in self.histograms]
+        order += [phase for phase in self.histograms if phase not in ROUND_PHASES]
+        lines = [f"{'phase':<12}{'count':>7}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}"]
+        for phase in order:
+            histogram = self.histograms[phase]
+            values = [histogram.percentile(q) for q in (0.5, 0.95, 0.99)] + [histogram.max]
+            lines.append(f"{phase:<12}{histogram.count:>7}" + "".join(f"{ns / 1e6:>10.3f}" for ns in values))
+        if not order:
+            lines.append("no rounds traced yet")
+        return "\n".join(lines)